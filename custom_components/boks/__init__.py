@@ -12,8 +12,12 @@ from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from .const import DOMAIN, WEBHOOK_DELETE_PACKAGE
 from .coordinator import BoksDataUpdateCoordinator
+from .logic.data_snapshot import BoksDataSnapshot
+from .logic.device_info_cache import BoksDeviceInfoCache
+from .logic.event_journal import BoksEventJournal
+from .logic.pin_generator import BoksPinGenerator
+from .logic.pin_index import BoksPinIndex
 from .services import async_setup_services
-from .updates.manager import BoksUpdateManager
 
 # Define the CONFIG_SCHEMA as an empty schema for config entries only
 CONFIG_SCHEMA = vol.Schema({}, extra=vol.ALLOW_EXTRA)
@@ -40,6 +44,9 @@ async def async_setup(hass: HomeAssistant, _config: dict) -> bool:
         if not version_num or not token:
              return web.Response(status=400)
 
+        # The firmware update stack is only loaded when a package is handled
+        from .updates.manager import BoksUpdateManager
+
         manager = BoksUpdateManager(hass)
         # Verify token synchronously (fast JSON check) or async wrapper?
         # verify_token is sync, calling it directly is fine as it's just a file read (fast enough for small file)
@@ -80,13 +87,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("Updated config entry options with defaults: %s", options_update)
 
     coordinator = BoksDataUpdateCoordinator(hass, entry)
+    # Known device information makes the prerequisite checks work offline
+    await coordinator.async_load_device_info()
+    # With the last known data, entities get a state at once and BLE is refreshed in the background
+    restored = await coordinator.async_restore_snapshot()
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except UpdateFailed as ex:
-        # Allow setup to complete even if device is offline
-        # This enables offline services like generate_update_package to work using Device Registry cache
-        _LOGGER.warning("Boks device unreachable during setup: %s. Integration will load in offline mode.", ex)
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except UpdateFailed as ex:
+            # Allow setup to complete even if device is offline
+            # This enables offline services like generate_update_package to work using Device Registry cache
+            _LOGGER.warning("Boks device unreachable during setup: %s. Integration will load in offline mode.", ex)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -116,11 +128,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    if restored:
+        entry.async_create_background_task(hass, coordinator.async_refresh(), "boks_first_refresh")
+
+    if coordinator.pin_index is not None:
+        # Build (or resume) the reverse PIN index without delaying the setup
+        entry.async_create_background_task(hass, coordinator.pin_index.async_build(), "boks_pin_index_build")
+
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        # Release a connection possibly held open by the hold connection mode
+        coordinator = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.ble_device.force_disconnect()
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the files kept for a config entry."""
+    await BoksEventJournal(hass, entry.entry_id).async_remove()
+    await BoksDeviceInfoCache(hass, entry.entry_id).async_remove()
+    await BoksDataSnapshot(hass, entry.entry_id).async_remove()
+    await BoksPinIndex(hass, entry.entry_id, BoksPinGenerator(None), 0).async_remove()
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
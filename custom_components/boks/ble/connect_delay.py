@@ -0,0 +1,94 @@
+"""Adaptive per-adapter delays for Boks BLE connections."""
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _DelayState:
+    """Learned delay for one scanner source."""
+
+    __slots__ = ("delay", "floor", "streak", "successes", "failures")
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        # Largest delay that failed recently, we stay above it
+        self.floor = 0.0
+        self.streak = 0
+        self.successes = 0
+        self.failures = 0
+
+
+class BoksAdaptiveDelay:
+    """
+    Learn the smallest reliable delay per scanner source.
+    Every few consecutive successes the delay shrinks, a failure doubles it and
+    remembers the failing value as a floor, so fast local adapters converge to a
+    short delay while slow ESP proxies keep their margin.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        success_streak: int = 3,
+        decrease_factor: float = 0.8,
+    ):
+        """Initialize the controller."""
+        self._initial = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._success_streak = success_streak
+        self._decrease_factor = decrease_factor
+        self._states: dict[str, _DelayState] = {}
+
+    def _state(self, source: str) -> _DelayState:
+        """Return the state of a source, created with the initial delay."""
+        state = self._states.get(source)
+        if state is None:
+            state = self._states[source] = _DelayState(self._initial)
+        return state
+
+    def get_delay(self, source: str) -> float:
+        """Return the delay to use for this source."""
+        state = self._states.get(source)
+        return state.delay if state is not None else self._initial
+
+    def record_success(self, source: str, delay: float) -> None:
+        """Record a successful attempt made after waiting delay seconds."""
+        state = self._state(source)
+        state.successes += 1
+        state.streak += 1
+        if state.streak < self._success_streak:
+            return
+
+        state.streak = 0
+        # Let the floor decay so a transient failure does not pin the delay forever
+        state.floor *= self._decrease_factor
+        new_delay = max(self._minimum, min(state.delay, delay) * self._decrease_factor, state.floor)
+        if new_delay < state.delay:
+            _LOGGER.debug("Adaptive delay for %s lowered to %.2fs", source, new_delay)
+            state.delay = new_delay
+
+    def record_failure(self, source: str, delay: float) -> None:
+        """Record a failed attempt made after waiting delay seconds."""
+        state = self._state(source)
+        state.failures += 1
+        state.streak = 0
+        state.floor = max(state.floor, delay)
+        new_delay = min(self._maximum, max(state.delay, delay, self._minimum * 2, 0.25) * 2)
+        if new_delay > state.delay:
+            _LOGGER.debug("Adaptive delay for %s raised to %.2fs", source, new_delay)
+            state.delay = new_delay
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the learned delays per source (for diagnostics)."""
+        return {
+            source: {
+                "delay": round(state.delay, 3),
+                "successes": state.successes,
+                "failures": state.failures,
+            }
+            for source, state in self._states.items()
+        }
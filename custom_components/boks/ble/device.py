@@ -1,10 +1,14 @@
 "Bluetooth Low Energy (BLE) communication handling for Boks."
 
 import asyncio
+import importlib.util
 import logging
+import sys
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 from bleak import BleakClient
@@ -15,16 +19,31 @@ from homeassistant.components import bluetooth
 from homeassistant.core import HomeAssistant
 
 from ..const import (
+    DEFAULT_HOLD_CONNECTION_IDLE,
+    DELAY_POST_DOOR_CLOSE_SYNC,
+    DELAY_POST_DOOR_SYNC_MAX,
+    DELAY_POST_DOOR_SYNC_MIN,
+    DELAY_PRE_CONNECT_INITIAL,
+    DELAY_PRE_CONNECT_MAX,
+    DELAY_PRE_CONNECT_MIN,
     DELAY_RETRY,
     DOMAIN,
+    HOLD_CONNECTION_FULL_BATTERY,
+    HOLD_CONNECTION_MIN_BATTERY,
+    LOG_STREAM_MAX_BATCH,
+    LOG_TIMESTAMP_TOLERANCE,
     MIN_DELAY_BETWEEN_CONNECTIONS,
+    PARALLEL_CONNECT_CANDIDATES,
+    PARALLEL_CONNECT_STAGGER,
+    TIMEOUT_BLE_INACTIVITY,
     TIMEOUT_COMMAND_RESPONSE,
     TIMEOUT_DOOR_CLOSE,
-    TIMEOUT_LOG_COUNT_STABILIZATION,
+    TIMEOUT_LOG_FIRST_PACKET,
+    TIMEOUT_LOG_PACKET_GAP,
 )
 from ..errors import BoksAuthError, BoksError
 from ..logic.anonymizer import BoksAnonymizer
-from ..packets.base import BoksRXPacket, BoksTXPacket
+from ..packets.base import BoksRXPacket, BoksTXPacket, get_opcode_info
 from ..packets.factory import PacketFactory
 from ..packets.rx.code_ble_valid import CodeBleValidPacket
 from ..packets.rx.code_counts import CodeCountsPacket
@@ -39,33 +58,60 @@ from ..packets.rx.nfc_opening import NfcOpeningPacket
 from ..packets.rx.nfc_scan_result import NfcScanResultPacket
 from ..packets.tx.ask_door_status import AskDoorStatusPacket
 from ..packets.tx.count_codes import CountCodesPacket
-from ..packets.tx.create_master_code import CreateMasterCodePacket
-from ..packets.tx.create_multi_code import CreateMultiUseCodePacket
-from ..packets.tx.create_single_code import CreateSingleUseCodePacket
-from ..packets.tx.delete_master_code import DeleteMasterCodePacket
-from ..packets.tx.delete_multi_code import DeleteMultiUseCodePacket
-from ..packets.tx.delete_single_code import DeleteSingleUseCodePacket
 from ..packets.tx.get_logs_count import GetLogsCountPacket
-from ..packets.tx.nfc_scan_start import NfcScanStartPacket
-from ..packets.tx.nfc_unregister_tag import NfcUnregisterTagPacket
 from ..packets.tx.open_door import OpenDoorPacket
-from ..packets.tx.register_nfc_tag import RegisterNfcTagPacket
 from ..packets.tx.request_logs import RequestLogsPacket
-from ..packets.tx.set_configuration import SetConfigurationPacket
+from .connect_delay import BoksAdaptiveDelay
 from .const import (
     BoksHistoryEvent,
     BoksNotificationOpcode,
     BoksServiceUUID,
 )
+from .log_download import BoksLogDownloadTracker
+from .notification_bus import BoksNotificationBus, NotificationCallback
 from .protocol import BoksProtocol
-
-# Pre-compute history events set for performance
-BOKS_HISTORY_EVENTS_SET = set(BoksHistoryEvent)
+from .quiescence import BoksQuiescence
+from .read_batch import BoksReadBatcher
+from .responses import BoksResponseTable
+from .scanner_ranking import BoksScannerRanking
+from .scheduler import BoksCommandScheduler
 
 MIN_TIME_BETWEEN_SYNCS = 15.0
 
 _LOGGER = logging.getLogger(__name__)
 
+# Modules the PIN, configuration, NFC and update commands import on demand,
+# loaded off the event loop together with the RX packet classes
+_ON_DEMAND_MODULES = tuple(
+    importlib.util.resolve_name(name, __package__)
+    for name in (
+        "..packets.tx.create_master_code",
+        "..packets.tx.create_multi_code",
+        "..packets.tx.create_single_code",
+        "..packets.tx.delete_master_code",
+        "..packets.tx.delete_multi_code",
+        "..packets.tx.delete_single_code",
+        "..packets.tx.set_configuration",
+        "..packets.tx.nfc_scan_start",
+        "..packets.tx.register_nfc_tag",
+        "..packets.tx.nfc_unregister_tag",
+        "..updates.logic",
+    )
+)
+
+
+def _packets_loaded() -> bool:
+    """Return True when the RX packet classes and the on-demand modules are imported."""
+    return PacketFactory.is_loaded() and all(name in sys.modules for name in _ON_DEMAND_MODULES)
+
+
+def _preload_packets() -> None:
+    """Import the RX packet classes and the on-demand modules (blocking, run in an executor)."""
+    PacketFactory.preload()
+    for name in _ON_DEMAND_MODULES:
+        importlib.import_module(name)
+
+
 class BoksBluetoothDevice:
     """Class to handle BLE communication with the Boks."""
 
@@ -86,15 +132,18 @@ class BoksBluetoothDevice:
 
         self._client: BleakClient | None = None
         self._lock = asyncio.Lock()
-        self._response_futures: dict[str, asyncio.Future] = {}
-        self._notify_callback = None
+        self._scheduler = BoksCommandScheduler(self)
+        self._responses = BoksResponseTable()
+        self._notifications = BoksNotificationBus()
+        self._log_downloads = BoksLogDownloadTracker()
+        self._quiescence = BoksQuiescence()
+        self._read_batcher = BoksReadBatcher()
+        self._firmware_version: str | None = None
         self._status_callback = None
         self._door_status: bool = False
         self._door_event = asyncio.Event()
         self._connection_users = 0
         self._notifications_subscribed = False
-        self._response_callbacks: dict[int, Callable[[bytearray], None]] = {}
-        self._opcode_callbacks: dict[int, list[Callable[[bytearray], None]]] = {}
         self._last_battery_update: datetime | None = None
         self._full_refresh_interval_hours: int = 12
         self._refresh_needed = False
@@ -105,6 +154,46 @@ class BoksBluetoothDevice:
         self._last_sync_time: float = 0.0
         self._autokill_task: asyncio.TimerHandle | None = None
         self._coordinator: Any = None
+        self._hold_connection = False
+        self._hold_idle_timeout: float = DEFAULT_HOLD_CONNECTION_IDLE
+        self._battery_level: int | None = None
+        # Delays learned per scanner source (local adapter vs ESP proxy)
+        self._connect_delays = BoksAdaptiveDelay(DELAY_PRE_CONNECT_INITIAL, DELAY_PRE_CONNECT_MIN, DELAY_PRE_CONNECT_MAX)
+        self._sync_delays = BoksAdaptiveDelay(
+            DELAY_POST_DOOR_CLOSE_SYNC, DELAY_POST_DOOR_SYNC_MIN, DELAY_POST_DOOR_SYNC_MAX
+        )
+        # Log count read by the last final refresh (None: not read)
+        self._final_log_count: int | None = None
+        # (source, delay, time) of a post door event sync that found no logs, checked
+        # against the next download: older entries mean the count was read too early
+        self._empty_sync_check: tuple[str, float, float] | None = None
+        self._connected_source = "unknown"
+        self._scanner_ranking = BoksScannerRanking()
+        self._parallel_connect = False
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Return BLE runtime statistics for diagnostics."""
+        return {
+            "scheduler": {
+                "pending": self._scheduler.pending,
+                "sessions_opened": self._scheduler.sessions_opened,
+                "commands_executed": self._scheduler.commands_executed,
+            },
+            "pending_responses": len(self._responses),
+            "response_latencies": self._responses.latency_histograms(),
+            "connect_delays": self._connect_delays.as_dict(),
+            "post_door_sync_delays": self._sync_delays.as_dict(),
+            "notifications": self._notifications.as_dict(),
+            "log_downloads": self._log_downloads.as_dict(),
+            "reply_quiescence": self._quiescence.as_dict(),
+            "read_batches": self._read_batcher.as_dict(),
+            "scanners": self._scanner_ranking.as_dict(),
+        }
+
+    def set_firmware_version(self, version: str | None) -> None:
+        """Set the firmware version used to learn the reply behaviour."""
+        if version:
+            self._firmware_version = version
 
     def set_coordinator(self, coordinator: Any) -> None:
         """Set the coordinator reference."""
@@ -123,21 +212,39 @@ class BoksBluetoothDevice:
         """Set the full refresh interval in hours."""
         self._full_refresh_interval_hours = hours
 
-    def register_opcode_callback(self, opcode: int, callback: Callable[[bytearray], None]) -> None:
-        """Register a callback for a specific opcode."""
-        if opcode not in self._opcode_callbacks:
-            self._opcode_callbacks[opcode] = []
-        self._opcode_callbacks[opcode].append(callback)
-
-    def unregister_opcode_callback(self, opcode: int, callback: Callable[[bytearray], None]) -> None:
-        """Unregister a callback for a specific opcode."""
-        if opcode in self._opcode_callbacks:
-            try:
-                self._opcode_callbacks[opcode].remove(callback)
-                if not self._opcode_callbacks[opcode]:
-                    del self._opcode_callbacks[opcode]
-            except ValueError:
-                pass
+    def set_hold_connection(self, enabled: bool, idle_timeout: float = DEFAULT_HOLD_CONNECTION_IDLE) -> None:
+        """Keep the physical connection open for idle_timeout seconds after the last session."""
+        self._hold_connection = enabled
+        self._hold_idle_timeout = max(0.0, float(idle_timeout))
+
+    def set_parallel_connect(self, enabled: bool) -> None:
+        """Race the connection over the best ranked scanners instead of trying only one."""
+        self._parallel_connect = enabled
+
+    def _get_hold_window(self) -> float:
+        """Return how long an idle connection may be held, reduced when the battery is low."""
+        if not self._hold_connection:
+            return 0.0
+
+        level = self._battery_level
+        if level is None or level >= HOLD_CONNECTION_FULL_BATTERY:
+            return self._hold_idle_timeout
+        if level < HOLD_CONNECTION_MIN_BATTERY:
+            # Holding the link drains the battery, not worth it anymore
+            return 0.0
+
+        # Linear back-off between the minimum and full battery thresholds
+        ratio = (level - HOLD_CONNECTION_MIN_BATTERY) / (HOLD_CONNECTION_FULL_BATTERY - HOLD_CONNECTION_MIN_BATTERY)
+        return self._hold_idle_timeout * ratio
+
+    def subscribe_notifications(
+        self,
+        callback: NotificationCallback,
+        opcodes: Iterable[int] | None = None,
+        packet_type: type[BoksRXPacket] | tuple[type[BoksRXPacket], ...] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to decoded notifications (filtered by opcode and/or packet class). Returns the unsubscribe function."""
+        return self._notifications.subscribe(callback, opcodes, packet_type)
 
     def _should_update_battery_info(self) -> bool:
         """Check if battery info should be updated based on the full refresh interval."""
@@ -160,6 +267,8 @@ class BoksBluetoothDevice:
         self._connection_users += 1
         _LOGGER.debug("BLE Session Start. Active Sessions: %d", self._connection_users)
         if self.is_connected:
+            # Re-arm the watchdog, the link may have been held idle
+            self._reset_autokill_timer()
             return
 
         # Enforce minimum delay between physical connections for stability (especially for ESP proxies)
@@ -170,18 +279,25 @@ class BoksBluetoothDevice:
                 _LOGGER.debug("Waiting %.1fs before reconnecting (cooldown)", wait_needed)
                 await asyncio.sleep(wait_needed)
 
+        if not _packets_loaded():
+            # Packet classes are imported lazily, load them off the event loop before the first session
+            await self.hass.async_add_executor_job(_preload_packets)
+
         if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug("Connecting to Boks %s (Subscribed: %s)",
                           BoksAnonymizer.anonymize_mac(self.address, self.anonymize_logs),
                           self._notifications_subscribed)
 
+        candidates = [device]
         if device is None:
             try:
-                device = await self._find_best_device()
+                candidates = await self._rank_devices()
             except Exception:
                 # If finding device fails, we must decrement users since it won't reach the main try/except
                 self._connection_users = max(0, self._connection_users - 1)
                 raise
+            device = candidates[0]
+            candidates = candidates[:PARALLEL_CONNECT_CANDIDATES] if self._parallel_connect else [device]
 
         if device:
              self._update_last_rssi(device)
@@ -189,15 +305,11 @@ class BoksBluetoothDevice:
              _LOGGER.debug("BLE Device not found in HA cache.")
 
         try:
-            await asyncio.sleep(1.0)
-            ble_device_to_connect = getattr(device, "ble_device", device)
-
-            self._client = await establish_connection(
-                BleakClient,
-                ble_device_to_connect,
-                self.address,
-                disconnected_callback=self._on_disconnected
-            )
+            if len(candidates) > 1:
+                self._client, device = await self._race_connect(candidates)
+            else:
+                self._client = await self._open_client(device)
+            self._connected_source = BoksAnonymizer.get_scanner_info(device).get("scanner_source", "unknown")
             _LOGGER.debug("Physical BLE Connection Established to %s",
                           BoksAnonymizer.anonymize_mac(self.address, self.anonymize_logs))
             self._reset_autokill_timer()
@@ -206,8 +318,82 @@ class BoksBluetoothDevice:
             await self._handle_connect_error(device, e)
             raise
 
-    async def _find_best_device(self) -> BLEDevice:
-        """Find the best connectable BLE device based on RSSI."""
+    async def _open_client(self, device: BLEDevice, stagger: float = 0.0) -> BleakClient:
+        """Establish a physical connection through one scanner, recording its delay and connect time."""
+        source = BoksAnonymizer.get_scanner_info(device).get("scanner_source", "unknown")
+        connect_delay = self._connect_delays.get_delay(source)
+        if stagger + connect_delay > 0:
+            await asyncio.sleep(stagger + connect_delay)
+
+        connect_start = time.monotonic()
+        try:
+            client = await establish_connection(
+                BleakClient,
+                getattr(device, "ble_device", device),
+                self.address,
+                disconnected_callback=self._on_disconnected
+            )
+        except asyncio.CancelledError:
+            # Lost a connection race, says nothing about this scanner
+            raise
+        except Exception:
+            self._connect_delays.record_failure(source, connect_delay)
+            self._scanner_ranking.record_connect(source, False, time.monotonic() - connect_start)
+            raise
+        self._connect_delays.record_success(source, connect_delay)
+        self._scanner_ranking.record_connect(source, True, time.monotonic() - connect_start)
+        return client
+
+    async def _race_connect(self, candidates: list[BLEDevice]) -> tuple[BleakClient, BLEDevice]:
+        """
+        Connect through several scanners at once with a staggered start ("happy eyeballs").
+        The first connection to complete is kept, the other attempts are cancelled.
+        """
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Racing connection over %d scanners", len(candidates))
+
+        tasks = {
+            self.hass.async_create_task(self._open_client(candidate, index * PARALLEL_CONNECT_STAGGER)): candidate
+            for index, candidate in enumerate(candidates)
+        }
+        pending = set(tasks)
+        winner: tuple[BleakClient, BLEDevice] | None = None
+        last_error: BaseException | None = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    elif winner is None:
+                        winner = (task.result(), tasks[task])
+                    else:
+                        # Two attempts finished in the same loop iteration, keep only one link
+                        await self._close_race_loser(task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                try:
+                    client = await task
+                except (asyncio.CancelledError, Exception):
+                    continue
+                await self._close_race_loser(client)
+
+        if winner is None:
+            raise last_error or BoksError("no_connectable_adapter")
+        return winner
+
+    async def _close_race_loser(self, client: BleakClient) -> None:
+        """Disconnect a connection that lost the race."""
+        try:
+            async with asyncio.timeout(5):
+                await client.disconnect()
+        except Exception as e:
+            _LOGGER.debug("Error closing losing race connection: %s", e)
+
+    async def _rank_devices(self) -> list[BLEDevice]:
+        """Return the connectable BLE devices, best expected time-to-first-response first."""
         devices = bluetooth.async_scanner_devices_by_address(self.hass, self.address, connectable=True)
 
         if not devices:
@@ -218,24 +404,30 @@ class BoksBluetoothDevice:
             _LOGGER.debug("Found %d connectable candidates for %s", len(devices),
                           BoksAnonymizer.anonymize_mac(self.address, self.anonymize_logs))
 
-        best_device = None
-        best_rssi = -1000
-
+        scored = []
         for dev in devices:
             rssi = getattr(dev, "rssi", None)
             if rssi is None and hasattr(dev, "advertisement"):
                  rssi = dev.advertisement.rssi
 
+            info = BoksAnonymizer.get_scanner_info(dev)
+            source = info.get("scanner_source", "unknown")
+            self._scanner_ranking.observe_rssi(source, rssi)
+            score = self._scanner_ranking.expected_time(source, rssi, self._connect_delays.get_delay(source))
+
             if _LOGGER.isEnabledFor(logging.DEBUG):
-                info = BoksAnonymizer.get_scanner_info(dev)
                 scanner_display = BoksAnonymizer.get_scanner_display_name(info, self.anonymize_logs)
-                _LOGGER.debug(" - [RSSI: %s] %s", info.get("rssi", "None"), scanner_display)
+                _LOGGER.debug(" - [RSSI: %s, Expected: %.2fs] %s", info.get("rssi", "None"), score, scanner_display)
 
-            if rssi is not None and rssi > best_rssi:
-                best_rssi = rssi
-                best_device = dev
+            scored.append((score, -(rssi if rssi is not None else -100), dev))
 
-        return best_device or devices[0]
+        # Scanners without history share the default score, the stronger signal breaks the tie
+        scored.sort(key=lambda item: item[:2])
+        return [dev for _score, _weakness, dev in scored]
+
+    async def _find_best_device(self) -> BLEDevice:
+        """Find the connectable BLE device with the best expected time-to-first-response."""
+        return (await self._rank_devices())[0]
 
     def _update_last_rssi(self, device: BLEDevice):
         """Update cached RSSI info for logging/errors."""
@@ -249,7 +441,14 @@ class BoksBluetoothDevice:
 
     def _on_disconnected(self, client: BleakClient) -> None:
         """Handle unexpected disconnection from the device side."""
+        if client is not self._client:
+            # A connection race loser being closed (or an already replaced client)
+            _LOGGER.debug("Ignoring disconnection of an inactive client for %s", self.address)
+            return
         _LOGGER.debug("Remote side (Boks) closed the connection for %s", self.address)
+        if self._connection_users > 0:
+            # Dropped mid-session, counts against the scanner we went through
+            self._scanner_ranking.record_disconnect(self._connected_source)
         self._notifications_subscribed = False
         self._stop_autokill_timer()
         # If we had active sessions, they will now fail on the next TX/RX which is correct
@@ -258,8 +457,13 @@ class BoksBluetoothDevice:
     def _reset_autokill_timer(self) -> None:
         """Reset the inactivity timer (Watchdog)."""
         self._stop_autokill_timer()
-        # Kill connection after 60s of silence
-        self._autokill_task = self.hass.loop.call_later(60.0, self._handle_autokill)
+        if self._connection_users == 0 and self._hold_connection:
+            # Held idle connection: close it once the hold window expires
+            delay = self._get_hold_window()
+        else:
+            # Kill connection after 60s of silence
+            delay = TIMEOUT_BLE_INACTIVITY
+        self._autokill_task = self.hass.loop.call_later(delay, self._handle_autokill)
 
     def _stop_autokill_timer(self) -> None:
         """Stop the inactivity timer."""
@@ -269,9 +473,33 @@ class BoksBluetoothDevice:
 
     def _handle_autokill(self) -> None:
         """Executed when the inactivity timer expires."""
-        if self.is_connected:
-            _LOGGER.warning("Inactivity timeout (60s) for Boks %s. Forcing disconnection.", self.address)
-            self.hass.async_create_task(self.force_disconnect())
+        self._autokill_task = None
+        if not self.is_connected:
+            return
+
+        if self._connection_users == 0 and self._hold_connection:
+            _LOGGER.debug("Idle hold window expired for Boks %s. Closing connection.",
+                          BoksAnonymizer.anonymize_mac(self.address, self.anonymize_logs))
+            self.hass.async_create_task(self._close_idle_connection())
+            return
+
+        _LOGGER.warning("Inactivity timeout (%ds) for Boks %s. Forcing disconnection.", TIMEOUT_BLE_INACTIVITY, self.address)
+        self.hass.async_create_task(self.force_disconnect())
+
+    async def _close_idle_connection(self) -> None:
+        """Close a held connection if nobody started a session in the meantime."""
+        async with self._lock:
+            if self._connection_users == 0:
+                await self._execute_physical_disconnect()
+
+    async def _release_connection(self) -> None:
+        """Close the physical connection, or keep it open when hold mode allows it."""
+        hold_window = self._get_hold_window()
+        if hold_window > 0 and self.is_connected:
+            _LOGGER.debug("Holding BLE connection open for %.0fs", hold_window)
+            self._reset_autokill_timer()
+            return
+        await self._execute_physical_disconnect()
 
     def _report_no_connectable_adapter(self):
         """Log details about available non-connectable scanners."""
@@ -319,9 +547,9 @@ class BoksBluetoothDevice:
             last_event_time = max(self._last_door_close_time or 0, self._last_door_open_time or 0)
             if last_event_time > 0:
                 elapsed = time.time() - last_event_time
-                MIN_SYNC_DELAY = 5.0
-                if elapsed < MIN_SYNC_DELAY:
-                    wait_time = MIN_SYNC_DELAY - elapsed
+                min_sync_delay = self._sync_delays.get_delay(self._connected_source)
+                if elapsed < min_sync_delay:
+                    wait_time = min_sync_delay - elapsed
                     _LOGGER.debug("Waiting %.1fs before final refresh (to stabilize device)", wait_time)
                     # We can't wait here synchronously if we want to return fast.
                     # The background task will handle the wait or we just accept the delay.
@@ -332,7 +560,7 @@ class BoksBluetoothDevice:
             return
 
         # Standard disconnect if no refresh needed
-        await self._execute_physical_disconnect()
+        await self._release_connection()
 
     async def _execute_physical_disconnect(self):
         """Execute the physical disconnection."""
@@ -354,22 +582,35 @@ class BoksBluetoothDevice:
             self._stop_autokill_timer()
             _LOGGER.info("Physical BLE Connection Closed (Disconnected from Boks)")
 
-    async def _perform_final_refresh(self) -> None:
-        """Perform a final data refresh before disconnecting (expects no lock or internal calls)."""
+    async def _perform_final_refresh(self) -> bool | None:
+        """
+        Perform a final data refresh before disconnecting (expects no lock or internal calls).
+        Returns True on success, False on failure (including a stalled history
+        download, whose entries are still published) and None when throttled.
+        """
         if (time.time() - self._last_sync_time) < MIN_TIME_BETWEEN_SYNCS:
             _LOGGER.debug("Skipping final refresh (Throttled, last sync %.1fs ago)", time.time() - self._last_sync_time)
-            return
+            return None
 
         _LOGGER.debug("Performing final refresh (battery and logs) before disconnect")
         self._last_sync_time = time.time()
+        self._final_log_count = None
         try:
             update_data = {}
 
-            # 1. Battery info
-            update_data.update(await self._get_final_battery_info())
+            # 1. Battery reads overlap with the log count exchange
+            client = self._client
+            results = await self._read_batcher.run(self._connected_source, {
+                "battery_level": partial(client.read_gatt_char, BoksServiceUUID.BATTERY_LEVEL_CHARACTERISTIC),
+                "battery_stats": partial(client.read_gatt_char, BoksServiceUUID.BATTERY_CHARACTERISTIC),
+                # Raises, so a failed overlapped exchange is retried alone
+                "logs_count": self._read_logs_count,
+            })
+            update_data.update(self._get_final_battery_info(results["battery_level"], results["battery_stats"]))
 
             # 2. Logs
-            update_data.update(await self._get_final_logs())
+            update_data.update(await self._get_final_logs(results["logs_count"]))
+            stalled = bool(self._final_log_count) and not self._log_downloads.last.get("complete", True)
 
             # 3. Code counts
             update_data.update(await self._get_final_code_counts())
@@ -378,12 +619,25 @@ class BoksBluetoothDevice:
                 self._status_callback(update_data)
         except Exception as e:
             _LOGGER.warning("Error during final refresh: %s", e)
+            return False
+        return not stalled
 
-    async def _get_final_battery_info(self) -> dict:
-        """Fetch battery level and stats for final refresh."""
+    def _get_final_battery_info(self, level_payload: Any, stats_payload: Any) -> dict:
+        """Build battery level and stats for final refresh from the raw reads (or their errors)."""
         data = {}
-        level = await self._get_battery_level()
-        stats = await self._get_battery_stats()
+        level = 0
+        if isinstance(level_payload, Exception):
+            _LOGGER.warning("Failed to read battery: %s", level_payload)
+        elif len(level_payload) == 1:
+            level = self._battery_level = level_payload[0]
+
+        stats = None
+        if isinstance(stats_payload, Exception):
+            _LOGGER.debug("Custom battery char read failed: %s", stats_payload)
+        else:
+            stats = BoksProtocol.parse_battery_stats(stats_payload)
+        if not stats and not isinstance(level_payload, Exception) and len(level_payload) == 1:
+            stats = {"format": "measure-single", "level_single": level, "temperature": None}
 
         data["battery_level"] = level
         if stats:
@@ -392,10 +646,12 @@ class BoksBluetoothDevice:
                 data["battery_temperature"] = stats["temperature"]
         return data
 
-    async def _get_final_logs(self) -> dict:
+    async def _get_final_logs(self, log_count: Any) -> dict:
         """Fetch new logs for final refresh."""
         data = {}
-        log_count = await self._get_logs_count()
+        if isinstance(log_count, Exception):
+            raise log_count
+        self._final_log_count = log_count
         if log_count > 0:
             _LOGGER.info("Final refresh: Found %d new logs, fetching...", log_count)
             logs = await self._get_logs(log_count)
@@ -409,10 +665,7 @@ class BoksBluetoothDevice:
             _LOGGER.debug("BLE Sessions Force Cleared. Active Sessions: 0")
             self._refresh_needed = False
             # Clear any pending futures
-            for future in self._response_futures.values():
-                if not future.done():
-                    future.cancel()
-            self._response_futures.clear()
+            self._responses.cancel_all()
 
             if self._client and self._client.is_connected:
                 try:
@@ -424,16 +677,20 @@ class BoksBluetoothDevice:
             self._client = None
             self._notifications_subscribed = False
             self._last_disconnect_time = time.time()
+            self._stop_autokill_timer()
             _LOGGER.info("Force disconnected from Boks")
 
     async def _run_background_disconnect_logic(self):
         """Run the disconnect logic in background (refresh + close)."""
         # Wait for stabilization if needed (outside lock to yield)
         last_event_time = max(self._last_door_close_time or 0, self._last_door_open_time or 0)
+        source = self._connected_source
+        min_delay = self._sync_delays.get_delay(source)
+        waited = False
         if last_event_time > 0:
             elapsed = time.time() - last_event_time
-            min_delay = 5.0
             if elapsed < min_delay:
+                waited = True
                 wait_time = min_delay - elapsed
                 _LOGGER.debug("Background Disconnect: Waiting %.1fs for device stabilization...", wait_time)
                 await asyncio.sleep(wait_time)
@@ -449,12 +706,21 @@ class BoksBluetoothDevice:
 
             try:
                 # Perform final refresh (Log count, Battery, etc.)
-                await self._perform_final_refresh()
+                refreshed = await self._perform_final_refresh()
+                if waited and refreshed is not None:
+                    # Only learn from refreshes that really followed the stabilization wait
+                    if not refreshed:
+                        self._sync_delays.record_failure(source, min_delay)
+                    elif self._final_log_count == 0:
+                        # No logs after a door event: only a success if a later download agrees
+                        self._empty_sync_check = (source, min_delay, time.time())
+                    else:
+                        self._sync_delays.record_success(source, min_delay)
             except Exception as e:
                 _LOGGER.error("Background refresh failed: %s", e)
             finally:
                 self._refresh_needed = False
-                await self._execute_physical_disconnect()
+                await self._release_connection()
 
     def _log_packet(self, direction: str, packet: BoksTXPacket | BoksRXPacket):
         """Log TX or RX packet with anonymization."""
@@ -470,50 +736,48 @@ class BoksBluetoothDevice:
         raw_bytes = packet.to_bytes()
 
         future = None
-        future_key = ""
 
         if not self._client or not self._client.is_connected:
              raise BoksError("ble_client_not_connected")
 
         try:
             if wait_for_opcodes:
-                future = asyncio.get_running_loop().create_future()
-                future_key = ",".join(map(str, wait_for_opcodes))
-                self._response_futures[future_key] = future
+                future = self._responses.register(wait_for_opcodes)
 
             self._log_packet("TX", packet)
             self._reset_autokill_timer()
             await self._client.write_gatt_char(BoksServiceUUID.WRITE_CHARACTERISTIC, raw_bytes, response=False)
 
             if future:
-                resp_data = await asyncio.wait_for(future, timeout=timeout)
-                return PacketFactory.from_rx_data(resp_data)
+                # Resolved with the packet already decoded by the notification handler
+                response = await asyncio.wait_for(future, timeout=timeout)
+                self._scanner_ranking.record_gatt_result(self._connected_source, True)
+                return response
+            self._scanner_ranking.record_gatt_result(self._connected_source, True)
             return None
 
         except TimeoutError as e:
-            if future_key in self._response_futures:
-                del self._response_futures[future_key]
+            self._scanner_ranking.record_gatt_result(self._connected_source, False)
             raise BoksError("timeout_waiting_response", {"opcode": f"0x{packet.opcode:02X}"}) from e
 
         except (BleakError, AttributeError, OSError) as e:
-            if future_key in self._response_futures:
-                del self._response_futures[future_key]
+            self._scanner_ranking.record_gatt_result(self._connected_source, False)
             if isinstance(e, AttributeError):
                  raise BoksError("ble_internal_error", {"error": str(e)}) from e
             raise BoksError("ble_error", {"error": str(e)}) from e
 
+        finally:
+            # No-op when the waiter was resolved, cleans up on timeout/error/cancellation
+            if future:
+                self._responses.discard(future)
+
     async def send_packet(self, packet: BoksTXPacket, wait_for_opcodes: list[int] = None, timeout: float = TIMEOUT_COMMAND_RESPONSE) -> BoksRXPacket | None:
         """Send a packet object and optionally wait for a specific response packet (Public)."""
         max_attempts = 2
 
         for attempt in range(max_attempts):
             try:
-                async with self._lock:
-                    await self._connect()
-                    try:
-                        return await self._send_packet(packet, wait_for_opcodes, timeout)
-                    finally:
-                        await self._disconnect()
+                return await self._scheduler.execute(lambda: self._send_packet(packet, wait_for_opcodes, timeout))
 
             except BoksError as e:
                 # If we are disconnected or there is an error, force disconnect and retry
@@ -566,15 +830,12 @@ class BoksBluetoothDevice:
         if door_update:
             self._dispatch_door_update()
 
+        # Every consumer below shares the packet decoded once above
         # Resolve async waiting tasks
-        self._resolve_futures(opcode, data)
-
-        # Legacy notification callback
-        if self._notify_callback:
-            self._notify_callback(opcode, data)
+        self._responses.resolve(opcode, rx_packet)
 
-        # Direct opcode callbacks
-        self._dispatch_callbacks(opcode, data)
+        # Subscribers (sensors, controllers, log collectors)
+        self._notifications.publish(rx_packet)
 
     def _handle_duplicates_and_checksum(self, packet: BoksRXPacket, data: bytearray) -> bool:
         """Verify checksum and log duplicates. Returns True if packet should be processed."""
@@ -630,31 +891,6 @@ class BoksBluetoothDevice:
         if self._status_callback:
             self._status_callback({"door_open": self._door_status})
 
-    def _resolve_futures(self, opcode: int, data: bytearray):
-        """Complete any pending futures waiting for this opcode."""
-        opcode_str = str(opcode)
-        for key, future in list(self._response_futures.items()):
-            if not future.done() and opcode_str in key.split(","):
-                future.set_result(data)
-                del self._response_futures[key]
-            elif future.done() and key in self._response_futures:
-                del self._response_futures[key]
-
-    def _dispatch_callbacks(self, opcode: int, data: bytearray):
-        """Invoke registered opcode callbacks."""
-        if opcode in self._response_callbacks:
-            try:
-                self._response_callbacks[opcode](data)
-            except Exception as e:
-                _LOGGER.error("Error in callback for opcode 0x%02X: %s", opcode, e)
-
-        if opcode in self._opcode_callbacks:
-            for callback in self._opcode_callbacks[opcode][:]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    _LOGGER.error("Error in opcode callback for opcode 0x%02X: %s", opcode, e)
-
     async def wait_for_door_closed(self, timeout: float = TIMEOUT_DOOR_CLOSE) -> bool:
         """Wait for the door to be closed."""
         if not self.is_connected:
@@ -673,12 +909,7 @@ class BoksBluetoothDevice:
 
     async def get_battery_level(self) -> int:
         """Get battery level."""
-        async with self._lock:
-            await self._connect()
-            try:
-                return await self._get_battery_level()
-            finally:
-                await self._disconnect()
+        return await self._scheduler.execute(self._get_battery_level)
 
     async def _get_battery_level(self) -> int:
         """Internal get battery level."""
@@ -687,6 +918,7 @@ class BoksBluetoothDevice:
         try:
             payload = await self._client.read_gatt_char(BoksServiceUUID.BATTERY_LEVEL_CHARACTERISTIC)
             if len(payload) == 1:
+                self._battery_level = payload[0]
                 return payload[0]
         except Exception as e:
              _LOGGER.warning("Failed to read battery: %s", e)
@@ -694,12 +926,7 @@ class BoksBluetoothDevice:
 
     async def get_battery_stats(self) -> dict | None:
         """Get battery statistics and format."""
-        async with self._lock:
-            await self._connect()
-            try:
-                return await self._get_battery_stats()
-            finally:
-                await self._disconnect()
+        return await self._scheduler.execute(self._get_battery_stats)
 
     async def _get_battery_stats(self) -> dict | None:
         """Internal get battery stats."""
@@ -723,57 +950,133 @@ class BoksBluetoothDevice:
 
     async def get_internal_firmware_revision(self) -> str | None:
         """Get internal firmware revision."""
-        async with self._lock:
-            await self._connect()
-            try:
-                if self._client is None:
-                    return None
-                try:
-                    payload = await self._client.read_gatt_char(BoksServiceUUID.INTERNAL_FIRMWARE_REVISION_CHARACTERISTIC)
-                    return payload.decode('ascii').strip()
-                except Exception as e:
-                    _LOGGER.debug("Failed to read firmware revision: %s", e)
-                return None
-            finally:
-                await self._disconnect()
+        return await self._scheduler.execute(self._get_internal_firmware_revision)
+
+    async def _get_internal_firmware_revision(self) -> str | None:
+        """Internal get firmware revision."""
+        if self._client is None:
+            return None
+        try:
+            payload = await self._client.read_gatt_char(BoksServiceUUID.INTERNAL_FIRMWARE_REVISION_CHARACTERISTIC)
+            return payload.decode('ascii').strip()
+        except Exception as e:
+            _LOGGER.debug("Failed to read firmware revision: %s", e)
+        return None
+
+    async def get_software_revision(self) -> str | None:
+        """Get the software (firmware) version."""
+        return await self._scheduler.execute(self._get_software_revision)
+
+    async def _get_software_revision(self) -> str | None:
+        """Internal get software revision."""
+        if self._client is None:
+            return None
+        try:
+            payload = await self._client.read_gatt_char(BoksServiceUUID.SOFTWARE_REVISION_CHARACTERISTIC)
+            version = payload.decode('ascii').strip()
+        except Exception as e:
+            _LOGGER.debug("Failed to read software revision: %s", e)
+            return None
+        self.set_firmware_version(version)
+        return version
 
     async def get_door_status(self) -> bool:
         """Get current door status."""
+        return await self._scheduler.execute(self._get_door_status)
+
+    async def _get_door_status(self) -> bool:
+        """Internal get door status (the latest of possibly several answers wins)."""
         packet = AskDoorStatusPacket()
-        resp = await self.send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_DOOR_STATUS, BoksNotificationOpcode.ANSWER_DOOR_STATUS])
-        if isinstance(resp, DoorStatusPacket):
-            self._door_status = resp.is_open
+        responses = await self._request_until_quiet(packet, [BoksNotificationOpcode.NOTIFY_DOOR_STATUS, BoksNotificationOpcode.ANSWER_DOOR_STATUS])
+        statuses = [resp for resp in responses if isinstance(resp, DoorStatusPacket)]
+        if statuses:
+            self._door_status = statuses[-1].is_open
         return self._door_status
 
+    async def _request_until_quiet(
+        self,
+        packet: BoksTXPacket,
+        opcodes: list[int],
+        provisional: Callable[[BoksRXPacket], bool] | None = None,
+    ) -> list[BoksRXPacket]:
+        """
+        Send a request and collect its replies until the link is quiet.
+        After the first reply, keep listening for the window learned for this
+        firmware and reply opcode (none on firmware known to answer once).
+        A first reply matching provisional is always followed by a full window.
+        Returns the replies in arrival order.
+        """
+        responses: list[BoksRXPacket] = []
+        arrivals: list[float] = []
+        arrived = asyncio.Event()
+
+        def collect(p: BoksRXPacket):
+            responses.append(p)
+            arrivals.append(time.monotonic())
+            arrived.set()
+
+        unsubscribe = self.subscribe_notifications(collect, opcodes=opcodes)
+        try:
+            first = await self._send_packet(packet, wait_for_opcodes=opcodes)
+            if first is None:
+                return responses
+            if not any(resp is first for resp in responses):
+                responses.insert(0, first)
+                arrivals.insert(0, time.monotonic())
+
+            firmware = self._firmware_version or "unknown"
+            window = self._quiescence.window(
+                firmware, opcodes[0], provisional=provisional is not None and provisional(first)
+            )
+            while window > 0:
+                remaining = arrivals[-1] + window - time.monotonic()
+                if remaining <= 0:
+                    break
+                arrived.clear()
+                try:
+                    await asyncio.wait_for(arrived.wait(), timeout=remaining)
+                except TimeoutError:
+                    break
+
+            self._quiescence.record(firmware, opcodes[0], window, [t - arrivals[0] for t in arrivals[1:]])
+        finally:
+            unsubscribe()
+        return responses
+
     async def get_device_information(self) -> dict:
         """Read device information."""
-        async with self._lock:
-            await self._connect()
+        return await self._scheduler.execute(self._get_device_information)
+
+    async def _get_device_information(self) -> dict:
+        """Internal read device information."""
+        if self._client is None:
+            return {}
+        info = {}
+        chars = {
+            BoksServiceUUID.MANUFACTURER_NAME_CHARACTERISTIC: "manufacturer_name",
+            BoksServiceUUID.MODEL_NUMBER_CHARACTERISTIC: "model_number",
+            BoksServiceUUID.SERIAL_NUMBER_CHARACTERISTIC: "serial_number",
+            BoksServiceUUID.SOFTWARE_REVISION_CHARACTERISTIC: "software_revision",
+            BoksServiceUUID.HARDWARE_REVISION_CHARACTERISTIC: "hardware_revision",
+            BoksServiceUUID.INTERNAL_FIRMWARE_REVISION_CHARACTERISTIC: "firmware_revision",
+            BoksServiceUUID.SYSTEM_ID_CHARACTERISTIC: "system_id",
+        }
+        client = self._client
+        results = await self._read_batcher.run(
+            self._connected_source, {key: partial(client.read_gatt_char, char_uuid) for char_uuid, key in chars.items()}
+        )
+        for key, payload in results.items():
             try:
-                if self._client is None:
-                    return {}
-                info = {}
-                chars = {
-                    BoksServiceUUID.MANUFACTURER_NAME_CHARACTERISTIC: "manufacturer_name",
-                    BoksServiceUUID.MODEL_NUMBER_CHARACTERISTIC: "model_number",
-                    BoksServiceUUID.SERIAL_NUMBER_CHARACTERISTIC: "serial_number",
-                    BoksServiceUUID.SOFTWARE_REVISION_CHARACTERISTIC: "software_revision",
-                    BoksServiceUUID.HARDWARE_REVISION_CHARACTERISTIC: "hardware_revision",
-                    BoksServiceUUID.INTERNAL_FIRMWARE_REVISION_CHARACTERISTIC: "firmware_revision",
-                    BoksServiceUUID.SYSTEM_ID_CHARACTERISTIC: "system_id",
-                }
-                for char_uuid, key in chars.items():
-                    try:
-                        payload = await self._client.read_gatt_char(char_uuid)
-                        if key == "system_id":
-                            info[key] = payload.hex()
-                        else:
-                            info[key] = payload.decode('ascii').strip()
-                    except Exception as e:
-                        _LOGGER.debug("Failed to read %s: %s", key, e)
-                return info
-            finally:
-                await self._disconnect()
+                if isinstance(payload, Exception):
+                    raise payload
+                if key == "system_id":
+                    info[key] = payload.hex()
+                else:
+                    info[key] = payload.decode('ascii').strip()
+            except Exception as e:
+                _LOGGER.debug("Failed to read %s: %s", key, e)
+        self.set_firmware_version(info.get("software_revision"))
+        return info
 
     def _validate_pin(self, code: str) -> str:
         """Validate PIN code format (6 chars, 0-9, A, B)."""
@@ -807,19 +1110,15 @@ class BoksBluetoothDevice:
 
     async def get_code_counts(self) -> dict:
         """Get code counts."""
-        async with self._lock:
-            await self._connect()
-            try:
-                return await self._get_code_counts()
-            finally:
-                await self._disconnect()
+        return await self._scheduler.execute(self._get_code_counts)
 
     async def _get_code_counts(self) -> dict:
         """Internal get code counts (no lock)."""
         packet = CountCodesPacket()
-        resp = await self._send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_CODES_COUNT])
-        if isinstance(resp, CodeCountsPacket):
-            return {"master": resp.master_count, "single_use": resp.single_use_count}
+        responses = await self._request_until_quiet(packet, [BoksNotificationOpcode.NOTIFY_CODES_COUNT])
+        counts = [resp for resp in responses if isinstance(resp, CodeCountsPacket)]
+        if counts:
+            return {"master": counts[-1].master_count, "single_use": counts[-1].single_use_count}
         return {}
 
     async def _get_final_code_counts(self) -> dict:
@@ -832,90 +1131,149 @@ class BoksBluetoothDevice:
 
     async def get_logs_count(self) -> int:
         """Get logs count."""
-        async with self._lock:
-            await self._connect()
-            try:
-                return await self._get_logs_count()
-            finally:
-                await self._disconnect()
+        return await self._scheduler.execute(self._get_logs_count)
 
     async def _get_logs_count(self) -> int:
-        """Internal get logs count with stabilization."""
-
-        counts: list[int] = []
-
-        def handle_count(data: bytearray):
-            p = PacketFactory.from_rx_data(data)
-            if isinstance(p, LogCountPacket):
-                counts.append(p.count)
-
-        # Register a temporary listener to collect all responses for a short window
-        self.register_opcode_callback(BoksNotificationOpcode.NOTIFY_LOGS_COUNT, handle_count)
+        """Internal get logs count with stabilization, 0 on error."""
         try:
-            packet = GetLogsCountPacket()
-
-            # 1. Wait for the FIRST response reliably using the standard mechanism
-            # This ensures we don't exit if the device takes >100ms to reply
-            first_resp = await self._send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_LOGS_COUNT])
-
-            # If we got a response via send_packet, ensure it's in our counts list
-            # (The callback might have caught it too, but duplication is fine since we take max)
-            if isinstance(first_resp, LogCountPacket):
-                counts.append(first_resp.count)
-
-            # 2. Wait a short window for potential subsequent "correction" responses (0 then 3)
-            await asyncio.sleep(TIMEOUT_LOG_COUNT_STABILIZATION)
-
-            if counts:
-                max_count = max(counts)
-                if len(counts) > 1:
-                    _LOGGER.debug("Stabilized log count: %d (from multiple responses: %s)", max_count, counts)
-                return max_count
+            return await self._read_logs_count()
         except Exception as e:
             _LOGGER.warning("Error during stabilized log count fetch: %s", e)
-        finally:
-            self.unregister_opcode_callback(BoksNotificationOpcode.NOTIFY_LOGS_COUNT, handle_count)
-
         return 0
 
-    async def get_logs(self, count: int) -> list[dict]:
-        """Retrieve logs."""
-        async with self._lock:
-            await self._connect()
-            try:
-                return await self._get_logs(count)
-            finally:
-                await self._disconnect()
+    async def _read_logs_count(self) -> int:
+        """Request the logs count with stabilization (raises on error)."""
+        # Some firmwares answer 0 then correct to N, intermittently
+        responses = await self._request_until_quiet(
+            GetLogsCountPacket(),
+            [BoksNotificationOpcode.NOTIFY_LOGS_COUNT],
+            provisional=lambda p: isinstance(p, LogCountPacket) and p.count == 0,
+        )
+        # Keep the highest
+        counts = [resp.count for resp in responses if isinstance(resp, LogCountPacket)]
+        if not counts:
+            return 0
+        max_count = max(counts)
+        if len(counts) > 1:
+            _LOGGER.debug("Stabilized log count: %d (from multiple responses: %s)", max_count, counts)
+        return max_count
+
+    async def get_logs(self, count: int, sink: Callable[[dict], None] | None = None) -> list[dict]:
+        """Retrieve logs. If given, sink is called with each entry as soon as it arrives."""
+        return await self._scheduler.execute(lambda: self._get_logs(count, sink))
+
+    async def iter_logs(self, count: int) -> AsyncIterator[list[dict]]:
+        """
+        Retrieve logs as an async stream of batches.
+        The download keeps running while the consumer processes a batch (BLE
+        notifications cannot be paused), entries received meanwhile are yielded in
+        the next batch, so a slow consumer gets fewer, larger batches.
+        """
+        pending: deque[dict] = deque()
+        arrived = asyncio.Event()
+
+        def sink(entry: dict) -> None:
+            pending.append(entry)
+            arrived.set()
+
+        fetch = asyncio.ensure_future(self.get_logs(count, sink))
+        try:
+            while True:
+                if not pending:
+                    if fetch.done():
+                        break
+                    arrived.clear()
+                    waiter = asyncio.ensure_future(arrived.wait())
+                    try:
+                        await asyncio.wait({fetch, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        waiter.cancel()
+                    continue
 
-    async def _get_logs(self, count: int) -> list[dict]:
+                yield [pending.popleft() for _ in range(min(len(pending), LOG_STREAM_MAX_BATCH))]
+
+            # Surface download errors once every received entry has been delivered
+            fetch.result()
+        finally:
+            if not fetch.done():
+                fetch.cancel()
+
+    async def _get_logs(self, count: int, sink: Callable[[dict], None] | None = None) -> list[dict]:
         """Internal retrieve logs."""
         if count <= 0:
             return []
         packet = RequestLogsPacket()
         logs = []
+        delivered: list[tuple[bytes, int]] = []
         logs_received_event = asyncio.Event()
-        def log_callback(opcode, data):
+        progress = asyncio.Event()
+        # Entries already published by a download that stalled, sent again first
+        skipping = self._log_downloads.start() > 0
+        skipped = 0
+
+        def log_callback(p: BoksRXPacket):
+            nonlocal skipped, skipping
+            opcode = p.opcode
             if opcode == BoksHistoryEvent.LOG_END_HISTORY:
                 logs_received_event.set()
-            elif opcode in BOKS_HISTORY_EVENTS_SET:
-                p = PacketFactory.from_rx_data(data)
-                if p:
-                    logs.append({"opcode": p.opcode, "payload": p.payload, "timestamp": int(time.time()) - getattr(p, 'age', 0), "event_type": p.event_type, "description": p.opcode.name.lower() if hasattr(p.opcode, 'name') else "unknown", "extra_data": p.extra_data})
-            elif opcode == BoksNotificationOpcode.NOTIFY_LOGS_COUNT and len(data) >= 4 and data[2] == 0 and data[3] == 0:
+                progress.set()
+            elif (info := get_opcode_info(opcode)).is_history:
+                progress.set()
+                self._log_downloads.entry_received()
+                fingerprint = BoksLogDownloadTracker.fingerprint(opcode, getattr(p, "log_payload", p.payload))
+                timestamp = int(time.time()) - getattr(p, 'age', 0)
+                if skipping:
+                    if self._log_downloads.matches(skipped, fingerprint, timestamp):
+                        skipped += 1
+                        return
+                    skipping = False
+                delivered.append((fingerprint, timestamp))
+                entry = {"opcode": p.opcode, "payload": p.payload, "timestamp": timestamp, "event_type": info.event_type, "description": info.name.lower(), "extra_data": p.extra_data}
+                logs.append(entry)
+                if sink is not None:
+                    sink(entry)
+            elif isinstance(p, LogCountPacket) and len(p.payload) >= 2 and p.count == 0:
                 logs_received_event.set()
-        self._notify_callback = log_callback
+                progress.set()
+
+        unsubscribe = self.subscribe_notifications(log_callback)
+        gap = TIMEOUT_LOG_FIRST_PACKET
         try:
             await self._send_packet(packet)
-            await asyncio.wait_for(logs_received_event.wait(), timeout=5.0 + (count * 1.5))
+            # Watchdog: every packet re-arms the timer, a silent link fails within seconds
+            while not logs_received_event.is_set():
+                progress.clear()
+                await asyncio.wait_for(progress.wait(), timeout=gap)
+                gap = TIMEOUT_LOG_PACKET_GAP
         except TimeoutError:
-            _LOGGER.warning("Timeout waiting for logs. Received %d/%d", len(logs), count)
+            _LOGGER.warning("History download stalled after %d/%d entries (no packet for %.1fs)",
+                            len(logs) + skipped, count, gap)
         finally:
-            self._notify_callback = None
+            unsubscribe()
+            complete = logs_received_event.is_set()
+            self._log_downloads.finish(delivered, count, complete, skipped)
+            if skipped:
+                _LOGGER.debug("Skipped %d history entries already delivered before a stall", skipped)
+
+        if logs:
+            self._check_empty_sync(logs)
 
         # We just retrieved logs, so we don't need another refresh on disconnect
         self._refresh_needed = False
         return logs
 
+    def _check_empty_sync(self, logs: list[dict]) -> None:
+        """Settle a post door event sync that found no logs, using the entries downloaded since."""
+        if self._empty_sync_check is None:
+            return
+        source, delay, checked_at = self._empty_sync_check
+        self._empty_sync_check = None
+        if any(entry["timestamp"] < checked_at - LOG_TIMESTAMP_TOLERANCE for entry in logs):
+            _LOGGER.debug("History entries predate an empty post door event sync, raising its delay")
+            self._sync_delays.record_failure(source, delay)
+        else:
+            self._sync_delays.record_success(source, delay)
+
     async def create_pin_code(self, code: str, code_type: str, index: int = 0) -> str:
         """Create a PIN code."""
         if not self._config_key_str:
@@ -924,6 +1282,11 @@ class BoksBluetoothDevice:
         # Validate format
         code = self._validate_pin(code)
 
+        # Code management packets are only imported when used
+        from ..packets.tx.create_master_code import CreateMasterCodePacket
+        from ..packets.tx.create_multi_code import CreateMultiUseCodePacket
+        from ..packets.tx.create_single_code import CreateSingleUseCodePacket
+
         if code_type == "master":
             packet = CreateMasterCodePacket(self._config_key_str, code, index)
         elif code_type == "single":
@@ -951,6 +1314,10 @@ class BoksBluetoothDevice:
              except Exception as e:
                  _LOGGER.debug("Could not fetch initial counts for deletion workaround: %s", e)
 
+        from ..packets.tx.delete_master_code import DeleteMasterCodePacket
+        from ..packets.tx.delete_multi_code import DeleteMultiUseCodePacket
+        from ..packets.tx.delete_single_code import DeleteSingleUseCodePacket
+
         if type == "master":
             packet = DeleteMasterCodePacket(self._config_key_str, int(index_or_code))
         elif type == "single":
@@ -981,6 +1348,8 @@ class BoksBluetoothDevice:
         """Set device configuration."""
         if not self._config_key_str:
             raise BoksAuthError("config_key_required")
+        from ..packets.tx.set_configuration import SetConfigurationPacket
+
         packet = SetConfigurationPacket(self._config_key_str, config_type, value)
         resp = await self.send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_SET_CONFIGURATION_SUCCESS, BoksNotificationOpcode.ERROR_UNAUTHORIZED, BoksNotificationOpcode.ERROR_BAD_REQUEST])
         if resp and resp.opcode == BoksNotificationOpcode.NOTIFY_SET_CONFIGURATION_SUCCESS:
@@ -993,6 +1362,8 @@ class BoksBluetoothDevice:
         """Start NFC scan mode."""
         if not self._config_key_str:
             raise BoksAuthError("config_key_required")
+        from ..packets.tx.nfc_scan_start import NfcScanStartPacket
+
         packet = NfcScanStartPacket(self._config_key_str)
         # We wait for success ACK OR immediate result (if tag already on reader)
         resp = await self.send_packet(
@@ -1083,6 +1454,8 @@ class BoksBluetoothDevice:
         """Register NFC tag."""
         if not self._config_key_str:
             raise BoksAuthError("config_key_required")
+        from ..packets.tx.register_nfc_tag import RegisterNfcTagPacket
+
         packet = RegisterNfcTagPacket(self._config_key_str, uid)
         resp = await self.send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_NFC_TAG_REGISTERED, BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_REGISTER, BoksNotificationOpcode.ERROR_UNAUTHORIZED, BoksNotificationOpcode.ERROR_BAD_REQUEST])
         if resp and resp.opcode == BoksNotificationOpcode.NOTIFY_NFC_TAG_REGISTERED:
@@ -1098,6 +1471,8 @@ class BoksBluetoothDevice:
         """Unregister NFC tag."""
         if not self._config_key_str:
             raise BoksAuthError("config_key_required")
+        from ..packets.tx.nfc_unregister_tag import NfcUnregisterTagPacket
+
         packet = NfcUnregisterTagPacket(self._config_key_str, uid)
         resp = await self.send_packet(packet, wait_for_opcodes=[BoksNotificationOpcode.NOTIFY_NFC_TAG_UNREGISTERED, BoksNotificationOpcode.ERROR_UNAUTHORIZED, BoksNotificationOpcode.ERROR_BAD_REQUEST])
         if resp and resp.opcode == BoksNotificationOpcode.NOTIFY_NFC_TAG_UNREGISTERED:
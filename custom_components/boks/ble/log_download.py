@@ -0,0 +1,103 @@
+"""Progress tracking of Boks history downloads."""
+import time
+from typing import Any
+
+from ..const import LOG_TIMESTAMP_TOLERANCE
+
+# Smoothing factor of the download rate moving average
+_RATE_ALPHA = 0.3
+
+
+class BoksLogDownloadTracker:
+    """
+    Track history downloads: entries per second and a resume marker.
+    When a download stalls, the fingerprints (opcode + log payload) and the
+    absolute timestamps of the entries already delivered are kept; the next
+    dump starts over from the oldest entry, so that prefix is skipped instead
+    of being published twice. Payload-less events (door opened/closed) only
+    differ by their timestamp, which is compared with a tolerance since it is
+    computed from the entry age. A marker that fails to match is dropped.
+    """
+
+    def __init__(self):
+        """Initialize the tracker."""
+        self._resume: list[tuple[bytes, int]] = []
+        self._mismatched = False
+        self._started = 0.0
+        self._first_entry: float | None = None
+        self._received = 0
+        self.downloads = 0
+        self.stalls = 0
+        self.resumed_entries = 0
+        self.rate: float | None = None
+        self.last: dict[str, Any] = {}
+
+    @staticmethod
+    def fingerprint(opcode: int, log_payload: bytes | memoryview) -> bytes:
+        """Return the identity of a history entry across dumps."""
+        return bytes((opcode & 0xFF,)) + bytes(log_payload)
+
+    def start(self) -> int:
+        """Start a download. Returns the number of entries of the resume marker."""
+        self._started = time.monotonic()
+        self._first_entry = None
+        self._received = 0
+        self._mismatched = False
+        return len(self._resume)
+
+    def matches(self, index: int, fingerprint: bytes, timestamp: int) -> bool:
+        """Return True if an entry is the index-th one of the resume marker (False drops the marker)."""
+        if self._mismatched or index >= len(self._resume):
+            return False
+        expected, expected_timestamp = self._resume[index]
+        if expected == fingerprint and abs(timestamp - expected_timestamp) <= LOG_TIMESTAMP_TOLERANCE:
+            return True
+        self._mismatched = True
+        return False
+
+    def entry_received(self) -> None:
+        """Record the arrival of a history entry (skipped or not)."""
+        if self._first_entry is None:
+            self._first_entry = time.monotonic()
+        self._received += 1
+
+    def finish(self, delivered: list[tuple[bytes, int]], expected: int, complete: bool, skipped: int) -> None:
+        """Record the end of a download and update the resume marker."""
+        now = time.monotonic()
+        self.downloads += 1
+        self.resumed_entries += skipped
+
+        rate = None
+        if self._first_entry is not None and self._received > 1 and now > self._first_entry:
+            # Entries after the first one, over the streaming time (excludes the request round trip)
+            rate = (self._received - 1) / (now - self._first_entry)
+            self.rate = rate if self.rate is None else self.rate + _RATE_ALPHA * (rate - self.rate)
+
+        if complete:
+            self._resume = []
+        else:
+            self.stalls += 1
+            # Nothing received, or stalled within the marker: it is still valid.
+            # Otherwise only its replayed prefix is kept.
+            if self._mismatched or skipped >= len(self._resume):
+                self._resume = self._resume[:skipped] + delivered
+
+        self.last = {
+            "expected": expected,
+            "received": self._received,
+            "skipped": skipped,
+            "complete": complete,
+            "duration": round(now - self._started, 3),
+            "rate": round(rate, 2) if rate is not None else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return download statistics (for diagnostics)."""
+        return {
+            "downloads": self.downloads,
+            "stalls": self.stalls,
+            "resume_marker": len(self._resume),
+            "resumed_entries": self.resumed_entries,
+            "rate": round(self.rate, 2) if self.rate is not None else None,
+            "last": self.last,
+        }
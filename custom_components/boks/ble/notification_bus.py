@@ -0,0 +1,122 @@
+"""Typed notification bus for Boks BLE packets."""
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from ..packets.base import BoksRXPacket
+
+_LOGGER = logging.getLogger(__name__)
+
+NotificationCallback = Callable[[BoksRXPacket], None]
+
+
+class _Subscription:
+    """A subscriber and its filters."""
+
+    __slots__ = ("callback", "opcodes", "packet_types", "delivered", "errors")
+
+    def __init__(
+        self,
+        callback: NotificationCallback,
+        opcodes: frozenset[int] | None,
+        packet_types: tuple[type[BoksRXPacket], ...] | None,
+    ):
+        self.callback = callback
+        self.opcodes = opcodes
+        self.packet_types = packet_types
+        self.delivered = 0
+        self.errors = 0
+
+
+class BoksNotificationBus:
+    """
+    Deliver decoded RX packets to subscribers filtered by opcode and/or packet class.
+    Opcode-filtered subscribers are indexed by opcode, a failing subscriber is logged
+    and counted without affecting the others.
+    """
+
+    def __init__(self):
+        """Initialize the bus."""
+        self._by_opcode: dict[int, list[_Subscription]] = {}
+        self._wildcard: list[_Subscription] = []
+        self.published = 0
+        self.delivered = 0
+        self.errors = 0
+        self._dispatch_counts: dict[int, int] = {}
+
+    def subscribe(
+        self,
+        callback: NotificationCallback,
+        opcodes: Iterable[int] | None = None,
+        packet_type: type[BoksRXPacket] | tuple[type[BoksRXPacket], ...] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to packets matching all given filters. Returns the unsubscribe function."""
+        if packet_type is not None and not isinstance(packet_type, tuple):
+            packet_type = (packet_type,)
+        opcode_set = frozenset(int(op) for op in opcodes) if opcodes is not None else None
+        subscription = _Subscription(callback, opcode_set, packet_type)
+
+        if opcode_set is None:
+            self._wildcard.append(subscription)
+        else:
+            for opcode in opcode_set:
+                self._by_opcode.setdefault(opcode, []).append(subscription)
+
+        def unsubscribe() -> None:
+            self._remove(subscription)
+
+        return unsubscribe
+
+    def _remove(self, subscription: _Subscription) -> None:
+        """Remove a subscription (idempotent)."""
+        if subscription.opcodes is None:
+            if subscription in self._wildcard:
+                self._wildcard.remove(subscription)
+            return
+
+        for opcode in subscription.opcodes:
+            subscribers = self._by_opcode.get(opcode)
+            if subscribers and subscription in subscribers:
+                subscribers.remove(subscription)
+                if not subscribers:
+                    del self._by_opcode[opcode]
+
+    def publish(self, packet: BoksRXPacket) -> int:
+        """Deliver a packet to every matching subscriber. Returns the number of deliveries."""
+        opcode = packet.opcode
+        self.published += 1
+        self._dispatch_counts[opcode] = self._dispatch_counts.get(opcode, 0) + 1
+
+        subscribers = self._by_opcode.get(opcode)
+        # Copy so callbacks may unsubscribe while we iterate
+        candidates = (subscribers + self._wildcard) if subscribers else self._wildcard[:]
+
+        delivered = 0
+        for subscription in candidates:
+            if subscription.packet_types is not None and not isinstance(packet, subscription.packet_types):
+                continue
+            try:
+                subscription.callback(packet)
+            except Exception as e:
+                subscription.errors += 1
+                self.errors += 1
+                _LOGGER.error("Error in notification subscriber %s for opcode 0x%02X: %s",
+                              getattr(subscription.callback, "__qualname__", subscription.callback), opcode, e)
+                continue
+            subscription.delivered += 1
+            delivered += 1
+
+        self.delivered += delivered
+        return delivered
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return dispatch counters (for diagnostics)."""
+        subscriptions = {id(sub): sub for subs in self._by_opcode.values() for sub in subs}
+        subscriptions.update({id(sub): sub for sub in self._wildcard})
+        return {
+            "subscribers": len(subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "per_opcode": {f"0x{opcode:02X}": count for opcode, count in sorted(self._dispatch_counts.items())},
+        }
@@ -0,0 +1,94 @@
+"""Learned quiescence windows for multi-answer Boks replies."""
+import logging
+from typing import Any
+
+from ..const import (
+    QUIESCENCE_MAX_WINDOW,
+    QUIESCENCE_MIN_WINDOW,
+    QUIESCENCE_PROBE_EVERY,
+    QUIESCENCE_SINGLE_ANSWER_SAMPLES,
+    TIMEOUT_LOG_COUNT_STABILIZATION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Margin applied to the slowest follow-up seen
+_FOLLOW_UP_MARGIN = 1.5
+
+
+class _QuiescenceState:
+    """What we know about the replies of one opcode on one firmware."""
+
+    __slots__ = ("calls", "samples", "follow_ups", "max_delay")
+
+    def __init__(self):
+        self.calls = 0
+        # Replies observed with a full window
+        self.samples = 0
+        # Replies followed by another notification of the same kind
+        self.follow_ups = 0
+        self.max_delay = 0.0
+
+
+class BoksQuiescence:
+    """
+    Decide how long to keep listening after the first reply to a request.
+    Some firmwares answer twice (e.g. a log count of 0 corrected to N a moment
+    later). Per firmware version and reply opcode, a firmware that never sent a
+    follow-up over several full windows is trusted to answer once (no wait,
+    with an occasional probe), otherwise the window follows the slowest
+    follow-up seen. A provisional first reply (one a firmware is known to
+    correct, like a log count of 0) always gets at least the default window.
+    """
+
+    def __init__(self, default_window: float = TIMEOUT_LOG_COUNT_STABILIZATION):
+        """Initialize the learner."""
+        self._default_window = default_window
+        self._states: dict[tuple[str, int], _QuiescenceState] = {}
+
+    def _state(self, firmware: str, opcode: int) -> _QuiescenceState:
+        """Return the state of a firmware/opcode pair, created on first use."""
+        key = (firmware, opcode)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _QuiescenceState()
+        return state
+
+    def window(self, firmware: str, opcode: int, provisional: bool = False) -> float:
+        """Return how long to wait for a follow-up after the last reply (0: do not wait)."""
+        state = self._state(firmware, opcode)
+        state.calls += 1
+        if state.follow_ups:
+            window = min(QUIESCENCE_MAX_WINDOW, max(QUIESCENCE_MIN_WINDOW, state.max_delay * _FOLLOW_UP_MARGIN))
+        elif state.samples >= QUIESCENCE_SINGLE_ANSWER_SAMPLES and state.calls % QUIESCENCE_PROBE_EVERY:
+            window = 0.0
+        else:
+            window = self._default_window
+        if provisional:
+            # The correction may be intermittent, a quiet history does not rule it out
+            return max(window, self._default_window)
+        return window
+
+    def record(self, firmware: str, opcode: int, window: float, follow_up_delays: list[float]) -> None:
+        """Record the replies received after the first one (delays from the first reply)."""
+        if window <= 0 and not follow_up_delays:
+            return
+        state = self._state(firmware, opcode)
+        state.samples += 1
+        if follow_up_delays:
+            if not state.follow_ups:
+                _LOGGER.debug("Firmware %s sends several 0x%02X replies, waiting for quiescence", firmware, opcode)
+            state.follow_ups += 1
+            state.max_delay = max(state.max_delay, max(follow_up_delays))
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the learned behaviour (for diagnostics)."""
+        return {
+            f"{firmware}/0x{opcode:02X}": {
+                "calls": state.calls,
+                "samples": state.samples,
+                "follow_ups": state.follow_ups,
+                "max_delay": round(state.max_delay, 3),
+            }
+            for (firmware, opcode), state in self._states.items()
+        }
@@ -0,0 +1,125 @@
+"""Bounded-concurrency batches of independent GATT reads."""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ..const import GATT_READ_MAX_CONCURRENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _ReadTiming:
+    """Timing statistics of one named read."""
+
+    __slots__ = ("count", "failures", "last", "max", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+
+
+class BoksReadBatcher:
+    """
+    Run the independent reads of a session (GATT characteristic reads and
+    command/response exchanges) with bounded concurrency instead of one after
+    another. A backend that fails reads only while others are in flight (some
+    proxies do not queue ATT requests) is retried and then kept to one read at
+    a time. Per-read timings are kept for diagnostics.
+    """
+
+    def __init__(self, max_concurrency: int = GATT_READ_MAX_CONCURRENCY):
+        """Initialize the batcher."""
+        self._max_concurrency = max(1, max_concurrency)
+        self._serial_backends: set[str] = set()
+        self._timings: dict[str, _ReadTiming] = {}
+        self.batches = 0
+        self.last_batch: dict[str, Any] = {}
+
+    def concurrency(self, backend: str) -> int:
+        """Return how many reads may be in flight on a backend."""
+        return 1 if backend in self._serial_backends else self._max_concurrency
+
+    async def run(self, backend: str, reads: dict[str, Callable[[], Awaitable[Any]]]) -> dict[str, Any]:
+        """
+        Run the reads and return their results by name.
+        A failed read is returned as its exception, callers decide how to handle it.
+        """
+        limit = self.concurrency(backend)
+        semaphore = asyncio.Semaphore(limit)
+        started = time.monotonic()
+
+        async def timed(name: str, read: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                read_started = time.monotonic()
+                failed = True
+                try:
+                    result = await read()
+                    failed = False
+                    return result
+                finally:
+                    self._record(name, time.monotonic() - read_started, failed)
+
+        outcomes = await asyncio.gather(*(timed(name, read) for name, read in reads.items()), return_exceptions=True)
+        results = dict(zip(reads, outcomes, strict=True))
+        for result in outcomes:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+
+        failed = [name for name, result in results.items() if isinstance(result, Exception)]
+        if failed and limit > 1:
+            # Retry alone: a read that only fails with company means the backend cannot overlap them
+            recovered = False
+            for name in failed:
+                try:
+                    results[name] = await timed(name, reads[name])
+                    recovered = True
+                except Exception as e:
+                    results[name] = e
+            if recovered:
+                _LOGGER.debug("Backend %s failed concurrent reads (%s), using sequential reads", backend, failed)
+                self._serial_backends.add(backend)
+
+        self.batches += 1
+        self.last_batch = {
+            "backend": backend,
+            "concurrency": limit,
+            "reads": len(reads),
+            "failed": [name for name, result in results.items() if isinstance(result, Exception)],
+            "duration": round(time.monotonic() - started, 3),
+        }
+        return results
+
+    def _record(self, name: str, duration: float, failed: bool) -> None:
+        """Record the duration of one read."""
+        timing = self._timings.get(name)
+        if timing is None:
+            timing = self._timings[name] = _ReadTiming()
+        timing.count += 1
+        timing.failures += failed
+        timing.last = duration
+        timing.max = max(timing.max, duration)
+        timing.total += duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return batch statistics and per-read timings (for diagnostics)."""
+        return {
+            "max_concurrency": self._max_concurrency,
+            "serial_backends": sorted(self._serial_backends),
+            "batches": self.batches,
+            "last_batch": self.last_batch,
+            "reads": {
+                name: {
+                    "count": timing.count,
+                    "failures": timing.failures,
+                    "last": round(timing.last, 3),
+                    "max": round(timing.max, 3),
+                    "mean": round(timing.total / timing.count, 3),
+                }
+                for name, timing in self._timings.items()
+            },
+        }
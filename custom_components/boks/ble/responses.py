@@ -0,0 +1,117 @@
+"""Response correlation table for Boks BLE commands."""
+import asyncio
+import bisect
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+# Upper bounds (seconds) of the latency histogram buckets, last bucket is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ResponseWaiter:
+    """A pending request waiting for one of several opcodes."""
+
+    __slots__ = ("future", "opcodes", "started")
+
+    def __init__(self, future: asyncio.Future, opcodes: tuple[int, ...]):
+        self.future = future
+        self.opcodes = opcodes
+        self.started = time.monotonic()
+
+
+class BoksResponseTable:
+    """
+    Match incoming notifications to the requests waiting for them.
+    Waiters are indexed by integer opcode, several waiters on the same opcode are
+    served in FIFO order and a notification nobody waits for costs one dict lookup.
+    """
+
+    def __init__(self):
+        """Initialize the table."""
+        self._waiters: dict[int, deque[_ResponseWaiter]] = {}
+        self._by_future: dict[asyncio.Future, _ResponseWaiter] = {}
+        self._histograms: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pending waiters."""
+        return len(self._by_future)
+
+    def register(self, opcodes: Iterable[int]) -> asyncio.Future:
+        """Register a waiter for any of the given opcodes and return its future."""
+        future = asyncio.get_running_loop().create_future()
+        waiter = _ResponseWaiter(future, tuple(int(op) for op in opcodes))
+        self._by_future[future] = waiter
+        for opcode in waiter.opcodes:
+            queue = self._waiters.get(opcode)
+            if queue is None:
+                queue = self._waiters[opcode] = deque()
+            queue.append(waiter)
+        return future
+
+    def discard(self, future: asyncio.Future) -> None:
+        """Remove a waiter (timeout or error) without resolving it."""
+        waiter = self._by_future.pop(future, None)
+        if waiter is not None:
+            self._unlink(waiter)
+
+    def resolve(self, opcode: int, response: Any) -> bool:
+        """Resolve the oldest waiter for this opcode. Returns True if one was resolved."""
+        queue = self._waiters.get(opcode)
+        if not queue:
+            return False
+
+        while queue:
+            waiter = queue.popleft()
+            self._by_future.pop(waiter.future, None)
+            if waiter.future.done():
+                # Cancelled by its caller, drop it from the other opcodes as well
+                self._unlink(waiter, opcode)
+                continue
+
+            waiter.future.set_result(response)
+            self._unlink(waiter, opcode)
+            self._record_latency(opcode, time.monotonic() - waiter.started)
+            return True
+
+        return False
+
+    def cancel_all(self) -> None:
+        """Cancel every pending waiter."""
+        for future in self._by_future:
+            if not future.done():
+                future.cancel()
+        self._by_future.clear()
+        self._waiters.clear()
+
+    def _unlink(self, waiter: _ResponseWaiter, resolved_opcode: int | None = None) -> None:
+        """Remove a waiter from the queues of its other opcodes."""
+        for opcode in waiter.opcodes:
+            if opcode == resolved_opcode:
+                continue
+            queue = self._waiters.get(opcode)
+            if queue is None:
+                continue
+            try:
+                queue.remove(waiter)
+            except ValueError:
+                pass
+        for opcode in waiter.opcodes:
+            if opcode in self._waiters and not self._waiters[opcode]:
+                del self._waiters[opcode]
+
+    def _record_latency(self, opcode: int, latency: float) -> None:
+        """Add a response latency to the histogram of its opcode."""
+        histogram = self._histograms.get(opcode)
+        if histogram is None:
+            histogram = self._histograms[opcode] = [0] * (len(LATENCY_BUCKETS) + 1)
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def latency_histograms(self) -> dict[str, dict[str, int]]:
+        """Return the latency histograms per opcode (for diagnostics)."""
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            f"0x{opcode:02X}": dict(zip(labels, counts, strict=True))
+            for opcode, counts in sorted(self._histograms.items())
+        }
@@ -0,0 +1,130 @@
+"""Scanner ranking for Boks BLE connections."""
+from collections import deque
+from typing import Any
+
+from ..const import (
+    SCANNER_DEFAULT_CONNECT_TIME,
+    SCANNER_DISCONNECT_PENALTY,
+    SCANNER_RSSI_HISTORY,
+    SCANNER_WEAK_RSSI,
+)
+
+# Smoothing factor of the connect time moving average
+_CONNECT_TIME_ALPHA = 0.3
+# Extra seconds per dB below SCANNER_WEAK_RSSI (used when a scanner has no history)
+_WEAK_RSSI_COST = 0.1
+
+
+class _ScannerStats:
+    """Rolling record of one scanner source."""
+
+    __slots__ = (
+        "rssi", "connect_time", "connect_attempts", "connect_failures",
+        "gatt_operations", "gatt_errors", "sessions", "disconnects",
+    )
+
+    def __init__(self):
+        self.rssi: deque[int] = deque(maxlen=SCANNER_RSSI_HISTORY)
+        self.connect_time: float | None = None
+        self.connect_attempts = 0
+        self.connect_failures = 0
+        self.gatt_operations = 0
+        self.gatt_errors = 0
+        self.sessions = 0
+        self.disconnects = 0
+
+    @property
+    def mean_rssi(self) -> float | None:
+        """Return the average of the recent RSSI samples."""
+        return sum(self.rssi) / len(self.rssi) if self.rssi else None
+
+
+class BoksScannerRanking:
+    """
+    Rank the adapters able to reach the Boks by expected time-to-first-response.
+    Each scanner source keeps a rolling RSSI history, a smoothed connect time, its
+    GATT error rate and how often the link dropped mid-session. The score is the
+    expected connect time divided by the connect success probability, inflated by
+    GATT errors and drops, so a loud but flaky proxy loses against a reliable one.
+    """
+
+    def __init__(self):
+        """Initialize the ranking."""
+        self._stats: dict[str, _ScannerStats] = {}
+
+    def _get(self, source: str) -> _ScannerStats:
+        """Return the stats of a source, created on first use."""
+        stats = self._stats.get(source)
+        if stats is None:
+            stats = self._stats[source] = _ScannerStats()
+        return stats
+
+    def observe_rssi(self, source: str, rssi: int | None) -> None:
+        """Add an RSSI sample seen by a scanner."""
+        if rssi is not None:
+            self._get(source).rssi.append(rssi)
+
+    def record_connect(self, source: str, success: bool, duration: float) -> None:
+        """Record a connection attempt and how long it took."""
+        stats = self._get(source)
+        stats.connect_attempts += 1
+        if not success:
+            stats.connect_failures += 1
+            return
+
+        stats.sessions += 1
+        if stats.connect_time is None:
+            stats.connect_time = duration
+        else:
+            stats.connect_time += _CONNECT_TIME_ALPHA * (duration - stats.connect_time)
+
+    def record_gatt_result(self, source: str, success: bool) -> None:
+        """Record the outcome of a GATT write/response exchange."""
+        stats = self._get(source)
+        stats.gatt_operations += 1
+        if not success:
+            stats.gatt_errors += 1
+
+    def record_disconnect(self, source: str) -> None:
+        """Record a link drop during an active session."""
+        self._get(source).disconnects += 1
+
+    def expected_time(self, source: str, rssi: int | None = None, extra_delay: float = 0.0) -> float:
+        """Return the expected seconds until the first response through this scanner."""
+        stats = self._stats.get(source) or _ScannerStats()
+
+        connect_time = stats.connect_time
+        if connect_time is None:
+            # No history: guess from the signal strength
+            connect_time = SCANNER_DEFAULT_CONNECT_TIME
+            reference = rssi if rssi is not None else stats.mean_rssi
+            if reference is not None and reference < SCANNER_WEAK_RSSI:
+                connect_time += (SCANNER_WEAK_RSSI - reference) * _WEAK_RSSI_COST
+
+        # Laplace smoothing so a single attempt does not make a scanner perfect or useless
+        success_rate = (stats.connect_attempts - stats.connect_failures + 1) / (stats.connect_attempts + 2)
+        gatt_error_rate = (stats.gatt_errors + 0.5) / (stats.gatt_operations + 10)
+        disconnect_rate = stats.disconnects / (stats.sessions + 1)
+
+        expected = (connect_time + extra_delay) / success_rate
+        # A failed exchange costs roughly a reconnection
+        expected *= 1 + gatt_error_rate
+        expected += disconnect_rate * SCANNER_DISCONNECT_PENALTY
+        return expected
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the per-scanner record (for diagnostics)."""
+        result = {}
+        for source, stats in self._stats.items():
+            mean_rssi = stats.mean_rssi
+            result[source] = {
+                "mean_rssi": round(mean_rssi, 1) if mean_rssi is not None else None,
+                "connect_time": round(stats.connect_time, 3) if stats.connect_time is not None else None,
+                "connect_attempts": stats.connect_attempts,
+                "connect_failures": stats.connect_failures,
+                "gatt_operations": stats.gatt_operations,
+                "gatt_errors": stats.gatt_errors,
+                "disconnects": stats.disconnects,
+                "expected_time": round(self.expected_time(source), 3),
+            }
+        return result
@@ -0,0 +1,101 @@
+"""Command scheduler for Boks BLE sessions."""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from ..const import MAX_QUEUED_COMMANDS
+
+if TYPE_CHECKING:
+    from .device import BoksBluetoothDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BoksCommandScheduler:
+    """
+    Run queued BLE operations back-to-back over a single physical session.
+    Callers enqueue an operation and await its result. A single worker drains the
+    queue under the device lock, so N queued commands cost one connection setup.
+    """
+
+    def __init__(self, device: "BoksBluetoothDevice", max_queued: int = MAX_QUEUED_COMMANDS):
+        """Initialize the scheduler."""
+        self._device = device
+        self._queue: asyncio.Queue[tuple[Callable[[], Awaitable[Any]], asyncio.Future]] = asyncio.Queue(max_queued)
+        self._worker: asyncio.Task | None = None
+        self.sessions_opened = 0
+        self.commands_executed = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued operations."""
+        return self._queue.qsize()
+
+    async def execute(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Queue an operation (run inside a connected session) and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        # Bounded queue: callers wait here when too many commands are pending
+        await self._queue.put((operation, future))
+        self._ensure_worker()
+        return await future
+
+    def _ensure_worker(self) -> None:
+        """Start the worker if it is not running."""
+        if self._worker is None or self._worker.done():
+            self._worker = self._device.hass.async_create_task(self._run())
+
+    async def _run(self) -> None:
+        """Drain the queue, opening one session per batch of commands."""
+        try:
+            while not self._queue.empty():
+                await self._run_session()
+        finally:
+            # Never leave callers waiting if the worker dies (e.g. cancelled on shutdown)
+            while not self._queue.empty():
+                _operation, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+    async def _run_session(self) -> None:
+        """Open a session and run queued operations until the queue is empty or the link drops."""
+        device = self._device
+        async with device._lock:
+            try:
+                await device._connect()
+            except Exception as e:
+                # Fail only the head command, its caller decides whether to retry
+                _operation, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(e)
+                return
+
+            self.sessions_opened += 1
+            executed = 0
+            try:
+                while not self._queue.empty():
+                    operation, future = self._queue.get_nowait()
+                    if future.done():
+                        # Caller gave up (cancelled) before we got to it
+                        continue
+
+                    try:
+                        result = await operation()
+                    except asyncio.CancelledError:
+                        future.cancel()
+                        raise
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                        if not device.is_connected:
+                            # Link lost, reconnect for the remaining commands
+                            break
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                    executed += 1
+            finally:
+                self.commands_executed += executed
+                if executed > 1:
+                    _LOGGER.debug("BLE session executed %d queued commands", executed)
+                await device._disconnect()
@@ -4,7 +4,7 @@ import logging
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -37,6 +37,12 @@ class BoksSyncLogsButton(CoordinatorEntity, ButtonEntity):
         self._entry = entry
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_sync_logs"
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator (only the availability is used, key pushes are ignored)."""
+        if self.coordinator.keys_changed(()):
+            super()._handle_coordinator_update()
+
     @property
     def suggested_object_id(self) -> str | None:
         """Return the suggested object id."""
@@ -7,9 +7,17 @@ from homeassistant.data_entry_flow import FlowResult
 from ..const import (
     BOKS_CHAR_MAP,
     CONF_ANONYMIZE_LOGS,
+    CONF_HOLD_CONNECTION,
+    CONF_HOLD_CONNECTION_IDLE,
     CONF_MASTER_CODE,
+    CONF_PARALLEL_CONNECT,
+    CONF_PIN_INDEX_RANGE,
     DEFAULT_FULL_REFRESH_INTERVAL,
+    DEFAULT_HOLD_CONNECTION_IDLE,
+    DEFAULT_PIN_INDEX_RANGE,
     DEFAULT_SCAN_INTERVAL,
+    MAX_HOLD_CONNECTION_IDLE,
+    MAX_PIN_INDEX_RANGE,
 )
 
 
@@ -56,6 +64,22 @@ class BoksOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_ANONYMIZE_LOGS,
                         default=self.entry.options.get(CONF_ANONYMIZE_LOGS, False),
                     ): bool,
+                    vol.Optional(
+                        CONF_HOLD_CONNECTION,
+                        default=self.entry.options.get(CONF_HOLD_CONNECTION, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HOLD_CONNECTION_IDLE,
+                        default=self.entry.options.get(CONF_HOLD_CONNECTION_IDLE, DEFAULT_HOLD_CONNECTION_IDLE),
+                    ): vol.All(int, vol.Range(min=0, max=MAX_HOLD_CONNECTION_IDLE)),
+                    vol.Optional(
+                        CONF_PARALLEL_CONNECT,
+                        default=self.entry.options.get(CONF_PARALLEL_CONNECT, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PIN_INDEX_RANGE,
+                        default=self.entry.options.get(CONF_PIN_INDEX_RANGE, DEFAULT_PIN_INDEX_RANGE),
+                    ): vol.All(int, vol.Range(min=0, max=MAX_PIN_INDEX_RANGE)),
                 }
             ),
             errors=errors,
@@ -9,11 +9,19 @@ CONF_MASTER_KEY = "master_key"
 CONF_MASTER_CODE = "master_code"
 CONF_ANONYMIZE_LOGS = "anonymize_logs"
 CONF_AUTH_METHOD = "auth_method"
+CONF_HOLD_CONNECTION = "hold_connection"
+CONF_HOLD_CONNECTION_IDLE = "hold_connection_idle"
+CONF_PARALLEL_CONNECT = "parallel_connect"
+CONF_PIN_INDEX_RANGE = "pin_index_range"
 BOKS_CHAR_MAP = "0123456789AB"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 10
 DEFAULT_FULL_REFRESH_INTERVAL = 12
+DEFAULT_HOLD_CONNECTION_IDLE = 120 # Seconds an idle connection is kept open in hold mode
+DEFAULT_PIN_INDEX_RANGE = 1000 # Indices per code type in the reverse PIN index (0 disables it)
+MAX_HOLD_CONNECTION_IDLE = 3600 # Longest idle window accepted for the hold connection mode
+MAX_PIN_INDEX_RANGE = 10000 # Largest reverse PIN index accepted (the index stores every PIN)
 
 EVENT_LOG = f"{DOMAIN}_log_entry"
 EVENT_PARCEL_COMPLETED = f"{DOMAIN}_parcel_completed"
@@ -46,12 +54,15 @@ BOKS_HARDWARE_INFO = {
 
 # Timeouts & Delays (Seconds)
 TIMEOUT_BLE_CONNECTION = 60.0
+TIMEOUT_BLE_INACTIVITY = 60 # Watchdog: force disconnect after this much silence during a session
 TIMEOUT_DOOR_OPEN_MESSAGE = 5 # Time to keep lock held after opening (anti-spam)
 TIMEOUT_DOOR_CLOSE = 120.0 # Time to wait for door to close after opening
 TIMEOUT_COMMAND_RESPONSE = 10.0
 TIMEOUT_NFC_LISTENING = 6.0 # Time the Boks hardware stays in NFC listening mode
 TIMEOUT_NFC_WAIT_RESULT = 7.0 # Security margin for HA to wait for NFC result
 TIMEOUT_LOG_RETRIEVAL_BASE = 15.0 # Minimum timeout for logs
+TIMEOUT_LOG_FIRST_PACKET = 5.0 # Time to wait for the first history packet after the request
+TIMEOUT_LOG_PACKET_GAP = 3.0 # Abort a history download after this much silence between packets
 TIMEOUT_LOG_COUNT_STABILIZATION = 0.5  # Time to wait for potentially multiple log count responses (increased for stability)
 DELAY_POST_DOOR_CLOSE_SYNC = 5.0 # Wait before syncing after door close/open
 DELAY_BATTERY_UPDATE = 1.0 # Wait before updating battery after door events
@@ -60,6 +71,28 @@ DELAY_RETRY = 0.5 # Delay between retries
 DELAY_RETRY_LONG = 2.0 # Longer delay for retries (e.g. generating code)
 MIN_DELAY_BETWEEN_CONNECTIONS = 0.5 # Wait between disconnect and next connect for ESP proxy stability
 
+# Adaptive Delays (learned per scanner source, seconds)
+DELAY_PRE_CONNECT_INITIAL = 1.0 # Starting pre-connect delay for an unknown adapter
+DELAY_PRE_CONNECT_MIN = 0.1
+DELAY_PRE_CONNECT_MAX = 3.0
+DELAY_POST_DOOR_SYNC_MIN = 1.0 # Lower bound for the post door event stabilization wait
+DELAY_POST_DOOR_SYNC_MAX = 10.0
+LOG_TIMESTAMP_TOLERANCE = 3 # Error margin of history timestamps (computed from the entry age)
+
+# Scanner Ranking
+SCANNER_RSSI_HISTORY = 10 # RSSI samples kept per scanner
+SCANNER_DEFAULT_CONNECT_TIME = 3.0 # Assumed connect time (s) for a scanner without history
+SCANNER_WEAK_RSSI = -75 # Below this RSSI an unknown scanner is expected to connect slower
+SCANNER_DISCONNECT_PENALTY = 10.0 # Expected seconds lost when the link drops mid-session
+
+# Parallel Connection Race
+PARALLEL_CONNECT_CANDIDATES = 3 # Scanners raced at most
+PARALLEL_CONNECT_STAGGER = 0.5 # Seconds between the start of each attempt
+
+# Hold Connection (battery-aware back-off, in %)
+HOLD_CONNECTION_FULL_BATTERY = 50 # Full idle window at or above this level
+HOLD_CONNECTION_MIN_BATTERY = 20 # No holding below this level
+
 # Retry Limits
 MAX_RETRIES_CODE_GENERATION = 2
 MAX_RETRIES_MASTER_CODE_CLEANING = 3
@@ -68,6 +101,33 @@ MAX_RETRIES_DEEP_DELETE = 10
 # Maintenance
 MAX_MASTER_CODE_CLEAN_RANGE = 100
 
+# Reverse PIN Index
+PIN_INDEX_CHUNK_SIZE = 500 # PINs generated per type between two saves
+PIN_INDEX_SAVE_DELAY = 10 # Seconds to debounce index saves
+
+# Reply Quiescence (learned per firmware, seconds)
+QUIESCENCE_MIN_WINDOW = 0.1 # Shortest wait for a follow-up reply on multi-answer firmware
+QUIESCENCE_MAX_WINDOW = 1.5 # Longest wait for a follow-up reply
+QUIESCENCE_SINGLE_ANSWER_SAMPLES = 5 # Full windows without follow-up before trusting a single answer
+QUIESCENCE_PROBE_EVERY = 20 # Re-check single-answer firmware with a full window every N requests
+
+# GATT Read Batching
+GATT_READ_MAX_CONCURRENCY = 3 # Independent reads in flight at once (backends that fail fall back to 1)
+
+# Log Streaming
+LOG_STREAM_MAX_BATCH = 50 # Max history entries enriched and published per event
+
+# Startup Snapshot
+SNAPSHOT_SAVE_DELAY = 30 # Seconds to debounce coordinator snapshot saves
+SNAPSHOT_MAX_LOGS = 50 # Most recent enriched log entries kept in the snapshot
+
+# Event Journal
+JOURNAL_QUERY_DEFAULT_LIMIT = 100 # Entries returned by query_events by default
+JOURNAL_QUERY_MAX_LIMIT = 1000 # Max entries returned by one query_events call
+
+# Command Scheduling
+MAX_QUEUED_COMMANDS = 16 # Pending BLE operations before callers are made to wait
+
 # Firmware Update Constants
 UPDATE_WWW_DIR = "boks"
 UPDATE_ASSETS_DIR = "assets"
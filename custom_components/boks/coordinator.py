@@ -2,14 +2,14 @@
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers import translation  # Import translation helper
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -22,8 +22,14 @@ from .const import (
     BOKS_HARDWARE_INFO,
     CONF_ANONYMIZE_LOGS,
     CONF_CONFIG_KEY,
+    CONF_HOLD_CONNECTION,
+    CONF_HOLD_CONNECTION_IDLE,
     CONF_MASTER_KEY,
+    CONF_PARALLEL_CONNECT,
+    CONF_PIN_INDEX_RANGE,
     DEFAULT_FULL_REFRESH_INTERVAL,
+    DEFAULT_HOLD_CONNECTION_IDLE,
+    DEFAULT_PIN_INDEX_RANGE,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     EVENT_LOGS_RETRIEVED,
@@ -31,16 +37,27 @@ from .const import (
 )
 from .errors import BoksError
 from .logic.anonymizer import BoksAnonymizer
+from .logic.data_snapshot import BoksDataSnapshot
+from .logic.device_info_cache import REBOOT_EVENT_TYPES, BoksDeviceInfoCache
+from .logic.door_state import DOOR_SOURCE_NOTIFICATION, DOOR_SOURCE_STATUS, BoksDoorState
+from .logic.event_journal import BoksEventJournal
 from .logic.log_processor import BoksLogProcessor
 from .logic.pin_generator import BoksPinGenerator
+from .logic.pin_index import BoksPinIndex
+from .logic.tag_resolver import BoksTagResolver
+from .logic.translation_cache import BoksLogTranslations, BoksTranslationCache
 from .nfc.nfc_controller import BoksNfcController
 from .packets.base import BoksRXPacket
 from .parcels.parcels_controller import BoksParcelsController
-from .updates.logic import BoksUpdateController
 from .util import process_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
+# Data keys updated when logs are published
+LOG_DATA_KEYS = ("latest_logs", "last_log_fetch_ts")
+# Pseudo data key notified when the maintenance status changes
+MAINTENANCE_STATUS_KEY = "maintenance_status"
+
 class BoksDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Boks data."""
 
@@ -53,14 +70,28 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
             anonymize_logs=entry.options.get(CONF_ANONYMIZE_LOGS, False)
         )
         self.ble_device.set_coordinator(self)
-        self.updates = BoksUpdateController(hass, self)
+        # Firmware update controller, created on first use (see the updates property)
+        self._updates = None
         self.nfc = BoksNfcController(hass, self)
         self.codes = BoksCodesController(hass, self)
         self.parcels = BoksParcelsController(hass, self)
         self.commands = BoksCommandsController(hass, self)
         self.pin_generator = BoksPinGenerator(entry.data.get(CONF_MASTER_KEY))
+        # Reverse index (PIN -> code slot), only useful when the master key is known
+        pin_index_range = entry.options.get(CONF_PIN_INDEX_RANGE, DEFAULT_PIN_INDEX_RANGE)
+        self.pin_index: BoksPinIndex | None = None
+        if entry.data.get(CONF_MASTER_KEY) and pin_index_range > 0:
+            self.pin_index = BoksPinIndex(hass, entry.entry_id, self.pin_generator, pin_index_range)
         # Initialize log processor
-        self.log_processor = BoksLogProcessor(hass, entry.data[CONF_ADDRESS])
+        self.tag_resolver = BoksTagResolver.async_acquire(hass)
+        entry.async_on_unload(self.tag_resolver.async_release)
+        self.journal = BoksEventJournal(hass, entry.entry_id)
+        self.device_info_cache = BoksDeviceInfoCache(hass, entry.entry_id)
+        self.snapshot = BoksDataSnapshot(hass, entry.entry_id)
+        self.door_state = BoksDoorState()
+        # Data keys of the push being notified (None: full update, every key may have changed)
+        self.changed_keys: frozenset[str] | None = None
+        self.log_processor = BoksLogProcessor(hass, entry.data[CONF_ADDRESS], self.pin_index, self.tag_resolver)
 
         # Register callback for push updates (door status, battery info)
         self.ble_device.register_status_callback(self._handle_status_update)
@@ -74,6 +105,16 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
         self.full_refresh_interval_hours = entry.options.get("full_refresh_interval", DEFAULT_FULL_REFRESH_INTERVAL)
         # Set the full refresh interval on the BLE device
         self.ble_device.set_full_refresh_interval(self.full_refresh_interval_hours)
+        # Optionally keep the connection open between sessions
+        self.ble_device.set_hold_connection(
+            entry.options.get(CONF_HOLD_CONNECTION, False),
+            entry.options.get(CONF_HOLD_CONNECTION_IDLE, DEFAULT_HOLD_CONNECTION_IDLE),
+        )
+        self.ble_device.set_parallel_connect(entry.options.get(CONF_PARALLEL_CONNECT, False))
+        # A known firmware lets the device reuse what it learned about multi-answer replies
+        device_entry = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, entry.data[CONF_ADDRESS])})
+        if device_entry is not None:
+            self.ble_device.set_firmware_version(device_entry.sw_version)
 
         # Get scan interval from options, default to constant
         scan_interval_minutes = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
@@ -92,14 +133,89 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
         self._maintenance_status = {"running": False}
         self._device_info = None
         self._translations: dict[str, str] = {}
+        self.translation_cache = BoksTranslationCache(hass)
+        self.translation_cache.async_start()
+        entry.async_on_unload(self.translation_cache.async_stop)
+
+    @property
+    def updates(self):
+        """Return the firmware update controller, importing the update stack on first use."""
+        if self._updates is None:
+            from .updates.logic import BoksUpdateController
+
+            self._updates = BoksUpdateController(self.hass, self)
+        return self._updates
 
     @property
     def maintenance_status(self):
         return self._maintenance_status
 
+    async def async_load_device_info(self) -> None:
+        """Seed the device information from the persisted cache (no BLE)."""
+        await self.device_info_cache.async_load()
+        info = self.device_info_cache.get()
+        if info and "device_info_service" not in self.data:
+            self.data["device_info_service"] = info
+            self._device_info = None
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last known data (no BLE). Returns True if a snapshot was found."""
+        snapshot = await self.snapshot.async_load()
+        if not snapshot:
+            return False
+        for key, value in snapshot.items():
+            # Fresher values (e.g. the device information cache) win
+            self.data.setdefault(key, value)
+        self._device_info = None
+        # Entities are added before the first BLE refresh, derive the door state from the restored logs
+        self.door_state.apply_logs(self.data.get("latest_logs") or [])
+        _LOGGER.debug("Restored coordinator snapshot: %s", list(snapshot))
+        return True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners and schedule a snapshot save."""
+        super().async_update_listeners()
+        self.snapshot.async_schedule_save(self.data)
+
+    @callback
+    def async_notify_keys(self, keys: Iterable[str]) -> None:
+        """
+        Notify the listeners that the given data keys changed.
+        The keys are exposed as changed_keys while the listeners run, entities
+        skip the update when none of the keys they use changed (see BoksEntity).
+        """
+        keys = frozenset(keys)
+        if not keys:
+            return
+        self.changed_keys = keys
+        try:
+            self.async_update_listeners()
+        finally:
+            self.changed_keys = None
+
+    def keys_changed(self, keys: Iterable[str] | None) -> bool:
+        """Return True if the update being notified may concern one of the keys (None: any key)."""
+        return self.changed_keys is None or keys is None or not self.changed_keys.isdisjoint(keys)
+
+    @callback
+    def async_set_door_state(self, is_open: bool, source: str, timestamp: float | None = None) -> None:
+        """Apply a door observation, notifying the door listeners on a transition."""
+        if self.door_state.update(is_open, source, timestamp):
+            self.async_update_keys({"door_open": is_open})
+
+    @callback
+    def async_update_keys(self, updates: dict[str, Any]) -> None:
+        """Apply a partial update and notify the listeners of the keys whose value changed."""
+        changed = [key for key, value in updates.items() if key not in self.data or self.data[key] != value]
+        self.data.update(updates)
+        self.async_notify_keys(changed)
+
     def set_translations(self, translations: dict):
         """Set translations for the coordinator."""
         self._translations = translations
+        # The entity category is included, no need to load it again for log enrichment
+        self.translation_cache.prime(self.hass.config.language, translations)
 
     def get_text(self, category: str, key: str, **kwargs) -> str:
         """Get a translated string."""
@@ -127,7 +243,8 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
         Get device info from cache, live fetch, or registry fallback.
         Returns a dict with 'sw_version', 'hw_version', 'internal_revision'.
         """
-        # 1. Cache
+        # 1. Cache (coordinator data, then the persisted device information)
+        await self.async_load_device_info()
         info = {
             "sw_version": self.device_info.get("sw_version"),
             "hw_version": self.device_info.get("hw_version"),
@@ -140,6 +257,7 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.debug("Internal revision not in cache, trying live fetch...")
                 device_info_raw = await self.ble_device.get_device_information()
                 if device_info_raw:
+                    await self.device_info_cache.async_update(device_info_raw, datetime.now())
                     info["internal_revision"] = device_info_raw.get("firmware_revision")
                     # Update other fields if available and missing
                     if not info["sw_version"]:
@@ -172,9 +290,16 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
 
         return info
 
-    async def async_enrich_log_entry(self, log: BoksRXPacket | dict, translations: dict[str, str] = None) -> dict:
+    async def async_enrich_log_entry(
+        self,
+        log: BoksRXPacket | dict,
+        translations: BoksLogTranslations = None,
+        pending_scans: dict[str, int] | None = None,
+    ) -> dict:
         """Enrich a log entry using the dedicated processor."""
-        return await self.log_processor.async_enrich_log_entry(log, translations or self._translations)
+        if translations is None:
+            translations = await self.translation_cache.async_get()
+        return await self.log_processor.async_enrich_log_entry(log, translations, pending_scans)
 
 
     @property
@@ -215,7 +340,7 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
             "last_cleaned": current_index - 1 if current_index > 0 else 0,
             "message": message
         }
-        self.async_set_updated_data(self.data)
+        self.async_notify_keys((MAINTENANCE_STATUS_KEY,))
 
     def _handle_status_update(self, status_data: dict):
         """Handle push updates from the device."""
@@ -227,7 +352,8 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
             logs_raw = status_data.pop("latest_logs_raw")
             self.hass.async_create_task(self._process_pushed_logs(logs_raw))
 
-        self.data.update(status_data)
+        if "door_open" in status_data:
+            self.async_set_door_state(status_data.pop("door_open"), DOOR_SOURCE_NOTIFICATION)
 
         # Persist battery format if detected
         if "battery_stats" in status_data:
@@ -241,7 +367,7 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
                     new_data["battery_format"] = new_format
                     self.hass.config_entries.async_update_entry(self.entry, data=new_data)
 
-        self.async_set_updated_data(self.data)
+        self.async_update_keys(status_data)
 
     async def _process_pushed_logs(self, logs_raw: list[dict]):
         """Process logs that were pushed via status update."""
@@ -249,29 +375,12 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
             return
 
         _LOGGER.debug("Processing %d pushed logs", len(logs_raw))
-        try:
-            translations = await translation.async_get_translations(self.hass, self.hass.config.language, "entity", {DOMAIN})
-        except Exception:
-            translations = {}
-
-        event_data = {
-            "device_id": self.entry.entry_id,
-            "address": self.entry.data[CONF_ADDRESS],
-            "logs": []
-        }
-
-        for log in logs_raw:
-            try:
-                log_entry = await self.async_enrich_log_entry(log, translations)
-                event_data["logs"].append(log_entry)
-            except Exception as e:
-                _LOGGER.warning("Error processing pushed log: %s", e)
+        translations = await self.translation_cache.async_get()
+        enriched_logs, _has_power_on = await self._enrich_logs(logs_raw, translations)
 
-        if event_data["logs"]:
-            self.hass.bus.async_fire(EVENT_LOGS_RETRIEVED, event_data)
-            self.data["latest_logs"] = event_data["logs"]
-            self.data["last_log_fetch_ts"] = datetime.now().isoformat()
-            self.async_set_updated_data(self.data)
+        if enriched_logs:
+            self._publish_logs(enriched_logs, self._get_registry_device_id())
+            self.async_notify_keys(LOG_DATA_KEYS)
 
 
     async def async_sync_logs(self, update_state: bool = True) -> dict:
@@ -289,10 +398,7 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
 
             if log_count > 0:
                 _LOGGER.info("Found %d logs. Downloading...", log_count)
-                logs_raw = await self.ble_device.get_logs(log_count)
-
-                if logs_raw:
-                    result = await self._process_logs_data(logs_raw, update_state)
+                result = await self._stream_logs(log_count, update_state)
             else:
                 _LOGGER.debug("No logs to retrieve.")
 
@@ -303,39 +409,44 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
 
         return result
 
-    async def _process_logs_data(self, logs_raw: list[dict], update_state: bool) -> dict:
-        """Process, enrich and fire events for retrieved logs."""
-        # Filter and log
-        valid_logs = [log for log in logs_raw if log is not None]
-        if len(valid_logs) != len(logs_raw):
-            _LOGGER.warning("Filtered out %d None log entries", len(logs_raw) - len(valid_logs))
-
-        # Enrich logs
-        enriched_logs, has_power_on = await self._enrich_logs(valid_logs)
-
-        # Resolve real Device ID from registry
-        device_registry = dr.async_get(self.hass)
-        device_entry = device_registry.async_get_device(identifiers={(DOMAIN, self.entry.data[CONF_ADDRESS])})
-        real_device_id = device_entry.id if device_entry else None
+    async def _stream_logs(self, log_count: int, update_state: bool) -> dict:
+        """
+        Enrich and publish logs batch by batch while they are downloaded.
+        Each batch fires EVENT_LOGS_RETRIEVED and becomes latest_logs with a new
+        last_log_fetch_ts, so automations see the first entries without waiting
+        for the end of the history dump.
+        """
+        translations = await self.translation_cache.async_get()
+        real_device_id = self._get_registry_device_id()
 
-        # Fire event with correct IDs
-        event_data = {
-            "device_id": real_device_id,           # Real Device Registry ID
-            "config_entry_id": self.entry.entry_id, # Config Entry ID
-            "address": self.entry.data[CONF_ADDRESS],
-            "logs": enriched_logs
-        }
-        self.hass.bus.async_fire(EVENT_LOGS_RETRIEVED, event_data)
+        all_logs: list[dict] = []
+        has_power_on = False
+        fetch_ts = None
+        async for batch in self.ble_device.iter_logs(log_count):
+            valid_logs = [log for log in batch if log is not None]
+            if len(valid_logs) != len(batch):
+                _LOGGER.warning("Filtered out %d None log entries", len(batch) - len(valid_logs))
+
+            enriched_logs, batch_power_on = await self._enrich_logs(valid_logs, translations)
+            if not enriched_logs:
+                continue
+            has_power_on = has_power_on or batch_power_on
+            all_logs.extend(enriched_logs)
+            fetch_ts = self._publish_logs(enriched_logs, real_device_id)
+            self.async_notify_keys(LOG_DATA_KEYS)
+
+        if not all_logs:
+            return {}
 
         # Final checks
         if has_power_on:
             _LOGGER.info("Power ON detected in logs, polling live door status...")
-            self.data["door_open"] = await self.ble_device.get_door_status()
+            self.async_set_door_state(await self.ble_device.get_door_status(), DOOR_SOURCE_STATUS)
 
-        # Update results
+        # Keep the last batch timestamp: every entry was already published
         result = {
-            "latest_logs": enriched_logs,
-            "last_log_fetch_ts": datetime.now().isoformat()
+            "latest_logs": all_logs,
+            "last_log_fetch_ts": fetch_ts,
         }
 
         if update_state:
@@ -344,26 +455,58 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
 
         return result
 
-    async def _enrich_logs(self, logs: list[dict]) -> tuple[list[dict], bool]:
-        """Enrich raw logs with translations and metadata."""
-        try:
-            translations = await translation.async_get_translations(self.hass, self.hass.config.language, "entity", {DOMAIN})
-        except Exception as e:
-            _LOGGER.warning("Failed to load translations: %s", e)
-            translations = {}
+    def _publish_logs(self, enriched_logs: list[dict], real_device_id: str | None) -> str:
+        """Fire EVENT_LOGS_RETRIEVED for enriched logs and expose them as latest_logs. Returns the fetch timestamp."""
+        event_data = {
+            "device_id": real_device_id,           # Real Device Registry ID
+            "config_entry_id": self.entry.entry_id, # Config Entry ID
+            "address": self.entry.data[CONF_ADDRESS],
+            "logs": enriched_logs
+        }
+        self.hass.bus.async_fire(EVENT_LOGS_RETRIEVED, event_data)
+        self.entry.async_create_background_task(
+            self.hass, self.journal.async_append(enriched_logs), "boks_journal_append"
+        )
+
+        fetch_ts = datetime.now().isoformat()
+        if self.data is not None:
+            self.data["latest_logs"] = enriched_logs
+            self.data["last_log_fetch_ts"] = fetch_ts
+            # Batches arrive once, the door state follows them without rescanning
+            if self.door_state.apply_logs(enriched_logs):
+                self.async_update_keys({"door_open": self.door_state.is_open})
+        return fetch_ts
+
+    def _get_registry_device_id(self) -> str | None:
+        """Resolve the real Device ID from the registry."""
+        device_registry = dr.async_get(self.hass)
+        device_entry = device_registry.async_get_device(identifiers={(DOMAIN, self.entry.data[CONF_ADDRESS])})
+        return device_entry.id if device_entry else None
 
+    async def _enrich_logs(self, logs: list[dict], translations: BoksLogTranslations) -> tuple[list[dict], bool]:
+        """Enrich raw logs with translations and metadata."""
         enriched = []
         has_power_on = False
+        reboot: tuple[str, float | None] | None = None
+        # Tag last_scanned dates are written once per tag for the whole batch
+        pending_scans: dict[str, int] = {}
 
         for i, log in enumerate(logs):
             try:
-                entry = await self.async_enrich_log_entry(log, translations)
+                entry = await self.async_enrich_log_entry(log, translations, pending_scans)
                 enriched.append(entry)
-                if entry.get("event_type") == "power_on":
+                event_type = entry.get("event_type")
+                if event_type == "power_on":
                     has_power_on = True
+                if event_type in REBOOT_EVENT_TYPES:
+                    reboot = (event_type, entry.get("timestamp"))
             except Exception as e:
                 _LOGGER.warning("Error processing log at index %d: %s", i, e)
 
+        await self.log_processor.async_apply_tag_scans(pending_scans)
+        if reboot is not None:
+            # A reboot may come with a firmware update, read the device information again
+            await self.device_info_cache.async_note_reboot(*reboot)
         return enriched, has_power_on
 
     async def _async_update_data(self) -> dict:
@@ -375,8 +518,8 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
                     await self.ble_device.connect()
                     now = datetime.now()
 
-                    # 1. Battery (Initial only)
-                    if "battery_level" not in data:
+                    # 1. Battery (Initial only, a restored snapshot value is read again once)
+                    if "battery_level" not in data or self._last_battery_update is None:
                         await self._fetch_initial_battery_data(data, now)
                     else:
                         _LOGGER.debug("Battery fetch skipped (handled by door events).")
@@ -435,25 +578,36 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.warning("Could not fetch code counts: %s", e)
 
     async def _fetch_device_info(self, data: dict, now: datetime):
-        """Fetch device information with throttling."""
-        should_fetch = True
-        if "device_info_service" in data:
-             last_fetch = data.get("last_device_info_fetch")
-             if last_fetch:
-                 last_fetch_dt = datetime.fromisoformat(last_fetch)
-                 interval = self.full_refresh_interval_hours * 2
-                 if (now - last_fetch_dt) < timedelta(hours=interval):
-                     should_fetch = False
-                     _LOGGER.debug("Skipping device info update (last update < %dh ago)", interval)
-
-        if not should_fetch:
-            return
+        """Fetch device information, reusing the persisted values while the firmware is unchanged."""
+        cache = self.device_info_cache
+        await cache.async_load()
+        cached = cache.get()
+        if cached:
+            data["device_info_service"] = cached
+            interval = timedelta(hours=self.full_refresh_interval_hours * 2)
+            if not cache.check_due(now, interval):
+                _LOGGER.debug("Skipping device info update (checked < %s ago)", interval)
+                return
+
+            # Cheap fingerprint: one characteristic instead of the whole service
+            try:
+                software_revision = await self.ble_device.get_software_revision()
+            except Exception as e:
+                _LOGGER.debug("Failed to read software revision: %s", e)
+                return
+            if not software_revision or software_revision == cache.fingerprint:
+                await cache.async_mark_checked(now)
+                return
+            _LOGGER.info("Software revision changed (%s -> %s), reading device information",
+                         cache.fingerprint, software_revision)
 
         _LOGGER.debug("Fetching device information...")
         try:
             device_info = await self.ble_device.get_device_information()
             data["device_info_service"] = device_info
             data["last_device_info_fetch"] = now.isoformat()
+            self._device_info = None
+            await cache.async_update(device_info, now)
             self._update_device_registry(device_info)
         except Exception as e:
             _LOGGER.warning("Failed to fetch device information: %s", e)
@@ -482,13 +636,14 @@ class BoksDataUpdateCoordinator(DataUpdateCoordinator):
         if logs_data:
             data.update(logs_data)
 
-    def register_opcode_callback(self, opcode: int, callback: Callable[[bytearray], None]) -> None:
-        """Register a callback for a specific opcode."""
-        self.ble_device.register_opcode_callback(opcode, callback)
-
-    def unregister_opcode_callback(self, opcode: int, callback: Callable[[bytearray], None]) -> None:
-        """Unregister a callback for a specific opcode."""
-        self.ble_device.unregister_opcode_callback(opcode, callback)
+    def subscribe_notifications(
+        self,
+        callback: Callable[[BoksRXPacket], None],
+        opcodes: Iterable[int] | None = None,
+        packet_type: type[BoksRXPacket] | tuple[type[BoksRXPacket], ...] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to decoded BLE notifications. Returns the unsubscribe function."""
+        return self.ble_device.subscribe_notifications(callback, opcodes, packet_type)
 
 
 
@@ -91,6 +91,12 @@ async def async_get_config_entry_diagnostics(
         "coordinator_data": coordinator.data,
         "ble_device_info": ble_info,
         "device_info_service": coordinator.data.get("device_info_service") if coordinator.data else None,
+        "ble_statistics": coordinator.ble_device.get_diagnostics(),
+        "log_processing": coordinator.log_processor.get_diagnostics(),
+        "event_journal": coordinator.journal.as_dict(),
+        "device_info_cache": coordinator.device_info_cache.as_dict(),
+        "snapshot": coordinator.snapshot.as_dict(),
+        "door_state": coordinator.door_state.as_dict(),
     }
 
     return async_redact_data(diagnostics_data, TO_REDACT)
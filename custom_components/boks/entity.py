@@ -1,6 +1,7 @@
 """Base entity for Boks."""
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -11,12 +12,21 @@ class BoksEntity(CoordinatorEntity):
     """Base class for Boks entities."""
 
     _attr_has_entity_name = True
+    # Coordinator data keys the state depends on, the entity is only written when
+    # one of them is pushed (None: on every push). Full refreshes wake every entity.
+    _coordinator_keys: frozenset[str] | None = None
 
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self._entry = entry
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, unless the pushed keys are not used."""
+        if self.coordinator.keys_changed(self._coordinator_keys):
+            super()._handle_coordinator_update()
+
     @property
     def device_info(self):
         """Return device info."""
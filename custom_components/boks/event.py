@@ -12,7 +12,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .ble.const import LOG_EVENT_TYPES
 from .const import DOMAIN, EVENT_LOG
-from .coordinator import BoksDataUpdateCoordinator
+from .coordinator import LOG_DATA_KEYS, BoksDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,7 +38,10 @@ class BoksLogEvent(CoordinatorEntity, EventEntity):
         super().__init__(coordinator)
         self._entry = entry
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_logs"
-        self._last_log_timestamp = None
+        # Logs already present (restored snapshot) were fired before the restart
+        self._last_log_timestamp = (
+            coordinator.data.get("last_log_fetch_ts") if coordinator.snapshot.restored_at is not None else None
+        )
 
     @property
     def suggested_object_id(self) -> str | None:
@@ -55,6 +58,8 @@ class BoksLogEvent(CoordinatorEntity, EventEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if not self.coordinator.keys_changed(LOG_DATA_KEYS):
+            return
         latest_logs = self.coordinator.data.get("latest_logs")
         last_fetch = self.coordinator.data.get("last_log_fetch_ts")
 
@@ -11,14 +11,15 @@ from homeassistant.const import CONF_ADDRESS
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from .ble import BoksBluetoothDevice
-from .ble.const import LOG_EVENT_TYPES, BoksHistoryEvent
 from .const import CONF_MASTER_CODE, DOMAIN, TIMEOUT_DOOR_CLOSE, TIMEOUT_DOOR_OPEN_MESSAGE
 from .coordinator import BoksDataUpdateCoordinator
 from .entity import BoksEntity
 from .errors.boks_command_error import BoksCommandError
 from .logic.anonymizer import BoksAnonymizer
+from .logic.door_state import DOOR_SOURCE_COMMAND
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +37,7 @@ class BoksLock(BoksEntity, LockEntity):
 
     _attr_translation_key = "door"
     _attr_supported_features = LockEntityFeature.OPEN
+    _coordinator_keys = frozenset({"door_open"})
 
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the lock."""
@@ -50,26 +52,23 @@ class BoksLock(BoksEntity, LockEntity):
         return "door"
 
     @property
-    def is_locked(self) -> bool:
-        """Return true if the lock is locked."""
+    def is_locked(self) -> bool | None:
+        """Return true if the lock is locked, None while the door state is unknown."""
         # Boks is a latch, it's technically always "locked" until opened.
         # If door is open, it's 'unlocked'.
-        # Determine door state based on the latest relevant log entry
-        latest_logs = self.coordinator.data.get("latest_logs", [])
-        if latest_logs:
-            # Find the most recent door state log entry
-            for log_entry in reversed(latest_logs):
-                event_type = log_entry.get("event_type")
-                if event_type in (
-                    LOG_EVENT_TYPES[BoksHistoryEvent.DOOR_OPENED],
-                    LOG_EVENT_TYPES[BoksHistoryEvent.KEY_OPENING],
-                ):
-                    return False  # Door is open/unlatched, so lock is unlocked
-                elif event_type == LOG_EVENT_TYPES[BoksHistoryEvent.DOOR_CLOSED]:
-                    return True   # Door is closed, so lock is locked
-
-        # Fallback to real-time status if no relevant logs found
-        return not self.coordinator.data.get("door_open", False)
+        is_open = self.coordinator.door_state.is_open
+        return None if is_open is None else not is_open
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the last door transition."""
+        door_state = self.coordinator.door_state
+        if door_state.changed_at is None:
+            return {}
+        return {
+            "changed_at": dt_util.utc_from_timestamp(door_state.changed_at).isoformat(),
+            "source": door_state.source,
+        }
 
     async def async_unlock(self, **kwargs: Any) -> None:
         """Unlock the device."""
@@ -173,8 +172,7 @@ class BoksLock(BoksEntity, LockEntity):
                     await ble_device.open_door(code)
 
                     # Update state immediately
-                    self.coordinator.data["door_open"] = True
-                    self.async_write_ha_state()
+                    self.coordinator.async_set_door_state(True, DOOR_SOURCE_COMMAND)
                     success = True
 
                 # 2. Wait for closure: Stay connected until door is closed
@@ -182,8 +180,15 @@ class BoksLock(BoksEntity, LockEntity):
                     _LOGGER.info("Door opened. Waiting for close event (max %ds)...", TIMEOUT_DOOR_CLOSE)
                     closed = await ble_device.wait_for_door_closed(timeout=TIMEOUT_DOOR_CLOSE)
 
-                    if not closed:
-                        _LOGGER.warning("Door did not close within %ds, sync will happen on disconnect", TIMEOUT_DOOR_CLOSE)
+                    door_state = self.coordinator.door_state
+                    if not closed and door_state.is_left_open(TIMEOUT_DOOR_CLOSE):
+                        _LOGGER.warning(
+                            "Door still open after %ds, sync will happen on disconnect",
+                            door_state.open_duration(),
+                        )
+                    elif not closed:
+                        # No close notification, but the tracker has not seen the door open for that long
+                        _LOGGER.debug("No close event within %ds, sync will happen on disconnect", TIMEOUT_DOOR_CLOSE)
                     else:
                         _LOGGER.debug("Door closed detected. Disconnecting to trigger auto-refresh.")
 
@@ -0,0 +1,77 @@
+"""Persisted snapshot of the coordinator data for fast startup."""
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from ..const import SNAPSHOT_MAX_LOGS, SNAPSHOT_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY_TEMPLATE = "boks_snapshot_{}"
+
+# Coordinator data worth restoring (the door state is not: it may have changed while HA was down)
+SNAPSHOT_KEYS = (
+    "battery_level",
+    "battery_stats",
+    "battery_temperature",
+    "master",
+    "single_use",
+    "device_info_service",
+    "last_device_info_fetch",
+    "latest_logs",
+    "last_log_fetch_ts",
+)
+
+
+class BoksDataSnapshot:
+    """
+    Keep the last known coordinator data across restarts.
+    Restored at setup so entities have a state at once while the first BLE
+    refresh runs in the background. Saves are debounced, the Store flushes a
+    pending save when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the snapshot."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_TEMPLATE.format(entry_id))
+        self._data: dict[str, Any] = {}
+        self.saved_at: float | None = None
+        self.restored_at: float | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the persisted coordinator data, if any."""
+        stored = await self._store.async_load()
+        if not stored or not stored.get("data"):
+            return None
+        self.restored_at = stored.get("saved_at")
+        return {key: value for key, value in stored["data"].items() if key in SNAPSHOT_KEYS}
+
+    @callback
+    def async_schedule_save(self, data: dict[str, Any]) -> None:
+        """Save the coordinator data after a short delay."""
+        self._data = data
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist (evaluated when the save runs)."""
+        data = {key: self._data[key] for key in SNAPSHOT_KEYS if self._data.get(key) is not None}
+        if logs := data.get("latest_logs"):
+            data["latest_logs"] = logs[-SNAPSHOT_MAX_LOGS:]
+        self.saved_at = time.time()
+        return {"saved_at": self.saved_at, "data": data}
+
+    async def async_remove(self) -> None:
+        """Delete the persisted snapshot."""
+        await self._store.async_remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return snapshot statistics (for diagnostics)."""
+        return {
+            "restored_from": self.restored_at,
+            "saved_at": self.saved_at,
+        }
@@ -0,0 +1,126 @@
+"""Persisted Device Information Service values of a Boks."""
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY_TEMPLATE = "boks_device_info_{}"
+
+# History events after which the device information must be read again
+REBOOT_EVENT_TYPES = frozenset({"power_on", "ble_reboot"})
+
+
+class BoksDeviceInfoCache:
+    """
+    Keep the Device Information Service values across restarts.
+    They only change with a firmware update, so they stay valid until the
+    software revision (the fingerprint, one characteristic read) differs or a
+    reboot newer than the last read shows up in the history.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the cache."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_TEMPLATE.format(entry_id))
+        self._loaded = False
+        self.info: dict[str, Any] | None = None
+        # Epoch seconds of the last full read and of the last fingerprint check
+        self.fetched: float | None = None
+        self.checked: float | None = None
+        self.stale_reason: str | None = None
+        self.hits = 0
+        self.fetches = 0
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Return the software revision the cached values were read with."""
+        return self.info.get("software_revision") if self.info else None
+
+    @property
+    def is_valid(self) -> bool:
+        """Return True when the cached values can be used without reading the device."""
+        return bool(self.info) and self.stale_reason is None
+
+    async def async_load(self) -> None:
+        """Load the persisted values (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if not data:
+            return
+        self.info = data.get("info") or None
+        self.fetched = data.get("fetched")
+        self.checked = data.get("checked")
+        self.stale_reason = data.get("stale_reason")
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {
+            "info": self.info,
+            "fetched": self.fetched,
+            "checked": self.checked,
+            "stale_reason": self.stale_reason,
+        }
+
+    def get(self) -> dict[str, Any] | None:
+        """Return the cached values if they are still valid."""
+        if not self.is_valid:
+            return None
+        self.hits += 1
+        return self.info
+
+    def check_due(self, now: datetime, interval: timedelta) -> bool:
+        """Return True when the fingerprint was not checked within the interval."""
+        last = self.checked or self.fetched
+        return last is None or now.timestamp() - last >= interval.total_seconds()
+
+    async def async_update(self, info: dict[str, Any], now: datetime) -> None:
+        """Store freshly read values."""
+        if not info:
+            return
+        self.info = dict(info)
+        self.fetched = self.checked = now.timestamp()
+        self.stale_reason = None
+        self.fetches += 1
+        await self._store.async_save(self._data_to_save())
+
+    async def async_mark_checked(self, now: datetime) -> None:
+        """Record that the fingerprint still matches."""
+        self.checked = now.timestamp()
+        await self._store.async_save(self._data_to_save())
+
+    async def async_invalidate(self, reason: str) -> None:
+        """Require a full read on the next connection."""
+        if self.stale_reason is not None or not self.info:
+            return
+        _LOGGER.debug("Device information cache invalidated: %s", reason)
+        self.stale_reason = reason
+        await self._store.async_save(self._data_to_save())
+
+    async def async_note_reboot(self, event_type: str, timestamp: float | None) -> None:
+        """Invalidate the cache if the device rebooted after the values were read."""
+        if self.fetched is not None and timestamp is not None and timestamp <= self.fetched:
+            return
+        await self.async_invalidate(event_type)
+
+    async def async_remove(self) -> None:
+        """Delete the persisted values."""
+        await self._store.async_remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics (for diagnostics)."""
+        return {
+            "valid": self.is_valid,
+            "fingerprint": self.fingerprint,
+            "fetched": self.fetched,
+            "checked": self.checked,
+            "stale_reason": self.stale_reason,
+            "hits": self.hits,
+            "fetches": self.fetches,
+        }
@@ -0,0 +1,81 @@
+"""Incremental door state of a Boks."""
+import time
+from typing import Any
+
+from ..ble.const import LOG_EVENT_TYPES, BoksHistoryEvent
+
+# Where the current door state comes from
+DOOR_SOURCE_NOTIFICATION = "notification"
+DOOR_SOURCE_HISTORY = "history"
+DOOR_SOURCE_STATUS = "status"
+DOOR_SOURCE_COMMAND = "command"
+
+# History event types and the door state they imply
+_DOOR_EVENT_TYPES = {
+    LOG_EVENT_TYPES[BoksHistoryEvent.DOOR_OPENED]: True,
+    LOG_EVENT_TYPES[BoksHistoryEvent.KEY_OPENING]: True,
+    LOG_EVENT_TYPES[BoksHistoryEvent.DOOR_CLOSED]: False,
+}
+
+
+class BoksDoorState:
+    """
+    Door state machine fed by every observation: live notifications, status
+    reads, open commands and history entries. Observations older than the
+    newest one already applied are ignored, so a history download replaying
+    older entries cannot override a live notification. Readers get the state,
+    the last transition time and its source without scanning the logs.
+    """
+
+    def __init__(self):
+        """Initialize the state (unknown until the first observation)."""
+        self.is_open: bool | None = None
+        # Epoch seconds of the last transition and of the newest observation
+        self.changed_at: float | None = None
+        self.observed_at: float | None = None
+        self.source: str | None = None
+        self.transitions = 0
+
+    def update(self, is_open: bool, source: str, timestamp: float | None = None) -> bool:
+        """Apply an observation. Returns True if the door state changed."""
+        if timestamp is None:
+            timestamp = time.time()
+        if self.observed_at is not None and timestamp < self.observed_at:
+            return False
+        self.observed_at = timestamp
+        if is_open == self.is_open:
+            return False
+        self.is_open = is_open
+        self.changed_at = timestamp
+        self.source = source
+        self.transitions += 1
+        return True
+
+    def apply_logs(self, logs: list[dict]) -> bool:
+        """Apply the door events of new history entries. Returns True if the door state changed."""
+        changed = False
+        for log in logs:
+            is_open = _DOOR_EVENT_TYPES.get(log.get("event_type"))
+            if is_open is not None:
+                changed |= self.update(is_open, DOOR_SOURCE_HISTORY, log.get("timestamp"))
+        return changed
+
+    def open_duration(self, now: float | None = None) -> float | None:
+        """Return for how long (seconds) the door has been open, None if it is not open."""
+        if not self.is_open or self.changed_at is None:
+            return None
+        return max(0.0, (now if now is not None else time.time()) - self.changed_at)
+
+    def is_left_open(self, threshold: float, now: float | None = None) -> bool:
+        """Return True if the door has been open for at least threshold seconds."""
+        duration = self.open_duration(now)
+        return duration is not None and duration >= threshold
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the door state (for diagnostics)."""
+        return {
+            "is_open": self.is_open,
+            "changed_at": self.changed_at,
+            "source": self.source,
+            "transitions": self.transitions,
+        }
@@ -0,0 +1,274 @@
+"""Append-only on-disk journal of Boks history entries."""
+import asyncio
+import json
+import logging
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from ..packets.base import OPCODE_TABLE
+from .tag_resolver import normalize_tag_uid
+
+_LOGGER = logging.getLogger(__name__)
+
+JOURNAL_FILE_TEMPLATE = "boks_journal_{}.bin"
+JOURNAL_MAGIC = b"BOKSJRN1"
+# timestamp (uint32), opcode (uint8), extra_data JSON length (uint16)
+_RECORD_HEADER = struct.Struct("<IBH")
+# Presentation-only fields, rebuilt by enrichment, not worth storing
+_UNSTORED_EXTRA_KEYS = frozenset({"tag_name", "tag_type_description", "reason_text"})
+
+
+def _build_event_type_opcodes() -> dict[str, tuple[int, ...]]:
+    """Map each history event type to its opcodes."""
+    mapping: dict[str, tuple[int, ...]] = {}
+    for info in OPCODE_TABLE:
+        if info.is_history and info.event_type:
+            mapping[info.event_type] = (*mapping.get(info.event_type, ()), info.opcode)
+    return mapping
+
+
+_EVENT_TYPE_OPCODES = _build_event_type_opcodes()
+
+
+class BoksEventJournal:
+    """
+    Persist every decoded history entry of a config entry in an append-only file.
+    Records are a fixed header (timestamp, opcode, extra length) followed by the
+    compact JSON of extra_data. Only the columns needed to filter and aggregate
+    (offset, timestamp, opcode) and the code / tag UID indexes are kept in memory,
+    matching records are read back from disk on demand.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the journal."""
+        self.hass = hass
+        self.path = hass.config.path(STORAGE_DIR, JOURNAL_FILE_TEMPLATE.format(entry_id))
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._size = 0
+        self._offsets = array("Q")
+        self._timestamps = array("I")
+        self._opcodes = array("B")
+        self._by_opcode: dict[int, array] = {}
+        self._by_code: dict[str, array] = {}
+        self._by_tag: dict[str, array] = {}
+        # Records usually arrive in chronological order, allowing bisect on time
+        self._time_sorted = True
+
+    @property
+    def records(self) -> int:
+        """Return the number of journaled entries."""
+        return len(self._offsets)
+
+    @staticmethod
+    def _encode(entry: dict) -> tuple[bytes, int, int, dict] | None:
+        """Encode an enriched log entry, None if it is not a history entry."""
+        opcode = entry.get("opcode")
+        if not isinstance(opcode, int):
+            return None
+        opcode &= 0xFF
+        extra = {k: v for k, v in (entry.get("extra_data") or {}).items() if k not in _UNSTORED_EXTRA_KEYS}
+        blob = json.dumps(extra, separators=(",", ":"), default=str).encode() if extra else b""
+        timestamp = min(max(int(entry.get("timestamp") or 0), 0), 0xFFFFFFFF)
+        return _RECORD_HEADER.pack(timestamp, opcode, len(blob)) + blob, timestamp, opcode, extra
+
+    def _index(self, offset: int, timestamp: int, opcode: int, extra: dict) -> None:
+        """Add a record to the in-memory columns and indexes."""
+        record = len(self._offsets)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._time_sorted = False
+        self._offsets.append(offset)
+        self._timestamps.append(timestamp)
+        self._opcodes.append(opcode)
+        self._by_opcode.setdefault(opcode, array("I")).append(record)
+        if code := extra.get("code"):
+            self._by_code.setdefault(str(code).upper(), array("I")).append(record)
+        if tag_uid := extra.get("tag_uid"):
+            self._by_tag.setdefault(normalize_tag_uid(str(tag_uid)), array("I")).append(record)
+
+    def _load(self) -> None:
+        """Scan the file and rebuild the indexes (executor)."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb+") as file:
+            if file.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+                _LOGGER.warning("Ignoring unknown event journal format: %s", self.path)
+                self._size = -1
+                return
+
+            offset = len(JOURNAL_MAGIC)
+            while header := file.read(_RECORD_HEADER.size):
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                timestamp, opcode, length = _RECORD_HEADER.unpack(header)
+                blob = file.read(length)
+                if len(blob) < length:
+                    break
+                try:
+                    extra = json.loads(blob) if blob else {}
+                except ValueError:
+                    extra = {}
+                self._index(offset, timestamp, opcode, extra)
+                offset += _RECORD_HEADER.size + length
+
+            # Drop a record cut by a crash during the last append
+            if file.seek(0, os.SEEK_END) != offset:
+                _LOGGER.warning("Truncating incomplete event journal record at offset %d", offset)
+                file.truncate(offset)
+            self._size = offset
+
+    async def _async_ensure_loaded(self) -> None:
+        """Load the journal on first use."""
+        if not self._loaded:
+            await self.hass.async_add_executor_job(self._load)
+            self._loaded = True
+
+    def _write(self, blob: bytes) -> int:
+        """Append encoded records, returning the offset of the first one (executor)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as file:
+            if file.tell() == 0:
+                file.write(JOURNAL_MAGIC)
+            offset = file.tell()
+            file.write(blob)
+        return offset
+
+    async def async_append(self, entries: list[dict]) -> int:
+        """Append enriched log entries. Returns the number of journaled entries."""
+        async with self._lock:
+            await self._async_ensure_loaded()
+            if self._size < 0:
+                return 0
+
+            encoded = [record for record in map(self._encode, entries) if record is not None]
+            if not encoded:
+                return 0
+
+            offset = await self.hass.async_add_executor_job(
+                self._write, b"".join(record for record, *_ in encoded)
+            )
+            for record, timestamp, opcode, extra in encoded:
+                self._index(offset, timestamp, opcode, extra)
+                offset += len(record)
+            self._size = offset
+            return len(encoded)
+
+    def _select(
+        self,
+        event_types: list[str] | None,
+        code: str | None,
+        tag_uid: str | None,
+        start: int | None,
+        end: int | None,
+    ) -> list[int]:
+        """Return the matching record numbers in journal order."""
+        candidates: list[array | range] = []
+        if event_types is not None:
+            records = sorted(
+                record
+                for event_type in event_types
+                for opcode in _EVENT_TYPE_OPCODES.get(event_type, ())
+                for record in self._by_opcode.get(opcode, ())
+            )
+            candidates.append(records)
+        if code is not None:
+            candidates.append(self._by_code.get(code.upper(), ()))
+        if tag_uid is not None:
+            candidates.append(self._by_tag.get(normalize_tag_uid(tag_uid), ()))
+
+        if self._time_sorted and (start is not None or end is not None):
+            low = bisect_left(self._timestamps, start) if start is not None else 0
+            high = bisect_right(self._timestamps, end) if end is not None else len(self._timestamps)
+            candidates.append(range(low, high))
+            start = end = None
+
+        if not candidates:
+            selected = range(len(self._offsets))
+        else:
+            candidates.sort(key=len)
+            others = [set(other) for other in candidates[1:]]
+            selected = [record for record in candidates[0] if all(record in other for other in others)]
+
+        timestamps = self._timestamps
+        return [
+            record for record in selected
+            if (start is None or timestamps[record] >= start) and (end is None or timestamps[record] <= end)
+        ]
+
+    def _read(self, records: list[int]) -> list[dict]:
+        """Read records back from disk (executor)."""
+        events = []
+        with open(self.path, "rb") as file:
+            for record in records:
+                file.seek(self._offsets[record])
+                timestamp, opcode, length = _RECORD_HEADER.unpack(file.read(_RECORD_HEADER.size))
+                blob = file.read(length)
+                events.append({
+                    "timestamp": timestamp,
+                    "opcode": opcode,
+                    "event_type": OPCODE_TABLE[opcode].event_type or "unknown",
+                    "extra_data": json.loads(blob) if blob else {},
+                })
+        return events
+
+    async def async_query(
+        self,
+        event_types: list[str] | None = None,
+        code: str | None = None,
+        tag_uid: str | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """
+        Return aggregates of the matching entries and the newest `limit` of them.
+        Filters and aggregates use the in-memory indexes, only returned entries are read.
+        """
+        async with self._lock:
+            await self._async_ensure_loaded()
+            selected = self._select(event_types, code, tag_uid, start, end)
+            newest = sorted(selected, key=self._timestamps.__getitem__, reverse=True)[:limit] if limit else []
+            events = await self.hass.async_add_executor_job(self._read, newest) if newest else []
+
+        by_event_type: dict[str, int] = {}
+        for record in selected:
+            event_type = OPCODE_TABLE[self._opcodes[record]].event_type or "unknown"
+            by_event_type[event_type] = by_event_type.get(event_type, 0) + 1
+        timestamps = [self._timestamps[record] for record in selected]
+
+        return {
+            "total": len(selected),
+            "first": min(timestamps) if timestamps else None,
+            "last": max(timestamps) if timestamps else None,
+            "by_event_type": by_event_type,
+            "events": events,
+        }
+
+    def _remove(self) -> None:
+        """Delete the journal file (executor)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def async_remove(self) -> None:
+        """Delete the journal file."""
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._remove)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return journal statistics (for diagnostics)."""
+        return {
+            "loaded": self._loaded,
+            "records": self.records,
+            "size": max(self._size, 0),
+            "codes": len(self._by_code),
+            "tags": len(self._by_tag),
+        }
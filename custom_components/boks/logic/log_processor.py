@@ -1,29 +1,56 @@
 """Log processing and enrichment for Boks."""
 import logging
-import re
+import time
 from datetime import datetime
 from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
-from ..const import DOMAIN
 from ..packets.base import BoksRXPacket
-
-NON_HEX_PATTERN = re.compile(r"[^0-9A-F]")
+from .pin_index import BoksPinIndex
+from .tag_resolver import BoksTagResolver, get_tags_collection
+from .translation_cache import BoksLogTranslations
 
 _LOGGER = logging.getLogger(__name__)
 
 class BoksLogProcessor:
     """Class to handle log enrichment, translation and HA registry updates."""
 
-    def __init__(self, hass: HomeAssistant, address: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        pin_index: BoksPinIndex | None = None,
+        tag_resolver: BoksTagResolver | None = None,
+    ):
         """Initialize the processor."""
         self.hass = hass
         self.address = address
+        self.pin_index = pin_index
+        self.tag_resolver = tag_resolver if tag_resolver is not None else BoksTagResolver.async_get(hass)
+        self._tag_scan_stats = {
+            "batches": 0,
+            "scans": 0,
+            "updates": 0,
+            "last_duration_ms": 0.0,
+            "total_duration_ms": 0.0,
+        }
+
+    async def async_enrich_log_entry(
+        self,
+        log: BoksRXPacket | dict,
+        translations: BoksLogTranslations | dict[str, str],
+        pending_scans: dict[str, int] | None = None,
+    ) -> dict:
+        """
+        Enrich a log entry with translations, tag names and formatting.
+        With pending_scans, tag last_scanned updates are collected there (newest
+        timestamp per tag) for async_apply_tag_scans instead of written right away.
+        """
+        if not isinstance(translations, BoksLogTranslations):
+            translations = BoksLogTranslations.from_translations(translations)
 
-    async def async_enrich_log_entry(self, log: BoksRXPacket | dict, translations: dict[str, str]) -> dict:
-        """Enrich a log entry with translations, tag names and formatting."""
         # Extract basic info
         event_type = getattr(log, "event_type", "unknown") if not isinstance(log, dict) else log.get("event_type", "unknown")
         opcode = getattr(log, "opcode", "unknown") if not isinstance(log, dict) else log.get("opcode", "unknown")
@@ -43,17 +70,23 @@ class BoksLogProcessor:
         # 4. Enrich with Tag Type Description
         self._enrich_tag_type(extra_data, translations)
 
+        # 4b. Attribute the code to its generated slot
+        self._enrich_code_slot(extra_data)
+
         # 5. Enrich with NFC Tag Name from HA Registry
         tag_name = await self._resolve_tag_name(extra_data)
         if tag_name:
             extra_data["tag_name"] = tag_name
 
         # 6. Update last_scanned if needed
-        await self._update_tag_last_scanned(event_type, timestamp, extra_data)
+        if pending_scans is None:
+            await self._update_tag_last_scanned(event_type, timestamp, extra_data)
+        else:
+            self._collect_tag_scan(pending_scans, event_type, timestamp, extra_data)
 
         return {
             "opcode": opcode,
-            "payload": payload.hex() if isinstance(payload, (bytes, bytearray)) else payload,
+            "payload": payload.hex() if isinstance(payload, (bytes, bytearray, memoryview)) else payload,
             "timestamp": timestamp,
             "event_type": event_type,
             "description": translated_description,
@@ -61,62 +94,58 @@ class BoksLogProcessor:
         }
 
     @staticmethod
-    def _translate_base_description(event_type: str, translations: dict[str, str]) -> str:
+    def _translate_base_description(event_type: str, translations: BoksLogTranslations) -> str:
         """Get the base translated description for an event type."""
-        key = f"component.{DOMAIN}.entity.sensor.last_event.state.{event_type}"
-        return translations.get(key, event_type)
+        return translations.describe(event_type)
 
     @staticmethod
-    def _enrich_diagnostic_error(event_type: str, extra_data: dict, translations: dict[str, str], current_desc: str) -> str:
+    def _enrich_diagnostic_error(
+        event_type: str, extra_data: dict, translations: BoksLogTranslations, current_desc: str
+    ) -> str:
         """Enrich description with diagnostic error details."""
         if event_type == "error" and "error_description" in extra_data:
             diag_key = extra_data["error_description"]
-            diag_full_key = f"component.{DOMAIN}.entity.sensor.last_event.state.{diag_key}"
-            translated_diag = translations.get(diag_full_key, diag_key)
-            if translated_diag != diag_key:
+            translated_diag = translations.states.get(diag_key)
+            if translated_diag is not None and translated_diag != diag_key:
                 extra_data["error_description"] = translated_diag
                 return f"{current_desc}: {translated_diag}"
         return current_desc
 
     @staticmethod
-    def _enrich_power_off_reason(event_type: str, extra_data: dict, translations: dict[str, str], current_desc: str) -> str:
+    def _enrich_power_off_reason(
+        event_type: str, extra_data: dict, translations: BoksLogTranslations, current_desc: str
+    ) -> str:
         """Enrich description with power off reason."""
         if event_type == "power_off" and "reason_code" in extra_data:
-            reason_code = extra_data["reason_code"]
-            reason_key = f"component.{DOMAIN}.entity.sensor.last_event.state.power_off_reason_{reason_code}"
-            translated_reason = translations.get(reason_key)
+            translated_reason = translations.power_off_reason(extra_data["reason_code"])
             if translated_reason:
                 extra_data["reason_text"] = translated_reason
                 return f"{current_desc}: {translated_reason}"
         return current_desc
 
     @staticmethod
-    def _enrich_tag_type(extra_data: dict, translations: dict[str, str]) -> None:
+    def _enrich_tag_type(extra_data: dict, translations: BoksLogTranslations) -> None:
         """Add human-readable tag type description."""
         tag_type = extra_data.get("tag_type")
         if tag_type:
-            type_key = f"component.{DOMAIN}.entity.sensor.last_event.state.nfc_tag_type_{tag_type}"
-            extra_data["tag_type_description"] = translations.get(type_key, f"Type {tag_type}")
+            description = translations.tag_type(tag_type)
+            extra_data["tag_type_description"] = description if description is not None else f"Type {tag_type}"
+
+    def _enrich_code_slot(self, extra_data: dict) -> None:
+        """Add the generator type and index of the code used, when it is a derived code."""
+        code = extra_data.get("code")
+        if not code or self.pin_index is None:
+            return
+        slot = self.pin_index.lookup(code)
+        if slot:
+            extra_data["code_type"], extra_data["code_index"] = slot
 
     def _get_tags_collection(self):
         """Retrieve the tags collection helper robustly."""
-        if "tag" not in self.hass.data:
-            return None
-
-        tag_manager = self.hass.data["tag"]
-
-        # Case 1: Standard structure hass.data['tag']['tags']
-        if isinstance(tag_manager, dict) and "tags" in tag_manager:
-            return tag_manager["tags"]
-
-        # Case 2: Direct collection object (observed in some environments)
-        if hasattr(tag_manager, "data"):
-             return tag_manager
-
-        return None
+        return get_tags_collection(self.hass)
 
     async def _resolve_tag_name(self, extra_data: dict) -> str | None:
-        """Look up tag name in HA Registry (Tags and Entity Registry)."""
+        """Look up tag name in the shared tag index (Tag collection and Entity Registry)."""
         tag_uid = extra_data.get("tag_uid")
         tag_name = extra_data.get("tag_name")
 
@@ -124,63 +153,82 @@ class BoksLogProcessor:
             return tag_name
 
         try:
-            # Normalize ID: uppercase and remove any non-hex chars
-            tag_id_lookup = NON_HEX_PATTERN.sub('', tag_uid.upper())
-
-            _LOGGER.debug("Resolving tag name for UID: %s (Normalized: %s)", tag_uid, tag_id_lookup)
-
-            # 1. Try Tag Registry (Standard)
-            tags_helper = self._get_tags_collection()
-            if tags_helper and hasattr(tags_helper, "data") and tag_id_lookup in tags_helper.data:
-                resolved_tag_info = tags_helper.data[tag_id_lookup]
-                name = resolved_tag_info.get("name")
-                if name:
-                    _LOGGER.debug("Resolved tag name from Tag Registry: %s", name)
-                    return name
-
-            # 2. Try Entity Registry (Fallback for tags managed as entities)
-            try:
-                from homeassistant.helpers import entity_registry as er
-                ent_reg = er.async_get(self.hass)
-                # Find entities belonging to 'tag' platform with matching unique_id
-                for entry in ent_reg.entities.values():
-                    if entry.platform == "tag" and entry.unique_id == tag_id_lookup:
-                        # Only return 'name' (user set). Ignore 'original_name' (usually "Tag <ID>")
-                        if entry.name:
-                            _LOGGER.debug("Resolved tag name from Entity Registry: %s", entry.name)
-                            return entry.name
-            except Exception as e:
-                _LOGGER.debug("Failed to lookup in entity registry: %s", e)
-
-            # 3. Last Resort Fallback: UID
-            _LOGGER.debug("No custom tag name found for %s. Using UID.", tag_id_lookup)
-            return tag_uid
-
+            name = self.tag_resolver.lookup(tag_uid)
+            if name:
+                return name
+            # Last Resort Fallback: UID
+            _LOGGER.debug("No custom tag name found for %s. Using UID.", tag_uid)
         except Exception as e:
             _LOGGER.debug("Failed to lookup tag name for %s: %s", tag_uid, e)
 
         return tag_uid
 
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Return log processing statistics."""
+        return {
+            "tag_resolver": self.tag_resolver.as_dict(),
+            "tag_last_scanned": {
+                **self._tag_scan_stats,
+                "last_duration_ms": round(self._tag_scan_stats["last_duration_ms"], 3),
+                "total_duration_ms": round(self._tag_scan_stats["total_duration_ms"], 3),
+            },
+        }
+
+    @staticmethod
+    def _collect_tag_scan(pending_scans: dict[str, int], event_type: str, timestamp: int, extra_data: dict) -> None:
+        """Keep the newest scan timestamp of an NFC opening per tag."""
+        tag_uid = extra_data.get("tag_uid")
+        if event_type != "nfc_opening" or not tag_uid:
+            return
+        tag_id_lookup = tag_uid.replace(":", "").upper()
+        if timestamp > pending_scans.get(tag_id_lookup, -1):
+            pending_scans[tag_id_lookup] = timestamp
+
+    async def async_apply_tag_scans(self, pending_scans: dict[str, int]) -> None:
+        """Write the collected last_scanned dates, one update per tag."""
+        if not pending_scans or "tag" not in self.hass.data:
+            return
+
+        start = time.monotonic()
+        updates = 0
+        for tag_id_lookup, timestamp in pending_scans.items():
+            if await self._async_write_last_scanned(tag_id_lookup, timestamp):
+                updates += 1
+
+        duration_ms = (time.monotonic() - start) * 1000
+        stats = self._tag_scan_stats
+        stats["batches"] += 1
+        stats["scans"] += len(pending_scans)
+        stats["updates"] += updates
+        stats["last_duration_ms"] = duration_ms
+        stats["total_duration_ms"] += duration_ms
+        _LOGGER.debug("Applied %d/%d tag last_scanned updates in %.1fms", updates, len(pending_scans), duration_ms)
+
     async def _update_tag_last_scanned(self, event_type: str, timestamp: int, extra_data: dict) -> None:
         """Update last_scanned attribute in HA tag registry."""
         tag_uid = extra_data.get("tag_uid")
         if event_type != "nfc_opening" or not tag_uid or "tag" not in self.hass.data:
             return
 
+        await self._async_write_last_scanned(tag_uid.replace(":", "").upper(), timestamp)
+
+    async def _async_write_last_scanned(self, tag_id_lookup: str, timestamp: int) -> bool:
+        """Write last_scanned of a tag if newer than the stored one. Returns True if written."""
         try:
-            tag_id_lookup = tag_uid.replace(":", "").upper()
             tags_helper = self._get_tags_collection()
 
             if not (tags_helper and tag_id_lookup in tags_helper.data):
-                return
+                return False
 
             last_scanned_dt = dt_util.utc_from_timestamp(timestamp)
             current_info = tags_helper.data[tag_id_lookup]
 
             if self._should_update_last_scanned(current_info.get("last_scanned"), last_scanned_dt):
                 await tags_helper.async_update_item(tag_id_lookup, {"last_scanned": last_scanned_dt})
+                return True
         except Exception as e:
-            _LOGGER.debug("Failed to update scan date for %s: %s", tag_uid, e)
+            _LOGGER.debug("Failed to update scan date for %s: %s", tag_id_lookup, e)
+        return False
 
     @staticmethod
     def _should_update_last_scanned(current_last_scanned: Any, new_last_scanned: datetime) -> bool:
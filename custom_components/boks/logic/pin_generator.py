@@ -1,11 +1,29 @@
 """Boks PIN Generator Algorithm."""
 import logging
 import struct
+from collections.abc import Iterable
+from typing import Any
 
 from ..errors import BoksError
 
+# NumPy is imported by the first batch generation (executor), not with the integration
+_NOT_LOADED = object()
+np: Any = _NOT_LOADED
+
 _LOGGER = logging.getLogger(__name__)
 
+
+def _get_numpy() -> Any:
+    """Return the numpy module (None if unavailable), importing it on first use."""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - numpy ships with Home Assistant, keep a scalar fallback anyway
+            numpy = None
+        np = numpy
+    return np
+
 # Constants from @retro/firmware/boks_pin_algorithm.md
 # IV SHA-256 used instead of standard BLAKE2s IV
 IV = [
@@ -28,12 +46,26 @@ SIGMA = [
 ]
 
 
+PIN_CHARSET = "0123456789AB"
+
+PIN_TYPE_PREFIXES = {
+    "master": "master",
+    "single": "single-use",
+    "multi": "multi-use"
+}
+
+# Below this many indices the NumPy setup costs more than it saves
+_MIN_VECTORIZED_BATCH = 16
+
+
 class BoksPinGenerator:
     """Class to generate Boks PIN codes."""
 
     def __init__(self, master_key: str | None):
         """Initialize the generator with a master key."""
         self.master_key = master_key
+        # State after the key block, cached per master key
+        self._key_state: tuple[str, tuple[int, ...]] | None = None
 
     def _g(self, v, a, b, c, d, x, y):
         """Mixing function G."""
@@ -72,14 +104,8 @@ class BoksPinGenerator:
 
         return h
 
-    def generate_pin(self, pin_type: str, index: int) -> str:
-        """Generate a PIN code.
-
-        :param pin_type: 'master', 'single', or 'multi'
-        :param index: The index to generate
-        :return: 6-character PIN string
-        :raises BoksError: If master key is missing or invalid
-        """
+    def _parse_master_key(self) -> bytes:
+        """Return the 32-byte master key or raise BoksError."""
         if not self.master_key:
             raise BoksError("master_key_required")
 
@@ -93,18 +119,14 @@ class BoksPinGenerator:
                     raise ValueError("Invalid key length")
         except ValueError as err:
             raise BoksError("master_key_invalid") from err
+        return key_bytes
 
-        type_map = {
-            "master": "master",
-            "single": "single-use",
-            "multi": "multi-use"
-        }
-
-        prefix = type_map.get(pin_type, pin_type)
-
-        # Valid prefixes check? The algorithm supports whatever string is passed.
-        # But for safety we might want to restrict it. The map handles the common cases.
+    def _get_key_state(self) -> tuple[int, ...]:
+        """Return the chaining state after the key block (computed once per master key)."""
+        if self._key_state is not None and self._key_state[0] == self.master_key:
+            return self._key_state[1]
 
+        key_bytes = self._parse_master_key()
         h = list(IV)
 
         # Initial XOR with metadata
@@ -112,7 +134,20 @@ class BoksPinGenerator:
 
         # Block 1: The Key
         block1 = key_bytes + b'\x00' * 32
-        h = self._compress(h, block1, 64, 0)
+        state = tuple(self._compress(h, block1, 64, 0))
+        self._key_state = (self.master_key, state)
+        return state
+
+    def generate_pin(self, pin_type: str, index: int) -> str:
+        """Generate a PIN code.
+
+        :param pin_type: 'master', 'single', or 'multi'
+        :param index: The index to generate
+        :return: 6-character PIN string
+        :raises BoksError: If master key is missing or invalid
+        """
+        h = list(self._get_key_state())
+        prefix = PIN_TYPE_PREFIXES.get(pin_type, pin_type)
 
         # Block 2: The Message
         msg = f"{prefix} {index}".encode()
@@ -126,7 +161,76 @@ class BoksPinGenerator:
         res = b"".join(struct.pack('<I', x) for x in h)[:6]
 
         # Convert to Boks charset
-        charset = "0123456789AB"
-        pin = "".join(charset[b % 12] for b in res)
+        return "".join(PIN_CHARSET[b % 12] for b in res)
 
-        return pin
+    def generate_pins(self, pin_type: str, indices: Iterable[int]) -> list[str]:
+        """Generate the PIN codes of many indices in one pass (same order as indices).
+
+        The key block is compressed once, the message blocks are compressed
+        vectorized with NumPy when available.
+        :raises BoksError: If master key is missing or invalid
+        """
+        indices = list(indices)
+        key_state = self._get_key_state()
+        if len(indices) < _MIN_VECTORIZED_BATCH or _get_numpy() is None:
+            return [self.generate_pin(pin_type, index) for index in indices]
+
+        prefix = PIN_TYPE_PREFIXES.get(pin_type, pin_type)
+        messages = [f"{prefix} {index}".encode() for index in indices]
+        pins: list[str] = [""] * len(indices)
+
+        # The byte counter depends on the message length, compress each length group together
+        groups: dict[int, list[int]] = {}
+        for position, msg in enumerate(messages):
+            groups.setdefault(len(msg), []).append(position)
+
+        charset = np.array(list(PIN_CHARSET))
+        for msg_len, positions in groups.items():
+            blocks = b"".join(messages[pos].ljust(64, b"\x00") for pos in positions)
+            words = np.frombuffer(blocks, dtype="<u4").reshape(len(positions), 16).T.astype(np.uint32)
+            h = _compress_vectorized(key_state, words, 64 + msg_len, 0xFFFFFFFF)
+
+            # First 6 bytes of the little-endian digest
+            digest = np.stack([
+                h[0] & 0xFF, (h[0] >> 8) & 0xFF, (h[0] >> 16) & 0xFF, h[0] >> 24,
+                h[1] & 0xFF, (h[1] >> 8) & 0xFF,
+            ], axis=1) % 12
+            for pos, chars in zip(positions, charset[digest], strict=True):
+                pins[pos] = "".join(chars)
+
+        return pins
+
+
+def _compress_vectorized(h: tuple[int, ...], m, t0: int, f0: int):
+    """Compression function over N message blocks at once (m: 16 x N uint32 words)."""
+    count = m.shape[1]
+    v = [np.full(count, word, dtype=np.uint32) for word in (*h, *IV)]
+    v[12] ^= np.uint32(t0 & 0xFFFFFFFF)
+    v[14] ^= np.uint32(f0 & 0xFFFFFFFF)
+
+    def g(a, b, c, d, x, y):
+        # uint32 arithmetic wraps around, no masking needed
+        v[a] = v[a] + v[b] + x
+        t = v[d] ^ v[a]
+        v[d] = (t >> 16) | (t << 16)
+        v[c] = v[c] + v[d]
+        t = v[b] ^ v[c]
+        v[b] = (t >> 12) | (t << 20)
+        v[a] = v[a] + v[b] + y
+        t = v[d] ^ v[a]
+        v[d] = (t >> 8) | (t << 24)
+        v[c] = v[c] + v[d]
+        t = v[b] ^ v[c]
+        v[b] = (t >> 7) | (t << 25)
+
+    for s in SIGMA:
+        g(0, 4, 8, 12, m[s[0]], m[s[1]])
+        g(1, 5, 9, 13, m[s[2]], m[s[3]])
+        g(2, 6, 10, 14, m[s[4]], m[s[5]])
+        g(3, 7, 11, 15, m[s[6]], m[s[7]])
+        g(0, 5, 10, 15, m[s[8]], m[s[9]])
+        g(1, 6, 11, 12, m[s[10]], m[s[11]])
+        g(2, 7, 8, 13, m[s[12]], m[s[13]])
+        g(3, 4, 9, 14, m[s[14]], m[s[15]])
+
+    return [np.uint32(h[i]) ^ v[i] ^ v[i + 8] for i in range(8)]
@@ -0,0 +1,120 @@
+"""Persisted reverse index from generated PIN codes to their (type, index) slot."""
+import hashlib
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from ..const import PIN_INDEX_CHUNK_SIZE, PIN_INDEX_SAVE_DELAY
+from ..errors import BoksError
+from .pin_generator import BoksPinGenerator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY_TEMPLATE = "boks_pin_index_{}"
+
+# Lookup priority when two slots generate the same PIN
+PIN_INDEX_TYPES = ("master", "single", "multi")
+
+
+class BoksPinIndex:
+    """
+    Map generated PIN codes back to ("master"|"single"|"multi", index).
+    The index is keyed by a fingerprint of the master key, built in chunks in the
+    background and saved after each chunk, so a restart resumes where it stopped.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, pin_generator: BoksPinGenerator, index_range: int):
+        """Initialize the index."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_TEMPLATE.format(entry_id))
+        self._pin_generator = pin_generator
+        self._index_range = index_range
+        self._fingerprint: str | None = None
+        self._pins: dict[str, tuple[str, int]] = {}
+        self._next: dict[str, int] = dict.fromkeys(PIN_INDEX_TYPES, 0)
+
+    @property
+    def is_complete(self) -> bool:
+        """Return True when every type is indexed up to the configured range."""
+        return all(self._next[pin_type] >= self._index_range for pin_type in PIN_INDEX_TYPES)
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed PIN codes."""
+        return len(self._pins)
+
+    def lookup(self, pin: str) -> tuple[str, int] | None:
+        """Return the (type, index) slot that generates this PIN, if indexed."""
+        return self._pins.get(pin.upper()) if pin else None
+
+    def _compute_fingerprint(self) -> str | None:
+        """Return a non-reversible fingerprint of the current master key."""
+        master_key = self._pin_generator.master_key
+        if not master_key:
+            return None
+        return hashlib.sha256(master_key.strip().lower().encode()).hexdigest()[:16]
+
+    async def async_load(self) -> None:
+        """Load the persisted index, dropping it if it belongs to another master key."""
+        self._fingerprint = self._compute_fingerprint()
+        data = await self._store.async_load()
+        if not data or data.get("fingerprint") != self._fingerprint:
+            if data:
+                _LOGGER.debug("Master key changed, discarding persisted PIN index")
+            self._pins = {}
+            self._next = dict.fromkeys(PIN_INDEX_TYPES, 0)
+            return
+
+        self._pins = {pin: (slot[0], slot[1]) for pin, slot in data.get("pins", {}).items()}
+        self._next = {pin_type: data.get("next", {}).get(pin_type, 0) for pin_type in PIN_INDEX_TYPES}
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {
+            "fingerprint": self._fingerprint,
+            "next": self._next,
+            "pins": {pin: [slot[0], slot[1]] for pin, slot in self._pins.items()},
+        }
+
+    async def async_build(self) -> None:
+        """Index the missing slots chunk by chunk (meant to run as a background task)."""
+        await self.async_load()
+        if self._fingerprint is None or self.is_complete:
+            return
+
+        _LOGGER.debug("Building PIN index up to %d per type (%d already indexed)", self._index_range, self.size)
+        while not self.is_complete:
+            for pin_type in PIN_INDEX_TYPES:
+                start = self._next[pin_type]
+                if start >= self._index_range:
+                    continue
+                indices = range(start, min(start + PIN_INDEX_CHUNK_SIZE, self._index_range))
+                try:
+                    pins = await self.hass.async_add_executor_job(
+                        self._pin_generator.generate_pins, pin_type, indices
+                    )
+                except BoksError as e:
+                    _LOGGER.warning("Cannot build PIN index: %s", e)
+                    return
+
+                self._add(pin_type, indices, pins)
+                self._next[pin_type] = indices.stop
+            if not self.is_complete:
+                self._store.async_delay_save(self._data_to_save, PIN_INDEX_SAVE_DELAY)
+
+        await self._store.async_save(self._data_to_save())
+        _LOGGER.debug("PIN index complete: %d codes", self.size)
+
+    async def async_remove(self) -> None:
+        """Delete the persisted index (it holds valid PIN codes in plaintext)."""
+        await self._store.async_remove()
+
+    def _add(self, pin_type: str, indices: range, pins: list[str]) -> None:
+        """Add generated PINs, keeping the higher priority slot on collisions."""
+        priority = PIN_INDEX_TYPES.index(pin_type)
+        for index, pin in zip(indices, pins, strict=True):
+            existing = self._pins.get(pin)
+            if existing is None or (PIN_INDEX_TYPES.index(existing[0]), existing[1]) > (priority, index):
+                self._pins[pin] = (pin_type, index)
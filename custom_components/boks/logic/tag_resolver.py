@@ -0,0 +1,193 @@
+"""Shared NFC tag UID to name index."""
+import logging
+import re
+from functools import lru_cache
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from ..const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TAG_RESOLVER = f"{DOMAIN}_tag_resolver"
+NON_HEX_PATTERN = re.compile(r"[^0-9A-F]")
+
+
+@lru_cache(maxsize=256)
+def normalize_tag_uid(tag_uid: str) -> str:
+    """Normalize a tag UID: uppercase and remove any non-hex chars."""
+    return NON_HEX_PATTERN.sub("", tag_uid.upper())
+
+
+def get_tags_collection(hass: HomeAssistant):
+    """Retrieve the tags collection helper robustly."""
+    if "tag" not in hass.data:
+        return None
+
+    tag_manager = hass.data["tag"]
+
+    # Case 1: Standard structure hass.data['tag']['tags']
+    if isinstance(tag_manager, dict) and "tags" in tag_manager:
+        return tag_manager["tags"]
+
+    # Case 2: Direct collection object (observed in some environments)
+    if hasattr(tag_manager, "data"):
+        return tag_manager
+
+    return None
+
+
+class BoksTagResolver:
+    """
+    Resolve NFC tag UIDs to user names through a normalized index.
+    Built from the tag collection (preferred) and the "tag" entities of the entity
+    registry, then kept up to date from their change events. One instance is
+    shared by every config entry.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the resolver."""
+        self.hass = hass
+        self._tag_names: dict[str, str] = {}
+        self._entity_names: dict[str, str] = {}
+        # entity_id -> normalized UID, to follow renames and removals
+        self._entity_uids: dict[str, str] = {}
+        self._tags_helper: Any = None
+        self._entities_dirty = True
+        self._users = 0
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self.rebuilds = 0
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant) -> "BoksTagResolver":
+        """Return the resolver shared by all entries, creating it on first use."""
+        resolver = hass.data.get(DATA_TAG_RESOLVER)
+        if resolver is None:
+            resolver = hass.data[DATA_TAG_RESOLVER] = cls(hass)
+            resolver._async_start()
+        return resolver
+
+    @classmethod
+    @callback
+    def async_acquire(cls, hass: HomeAssistant) -> "BoksTagResolver":
+        """Return the shared resolver and register a user (release it on unload)."""
+        resolver = cls.async_get(hass)
+        resolver._users += 1
+        return resolver
+
+    @callback
+    def async_release(self) -> None:
+        """Unregister a user, the last one stops the resolver."""
+        self._users -= 1
+        if self._users > 0:
+            return
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self.hass.data.get(DATA_TAG_RESOLVER) is self:
+            del self.hass.data[DATA_TAG_RESOLVER]
+
+    @callback
+    def _async_start(self) -> None:
+        """Follow entity registry changes."""
+        self._unsubs.append(
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry_updated)
+        )
+
+    def lookup(self, tag_uid: str) -> str | None:
+        """Return the user name of a tag, or None if it has none."""
+        if not tag_uid:
+            return None
+        uid = normalize_tag_uid(tag_uid)
+        self._ensure_tags_index()
+        name = self._tag_names.get(uid)
+        if name:
+            return name
+        if self._entities_dirty:
+            self._rebuild_entities_index()
+        return self._entity_names.get(uid)
+
+    def _ensure_tags_index(self) -> None:
+        """(Re)build the tag collection index when the collection appears or is replaced."""
+        tags_helper = get_tags_collection(self.hass)
+        if tags_helper is self._tags_helper:
+            return
+
+        self._tags_helper = tags_helper
+        self._tag_names = {}
+        if tags_helper is None or not hasattr(tags_helper, "data"):
+            return
+
+        self.rebuilds += 1
+        for tag_id, info in tags_helper.data.items():
+            self._set_tag(tag_id, info)
+
+        if hasattr(tags_helper, "async_add_listener"):
+            try:
+                self._unsubs.append(tags_helper.async_add_listener(self._handle_tag_change))
+            except Exception as e:
+                _LOGGER.debug("Cannot follow tag collection changes: %s", e)
+
+    def _set_tag(self, tag_id: str, info: dict | None) -> None:
+        """Index (or drop) one tag of the collection."""
+        uid = normalize_tag_uid(tag_id)
+        name = info.get("name") if info else None
+        if name:
+            self._tag_names[uid] = name
+        else:
+            self._tag_names.pop(uid, None)
+
+    async def _handle_tag_change(self, change_type: str, item_id: str, config: dict) -> None:
+        """Apply a tag collection change."""
+        self._set_tag(item_id, None if change_type == "removed" else config)
+
+    def _rebuild_entities_index(self) -> None:
+        """Index the user names of the "tag" entities."""
+        self.rebuilds += 1
+        self._entity_names = {}
+        self._entity_uids = {}
+        ent_reg = er.async_get(self.hass)
+        for entry in ent_reg.entities.values():
+            self._set_entity(entry)
+        self._entities_dirty = False
+
+    def _set_entity(self, entry: er.RegistryEntry) -> None:
+        """Index one entity registry entry if it is a tag."""
+        if entry.platform != "tag":
+            return
+        uid = normalize_tag_uid(entry.unique_id)
+        self._entity_uids[entry.entity_id] = uid
+        # Only 'name' (user set). Ignore 'original_name' (usually "Tag <ID>")
+        if entry.name:
+            self._entity_names[uid] = entry.name
+        else:
+            self._entity_names.pop(uid, None)
+
+    @callback
+    def _handle_entity_registry_updated(self, event: Event) -> None:
+        """Apply an entity registry change."""
+        if self._entities_dirty:
+            return
+
+        entity_id = event.data.get("entity_id")
+        old_uid = self._entity_uids.pop(event.data.get("old_entity_id") or entity_id, None)
+        if old_uid is not None:
+            self._entity_names.pop(old_uid, None)
+        if event.data.get("action") == "remove":
+            return
+
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is not None:
+            self._set_entity(entry)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the index sizes (for diagnostics)."""
+        return {
+            "tags": len(self._tag_names),
+            "entities": len(self._entity_names),
+            "rebuilds": self.rebuilds,
+            "users": self._users,
+        }
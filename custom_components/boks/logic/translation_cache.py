@@ -0,0 +1,126 @@
+"""Per-language translation snapshots for log enrichment."""
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import translation
+
+from ..const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+LAST_EVENT_STATE_PREFIX = f"component.{DOMAIN}.entity.sensor.last_event.state."
+_POWER_OFF_REASON_PREFIX = "power_off_reason_"
+_TAG_TYPE_PREFIX = "nfc_tag_type_"
+
+
+def _parse_code(value: Any) -> int | str:
+    """Return numeric codes as int (packets expose codes as int, restored entries may hold strings)."""
+    value = str(value)
+    return int(value) if value.isdigit() else value
+
+
+class BoksLogTranslations:
+    """
+    Immutable lookup tables built once from the flat translation dict.
+    Keys are the raw values found in log entries (event type, diagnostic key,
+    reason code, tag type), so rendering is a dict hit.
+    """
+
+    __slots__ = ("states", "power_off_reasons", "tag_types")
+
+    def __init__(self, states: dict[str, str]):
+        """Build the tables from the last_event state translations."""
+        self.states = states
+        self.power_off_reasons: dict[int | str, str] = {}
+        self.tag_types: dict[int | str, str] = {}
+        for key, text in states.items():
+            if key.startswith(_POWER_OFF_REASON_PREFIX):
+                self.power_off_reasons[_parse_code(key[len(_POWER_OFF_REASON_PREFIX):])] = text
+            elif key.startswith(_TAG_TYPE_PREFIX):
+                self.tag_types[_parse_code(key[len(_TAG_TYPE_PREFIX):])] = text
+
+    @classmethod
+    def from_translations(cls, translations: dict[str, str]) -> "BoksLogTranslations":
+        """Build a snapshot from a flat Home Assistant translation dict."""
+        prefix_len = len(LAST_EVENT_STATE_PREFIX)
+        return cls({
+            key[prefix_len:]: text
+            for key, text in translations.items()
+            if key.startswith(LAST_EVENT_STATE_PREFIX)
+        })
+
+    def describe(self, key: str) -> str:
+        """Return the translated state for an event type or diagnostic key, or the key itself."""
+        return self.states.get(key, key)
+
+    def power_off_reason(self, reason_code: Any) -> str | None:
+        """Return the translated power off reason (int or numeric string code)."""
+        return self.power_off_reasons.get(_parse_code(reason_code))
+
+    def tag_type(self, tag_type: Any) -> str | None:
+        """Return the translated NFC tag type (int or numeric string type)."""
+        return self.tag_types.get(_parse_code(tag_type))
+
+
+class BoksTranslationCache:
+    """
+    Cache one BoksLogTranslations snapshot per language.
+    Snapshots are dropped when the core configuration (language) changes; a
+    reload of the integration creates a new cache.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self._snapshots: dict[str, BoksLogTranslations] = {}
+        self._unsub_config: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Listen for language changes."""
+        if self._unsub_config is None:
+            self._unsub_config = self.hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._handle_config_update)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and drop the snapshots."""
+        if self._unsub_config is not None:
+            self._unsub_config()
+            self._unsub_config = None
+        self.invalidate()
+
+    @callback
+    def _handle_config_update(self, event: Event) -> None:
+        """Drop the snapshots when the language may have changed."""
+        if "language" in event.data or not event.data:
+            self.invalidate()
+
+    @callback
+    def invalidate(self) -> None:
+        """Drop every snapshot."""
+        if self._snapshots:
+            _LOGGER.debug("Dropping translation snapshots for %s", list(self._snapshots))
+        self._snapshots.clear()
+
+    @callback
+    def prime(self, language: str, translations: dict[str, str]) -> BoksLogTranslations:
+        """Build the snapshot of a language from translations already loaded."""
+        snapshot = self._snapshots[language] = BoksLogTranslations.from_translations(translations)
+        return snapshot
+
+    async def async_get(self, language: str | None = None) -> BoksLogTranslations:
+        """Return the snapshot of a language (default: the configured one), loading it once."""
+        language = language or self.hass.config.language
+        snapshot = self._snapshots.get(language)
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            translations = await translation.async_get_translations(self.hass, language, "entity", {DOMAIN})
+        except Exception as e:
+            _LOGGER.warning("Failed to load translations: %s", e)
+            # Not cached, the next sync retries
+            return BoksLogTranslations({})
+        return self.prime(language, translations)
@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant
 from ..ble.const import BoksNotificationOpcode
 from ..const import TIMEOUT_NFC_WAIT_RESULT
 from ..errors import BoksError
+from ..packets.rx.nfc_scan_result import NfcScanResultPacket
 
 if TYPE_CHECKING:
     from ..coordinator import BoksDataUpdateCoordinator
@@ -64,15 +65,20 @@ class BoksNfcController:
         """Background task waiting for the NFC tag notification."""
         scan_done = asyncio.Event()
 
-        def scan_callback(data):
+        def scan_callback(packet: NfcScanResultPacket):
             # 0xC5 (Found), 0xC6 (Already exists), 0xC7 (Timeout)
-            if data[0] in (0xC5, 0xC6, 0xC7):
-                _LOGGER.debug("NFC Scan result received: 0x%02X", data[0])
-                scan_done.set()
-
-        self.coordinator.ble_device.register_opcode_callback(BoksNotificationOpcode.NOTIFY_NFC_TAG_FOUND, scan_callback)
-        self.coordinator.ble_device.register_opcode_callback(BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_SCAN, scan_callback)
-        self.coordinator.ble_device.register_opcode_callback(BoksNotificationOpcode.ERROR_NFC_TIMEOUT, scan_callback)
+            _LOGGER.debug("NFC Scan result received: 0x%02X", packet.opcode)
+            scan_done.set()
+
+        unsubscribe = self.coordinator.ble_device.subscribe_notifications(
+            scan_callback,
+            opcodes=(
+                BoksNotificationOpcode.NOTIFY_NFC_TAG_FOUND,
+                BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_SCAN,
+                BoksNotificationOpcode.ERROR_NFC_SCAN_TIMEOUT,
+            ),
+            packet_type=NfcScanResultPacket,
+        )
 
         try:
             await asyncio.wait_for(scan_done.wait(), timeout=TIMEOUT_NFC_WAIT_RESULT)
@@ -81,9 +87,7 @@ class BoksNfcController:
         except Exception as e:
             _LOGGER.error("Error in NFC background listener: %s", e)
         finally:
-            self.coordinator.ble_device.unregister_opcode_callback(BoksNotificationOpcode.NOTIFY_NFC_TAG_FOUND, scan_callback)
-            self.coordinator.ble_device.unregister_opcode_callback(BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_SCAN, scan_callback)
-            self.coordinator.ble_device.unregister_opcode_callback(BoksNotificationOpcode.ERROR_NFC_TIMEOUT, scan_callback)
+            unsubscribe()
 
             # Always disconnect at the end of the session
             await self.coordinator.ble_device.disconnect()
@@ -2,24 +2,62 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
-from ..ble.const import BoksCommandOpcode, BoksHistoryEvent, BoksNotificationOpcode
+from ..ble.const import LOG_EVENT_TYPES, BoksCommandOpcode, BoksHistoryEvent, BoksNotificationOpcode
+
+DIRECTION_TX = "tx"
+DIRECTION_RX = "rx"
+
+
+class BoksOpcodeInfo:
+    """Static metadata of one opcode, looked up by index in OPCODE_TABLE."""
+
+    __slots__ = ("opcode", "name", "direction", "event_type", "is_history", "packet_class", "takes_opcode")
+
+    def __init__(self, opcode: int, name: str = "UNKNOWN", direction: str | None = None,
+                 event_type: str = "unknown", is_history: bool = False):
+        self.opcode = opcode
+        self.name = name
+        self.direction = direction
+        self.event_type = event_type
+        self.is_history = is_history
+        # Filled by PacketFactory when the RX classes are registered
+        self.packet_class: type[BoksRXPacket] | None = None
+        self.takes_opcode = True
+
+
+def _build_opcode_table() -> tuple[BoksOpcodeInfo, ...]:
+    """Build the 256-entry opcode metadata table."""
+    table = [BoksOpcodeInfo(opcode) for opcode in range(256)]
+    # Filled in reverse priority: command names win over notifications, then history events
+    for event in BoksHistoryEvent:
+        table[event] = BoksOpcodeInfo(event, event.name, DIRECTION_RX, LOG_EVENT_TYPES.get(event, "unknown"), True)
+    for notification in BoksNotificationOpcode:
+        table[notification] = BoksOpcodeInfo(notification, notification.name, DIRECTION_RX)
+    for command in BoksCommandOpcode:
+        table[command] = BoksOpcodeInfo(command, command.name, DIRECTION_TX)
+    return tuple(table)
+
+
+OPCODE_TABLE = _build_opcode_table()
+
+
+def get_opcode_info(opcode: int) -> BoksOpcodeInfo:
+    """Return the metadata of an opcode (single index, no enum lookups)."""
+    return OPCODE_TABLE[opcode & 0xFF]
 
 
 class BoksPacket(ABC):
     """Base class for all Boks packets."""
 
+    __slots__ = ("opcode",)
+
     def __init__(self, opcode: int):
         """Initialize the packet."""
         self.opcode = opcode
 
     def get_opcode_name(self) -> str:
         """Return a readable name for the opcode."""
-        for enum_class in [BoksCommandOpcode, BoksNotificationOpcode, BoksHistoryEvent]:
-            try:
-                return enum_class(self.opcode).name
-            except ValueError:
-                continue
-        return "UNKNOWN"
+        return OPCODE_TABLE[self.opcode & 0xFF].name
 
     @staticmethod
     def calculate_checksum(data: bytearray) -> int:
@@ -44,6 +82,8 @@ class BoksPacket(ABC):
 class BoksTXPacket(BoksPacket):
     """Base class for outgoing command packets."""
 
+    __slots__ = ()
+
     def _build_framed_packet(self, payload: bytes) -> bytearray:
         """Framework for building TX packets [Opcode][Len][Payload][CRC]."""
         packet = bytearray()
@@ -67,7 +107,13 @@ class BoksTXPacket(BoksPacket):
         }
 
 class BoksRXPacket(BoksPacket):
-    """Base class for incoming notification/log packets."""
+    """
+    Base class for incoming notification/log packets.
+    Decoded once per notification and shared with every consumer: payload fields are
+    memoryview slices of raw_data, so no byte is copied while parsing.
+    """
+
+    __slots__ = ("raw_data", "payload")
 
     # Can be a single int or a list of opcodes
     OPCODES: int | list[int] | None = None
@@ -77,7 +123,7 @@ class BoksRXPacket(BoksPacket):
         super().__init__(opcode)
         self.raw_data = raw_data
         # Extract payload: [Opcode][Len][Payload...][CRC]
-        self.payload = raw_data[2:-1] if len(raw_data) > 3 else bytearray()
+        self.payload = memoryview(raw_data)[2:-1] if len(raw_data) > 3 else memoryview(b"")
 
     def to_bytes(self) -> bytearray:
         """Return raw bytes."""
@@ -94,8 +140,7 @@ class BoksRXPacket(BoksPacket):
     @property
     def event_type(self) -> str:
         """Return the event type string for this packet."""
-        from ..ble.const import LOG_EVENT_TYPES
-        return LOG_EVENT_TYPES.get(self.opcode, "unknown")
+        return OPCODE_TABLE[self.opcode & 0xFF].event_type
 
     @property
     def extra_data(self) -> dict[str, Any]:
@@ -105,12 +150,14 @@ class BoksRXPacket(BoksPacket):
 class BoksHistoryLogPacket(BoksRXPacket):
     """Base class for history log entries (usually starts with 3 bytes Age)."""
 
+    __slots__ = ("age", "log_payload")
+
     def __init__(self, opcode: int, raw_data: bytearray):
         """Initialize and parse common Age field."""
         super().__init__(opcode, raw_data)
         self.age = int.from_bytes(self.payload[0:3], 'big') if len(self.payload) >= 3 else 0
-        # Specific logs will parse the rest of the payload starting at index 3
-        self.log_payload = self.payload[3:] if len(self.payload) > 3 else bytearray()
+        # Specific logs will parse the rest of the payload starting at index 3 (view, no copy)
+        self.log_payload = self.payload[3:]
 
     def _get_base_log_payload(self) -> str:
         """Helper to get common log payload string."""
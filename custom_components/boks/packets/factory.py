@@ -1,61 +1,76 @@
 """Factory to create packet objects from raw data."""
 
-from .base import BoksRXPacket
-from .rx.ble_reboot import BleRebootPacket
-from .rx.block_reset import BlockResetPacket
-from .rx.code_ble_invalid import CodeBleInvalidPacket
-from .rx.code_ble_valid import CodeBleValidPacket
-from .rx.code_counts import CodeCountsPacket
-from .rx.code_key_invalid import CodeKeyInvalidPacket
-from .rx.code_key_valid import CodeKeyValidPacket
-from .rx.door_closed import DoorClosedPacket
-from .rx.door_opened import DoorOpenedPacket
-from .rx.door_status import DoorStatusPacket
-from .rx.end_history import EndHistoryPacket
-from .rx.error_log import ErrorLogPacket
-from .rx.error_response import ErrorResponsePacket
-from .rx.history_erase import HistoryErasePacket
-from .rx.key_opening import KeyOpeningPacket
-from .rx.log_count import LogCountPacket
-from .rx.nfc_error import NfcErrorPacket
-from .rx.nfc_opening import NfcOpeningPacket
-from .rx.nfc_scan_result import NfcScanResultPacket
-from .rx.nfc_tag_registered import NfcTagRegisteredPacket
-from .rx.nfc_tag_registering_scan import NfcTagRegisteringScanPacket
-from .rx.open_code_result import OpenCodeResultPacket
-from .rx.operation_result import OperationResultPacket
-from .rx.power_off import PowerOffPacket
-from .rx.power_on import PowerOnPacket
+import importlib
+import inspect
+
+from ..ble.const import BoksHistoryEvent, BoksNotificationOpcode
+from .base import OPCODE_TABLE, BoksRXPacket
+
+# Module (in packets.rx) and class of each RX opcode, imported the first time the opcode is seen
+RX_PACKET_REGISTRY: dict[int, tuple[str, str]] = {
+    BoksNotificationOpcode.CODE_OPERATION_SUCCESS: ("operation_result", "OperationResultPacket"),
+    BoksNotificationOpcode.CODE_OPERATION_ERROR: ("operation_result", "OperationResultPacket"),
+    BoksNotificationOpcode.NOTIFY_LOGS_COUNT: ("log_count", "LogCountPacket"),
+    BoksNotificationOpcode.VALID_OPEN_CODE: ("open_code_result", "OpenCodeResultPacket"),
+    BoksNotificationOpcode.INVALID_OPEN_CODE: ("open_code_result", "OpenCodeResultPacket"),
+    BoksNotificationOpcode.NOTIFY_DOOR_STATUS: ("door_status", "DoorStatusPacket"),
+    BoksNotificationOpcode.ANSWER_DOOR_STATUS: ("door_status", "DoorStatusPacket"),
+    BoksHistoryEvent.CODE_BLE_VALID: ("code_ble_valid", "CodeBleValidPacket"),
+    BoksHistoryEvent.CODE_KEY_VALID: ("code_key_valid", "CodeKeyValidPacket"),
+    BoksHistoryEvent.CODE_BLE_INVALID: ("code_ble_invalid", "CodeBleInvalidPacket"),
+    BoksHistoryEvent.CODE_KEY_INVALID: ("code_key_invalid", "CodeKeyInvalidPacket"),
+    BoksHistoryEvent.DOOR_CLOSED: ("door_closed", "DoorClosedPacket"),
+    BoksHistoryEvent.DOOR_OPENED: ("door_opened", "DoorOpenedPacket"),
+    BoksHistoryEvent.LOG_END_HISTORY: ("end_history", "EndHistoryPacket"),
+    BoksHistoryEvent.HISTORY_ERASE: ("history_erase", "HistoryErasePacket"),
+    BoksHistoryEvent.POWER_OFF: ("power_off", "PowerOffPacket"),
+    BoksHistoryEvent.BLOCK_RESET: ("block_reset", "BlockResetPacket"),
+    BoksHistoryEvent.POWER_ON: ("power_on", "PowerOnPacket"),
+    BoksHistoryEvent.BLE_REBOOT: ("ble_reboot", "BleRebootPacket"),
+    BoksHistoryEvent.KEY_OPENING: ("key_opening", "KeyOpeningPacket"),
+    BoksHistoryEvent.ERROR: ("error_log", "ErrorLogPacket"),
+    BoksHistoryEvent.NFC_OPENING: ("nfc_opening", "NfcOpeningPacket"),
+    BoksHistoryEvent.NFC_TAG_REGISTERING_SCAN: ("nfc_tag_registering_scan", "NfcTagRegisteringScanPacket"),
+    BoksNotificationOpcode.NOTIFY_CODES_COUNT: ("code_counts", "CodeCountsPacket"),
+    BoksNotificationOpcode.NOTIFY_NFC_TAG_FOUND: ("nfc_scan_result", "NfcScanResultPacket"),
+    BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_SCAN: ("nfc_scan_result", "NfcScanResultPacket"),
+    BoksNotificationOpcode.ERROR_NFC_SCAN_TIMEOUT: ("nfc_scan_result", "NfcScanResultPacket"),
+    BoksNotificationOpcode.NOTIFY_NFC_TAG_REGISTERED: ("nfc_tag_registered", "NfcTagRegisteredPacket"),
+    BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_REGISTER: ("nfc_error", "NfcErrorPacket"),
+    BoksNotificationOpcode.ERROR_CRC: ("error_response", "ErrorResponsePacket"),
+    BoksNotificationOpcode.ERROR_UNAUTHORIZED: ("error_response", "ErrorResponsePacket"),
+    BoksNotificationOpcode.ERROR_BAD_REQUEST: ("error_response", "ErrorResponsePacket"),
+}
 
 
 class PacketFactory:
     """Factory for creating Boks packet objects."""
 
-    _RX_MAP: dict[int, type[BoksRXPacket]] = {}
+    # Opcodes whose class is not imported yet
+    _pending: set[int] = set(RX_PACKET_REGISTRY)
 
     @classmethod
-    def _build_map(cls):
-        """Build the opcode to class mapping once."""
-        if cls._RX_MAP:
-            return
+    def _resolve(cls, opcode: int) -> None:
+        """Import the class of an opcode and resolve its constructor signature once."""
+        module_name, class_name = RX_PACKET_REGISTRY[opcode]
+        module = importlib.import_module(f".rx.{module_name}", __package__)
+        packet_class = getattr(module, class_name)
+        info = OPCODE_TABLE[opcode]
+        info.takes_opcode = len(inspect.signature(packet_class.__init__).parameters) > 2
+        info.packet_class = packet_class
+        # Only now, a concurrent preload must not report the class loaded while it is imported
+        cls._pending.discard(opcode)
 
-        classes = [
-            CodeBleValidPacket, CodeKeyValidPacket, CodeBleInvalidPacket, CodeKeyInvalidPacket,
-            DoorOpenedPacket, DoorClosedPacket, HistoryErasePacket, BlockResetPacket,
-            PowerOnPacket, BleRebootPacket, KeyOpeningPacket, PowerOffPacket,
-            NfcOpeningPacket, NfcTagRegisteringScanPacket, EndHistoryPacket, CodeCountsPacket,
-            DoorStatusPacket, LogCountPacket, NfcTagRegisteredPacket,
-            OperationResultPacket, ErrorResponsePacket, ErrorLogPacket,
-            NfcScanResultPacket, NfcErrorPacket, OpenCodeResultPacket
-        ]
+    @classmethod
+    def is_loaded(cls) -> bool:
+        """Return True when every RX packet class is imported."""
+        return not cls._pending
 
-        for cls_item in classes:
-            opcodes = cls_item.OPCODES
-            if isinstance(opcodes, list):
-                for op in opcodes:
-                    cls._RX_MAP[op] = cls_item
-            elif opcodes is not None:
-                cls._RX_MAP[opcodes] = cls_item
+    @classmethod
+    def preload(cls) -> None:
+        """Import every RX packet class (e.g. from an executor before the first BLE session)."""
+        for opcode in list(cls._pending):
+            cls._resolve(opcode)
 
     @classmethod
     def from_rx_data(cls, data: bytearray) -> BoksRXPacket:
@@ -63,17 +78,17 @@ class PacketFactory:
         if not data or len(data) < 1:
             return BoksRXPacket(0, data)
 
-        cls._build_map()
         opcode = data[0]
+        if opcode in cls._pending:
+            cls._resolve(opcode)
 
-        packet_class = cls._RX_MAP.get(opcode)
+        info = OPCODE_TABLE[opcode]
+        packet_class = info.packet_class
         if packet_class:
-            try:
-                # Try passing opcode if required by signature (based on BoksRXPacket signature)
+            if info.takes_opcode:
                 return packet_class(opcode, data)
-            except TypeError:
-                # Fallback for classes that only take data (constant opcode ones)
-                return packet_class(data)
+            # Classes with a constant opcode only take data
+            return packet_class(data)
 
         # Fallback to generic RX packet
         return BoksRXPacket(opcode, data)
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class BleRebootPacket(BoksHistoryLogPacket):
     """Log entry for BLE reboot event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.BLE_REBOOT
 
     def __init__(self, raw_data: bytearray):
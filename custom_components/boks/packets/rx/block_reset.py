@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class BlockResetPacket(BoksHistoryLogPacket):
     """Log entry for block reset event."""
 
+    __slots__ = ("reset_info",)
+
     OPCODES = BoksHistoryEvent.BLOCK_RESET
 
     def __init__(self, raw_data: bytearray):
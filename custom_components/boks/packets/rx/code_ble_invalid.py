@@ -7,11 +7,13 @@ from ..base import BoksHistoryLogPacket
 class CodeBleInvalidPacket(BoksHistoryLogPacket):
     """Log entry for an invalid BLE code attempt."""
 
+    __slots__ = ("pin",)
+
     OPCODES = BoksHistoryEvent.CODE_BLE_INVALID
 
     def __init__(self, raw_data: bytearray):
         super().__init__(BoksHistoryEvent.CODE_BLE_INVALID, raw_data)
-        self.pin = self.log_payload[0:6].decode('ascii', errors='ignore') if len(self.log_payload) >= 6 else ""
+        self.pin = bytes(self.log_payload[0:6]).decode('ascii', errors='ignore') if len(self.log_payload) >= 6 else ""
 
     @property
     def extra_data(self) -> dict:
@@ -7,11 +7,13 @@ from ..base import BoksHistoryLogPacket
 class CodeBleValidPacket(BoksHistoryLogPacket):
     """Log entry for a valid BLE code opening."""
 
+    __slots__ = ("pin",)
+
     OPCODES = BoksHistoryEvent.CODE_BLE_VALID
 
     def __init__(self, raw_data: bytearray):
         super().__init__(BoksHistoryEvent.CODE_BLE_VALID, raw_data)
-        self.pin = self.log_payload[0:6].decode('ascii', errors='ignore') if len(self.log_payload) >= 6 else ""
+        self.pin = bytes(self.log_payload[0:6]).decode('ascii', errors='ignore') if len(self.log_payload) >= 6 else ""
 
     @property
     def extra_data(self) -> dict:
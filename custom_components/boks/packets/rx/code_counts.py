@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class CodeCountsPacket(BoksRXPacket):
     """Notification containing current code counts."""
 
+    __slots__ = ("master_count", "single_use_count")
+
     OPCODES = BoksNotificationOpcode.NOTIFY_CODES_COUNT
 
     def __init__(self, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class DoorClosedPacket(BoksHistoryLogPacket):
     """Log entry for door closed event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.DOOR_CLOSED
 
     def __init__(self, raw_data: bytearray):
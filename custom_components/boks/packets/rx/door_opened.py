@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class DoorOpenedPacket(BoksHistoryLogPacket):
     """Log entry for door opened event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.DOOR_OPENED
 
     def __init__(self, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class DoorStatusPacket(BoksRXPacket):
     """Notification for current door status (Open/Closed)."""
 
+    __slots__ = ("is_open",)
+
     OPCODES = [BoksNotificationOpcode.NOTIFY_DOOR_STATUS, BoksNotificationOpcode.ANSWER_DOOR_STATUS]
 
     def __init__(self, opcode: int, raw_data: bytearray):
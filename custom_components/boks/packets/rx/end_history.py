@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class EndHistoryPacket(BoksHistoryLogPacket):
     """Log entry for end of history event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.LOG_END_HISTORY
 
     def __init__(self, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class ErrorLogPacket(BoksHistoryLogPacket):
     """Log entry for a technical/diagnostic error."""
 
+    __slots__ = ("error_code",)
+
     OPCODES = BoksHistoryEvent.ERROR
 
     def __init__(self, raw_data: bytearray):
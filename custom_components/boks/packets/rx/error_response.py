@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class ErrorResponsePacket(BoksRXPacket):
     """Generic representation of an error notification (CRC, Auth, etc.)."""
 
+    __slots__ = ()
+
     OPCODES = [
         BoksNotificationOpcode.ERROR_CRC,
         BoksNotificationOpcode.ERROR_UNAUTHORIZED,
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class HistoryErasePacket(BoksHistoryLogPacket):
     """Log entry for history erase event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.HISTORY_ERASE
 
     def __init__(self, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class KeyOpeningPacket(BoksHistoryLogPacket):
     """Log entry for key opening event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.KEY_OPENING
 
     def __init__(self, raw_data: bytearray):
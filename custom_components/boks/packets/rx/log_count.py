@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class LogCountPacket(BoksRXPacket):
     """Notification containing the number of available logs."""
 
+    __slots__ = ("count",)
+
     OPCODES = BoksNotificationOpcode.NOTIFY_LOGS_COUNT
 
     def __init__(self, raw_data: bytearray):
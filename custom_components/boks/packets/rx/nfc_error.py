@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class NfcErrorPacket(BoksRXPacket):
     """Notification for NFC specific errors during registration."""
 
+    __slots__ = ()
+
     OPCODES = [
         BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_REGISTER
     ]
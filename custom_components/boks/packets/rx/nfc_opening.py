@@ -7,6 +7,8 @@ from ..base import BoksHistoryLogPacket
 class NfcOpeningPacket(BoksHistoryLogPacket):
     """Notification for an NFC opening."""
 
+    __slots__ = ("tag_type", "uid_len", "uid")
+
     OPCODES = BoksHistoryEvent.NFC_OPENING
 
     def __init__(self, raw_data: bytearray):
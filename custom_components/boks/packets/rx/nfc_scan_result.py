@@ -8,6 +8,8 @@ from ..base import BoksRXPacket
 class NfcScanResultPacket(BoksRXPacket):
     """Real-time notification when a tag is found or an error occurs during scan."""
 
+    __slots__ = ("uid",)
+
     OPCODES = [
         BoksNotificationOpcode.NOTIFY_NFC_TAG_FOUND,
         BoksNotificationOpcode.ERROR_NFC_TAG_ALREADY_EXISTS_SCAN,
@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class NfcTagRegisteredPacket(BoksRXPacket):
     """Notification confirming an NFC tag registration."""
 
+    __slots__ = ()
+
     OPCODES = BoksNotificationOpcode.NOTIFY_NFC_TAG_REGISTERED
 
     def __init__(self, raw_data: bytearray):
@@ -7,6 +7,8 @@ from ..base import BoksHistoryLogPacket
 class NfcTagRegisteringScanPacket(BoksHistoryLogPacket):
     """Log entry for an NFC tag registration scan."""
 
+    __slots__ = ("tag_type", "uid_len", "uid")
+
     OPCODES = BoksHistoryEvent.NFC_TAG_REGISTERING_SCAN
 
     def __init__(self, raw_data: bytearray):
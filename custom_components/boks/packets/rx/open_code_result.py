@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class OpenCodeResultPacket(BoksRXPacket):
     """Notification confirming if an opening code was valid or not."""
 
+    __slots__ = ("valid",)
+
     OPCODES = [BoksNotificationOpcode.VALID_OPEN_CODE, BoksNotificationOpcode.INVALID_OPEN_CODE]
 
     def __init__(self, opcode: int, raw_data: bytearray):
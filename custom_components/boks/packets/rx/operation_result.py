@@ -6,6 +6,8 @@ from ..base import BoksRXPacket
 class OperationResultPacket(BoksRXPacket):
     """Notification for the success or failure of an operation."""
 
+    __slots__ = ("success",)
+
     OPCODES = [BoksNotificationOpcode.CODE_OPERATION_SUCCESS, BoksNotificationOpcode.CODE_OPERATION_ERROR]
 
     def __init__(self, opcode: int, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class PowerOffPacket(BoksHistoryLogPacket):
     """Notification for a device power off/reset."""
 
+    __slots__ = ("reason_code",)
+
     OPCODES = BoksHistoryEvent.POWER_OFF
 
     def __init__(self, raw_data: bytearray):
@@ -6,6 +6,8 @@ from ..base import BoksHistoryLogPacket
 class PowerOnPacket(BoksHistoryLogPacket):
     """Log entry for power on event."""
 
+    __slots__ = ()
+
     OPCODES = BoksHistoryEvent.POWER_ON
 
     def __init__(self, raw_data: bytearray):
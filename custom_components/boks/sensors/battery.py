@@ -17,6 +17,7 @@ class BoksBatterySensor(BoksEntity, SensorEntity):
     _attr_translation_key = "battery"
     _attr_device_class = SensorDeviceClass.BATTERY
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _coordinator_keys = frozenset({"battery_level"})
     _attr_native_unit_of_measurement = PERCENTAGE
 
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
@@ -21,6 +21,7 @@ class BoksBatteryTemperatureSensor(BoksEntity, SensorEntity):
     _attr_translation_key = "battery_temperature"
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _coordinator_keys = frozenset({"battery_temperature"})
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -1,5 +1,6 @@
 """Code count sensors for Boks."""
 import logging
+from collections.abc import Callable
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -8,10 +9,8 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
 
-from ..ble.const import BoksNotificationOpcode
 from ..coordinator import BoksDataUpdateCoordinator
 from ..entity import BoksEntity
-from ..packets.factory import PacketFactory
 from ..packets.rx.code_counts import CodeCountsPacket
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,9 +25,10 @@ class BoksCodeCountSensor(BoksEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator, entry)
         self._code_type = code_type
+        self.coordinator_context = frozenset({code_type})
         self._attr_translation_key = f"{code_type}_codes_count"
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_{code_type}_codes_count"
-        self._callback_registered = False
+        self._unsubscribe_notifications: Callable[[], None] | None = None
 
     @property
     def suggested_object_id(self) -> str | None:
@@ -41,34 +41,28 @@ class BoksCodeCountSensor(BoksEntity, SensorEntity):
         return self.coordinator.data.get(self._code_type, 0)
 
     async def async_added_to_hass(self) -> None:
-        """Register opcode callback when entity is added to hass."""
+        """Subscribe to code count notifications when entity is added to hass."""
         await super().async_added_to_hass()
 
-        if not self._callback_registered:
-            self.coordinator.register_opcode_callback(
-                BoksNotificationOpcode.NOTIFY_CODES_COUNT,
-                self._handle_codes_count_notification
+        if self._unsubscribe_notifications is None:
+            self._unsubscribe_notifications = self.coordinator.subscribe_notifications(
+                self._handle_codes_count_notification,
+                packet_type=CodeCountsPacket
             )
-            self._callback_registered = True
-            _LOGGER.debug("Registered opcode callback for code count sensor %s", self._attr_unique_id)
+            _LOGGER.debug("Subscribed to notifications for code count sensor %s", self._attr_unique_id)
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unregister opcode callback when entity is removed from hass."""
-        if self._callback_registered:
-            self.coordinator.unregister_opcode_callback(
-                BoksNotificationOpcode.NOTIFY_CODES_COUNT,
-                self._handle_codes_count_notification
-            )
-            self._callback_registered = False
-            _LOGGER.debug("Unregistered opcode callback for code count sensor %s", self._attr_unique_id)
+        """Unsubscribe from notifications when entity is removed from hass."""
+        if self._unsubscribe_notifications is not None:
+            self._unsubscribe_notifications()
+            self._unsubscribe_notifications = None
+            _LOGGER.debug("Unsubscribed from notifications for code count sensor %s", self._attr_unique_id)
 
         await super().async_will_remove_from_hass()
 
-    def _handle_codes_count_notification(self, data: bytearray) -> None:
+    def _handle_codes_count_notification(self, packet: CodeCountsPacket) -> None:
         """Handle codes count notification."""
         try:
-            packet = PacketFactory.from_rx_data(data)
-
             if isinstance(packet, CodeCountsPacket):
                 # Update coordinator data
                 if self.coordinator.data is None:
@@ -80,10 +74,9 @@ class BoksCodeCountSensor(BoksEntity, SensorEntity):
                 else:
                     count = packet.single_use_count
 
-                self.coordinator.data[self._code_type] = count
                 _LOGGER.debug("Updated %s code count to %d", self._code_type, count)
 
-                # Notify listeners of the update
-                self.coordinator.async_set_updated_data(self.coordinator.data)
+                # Notify the listeners of this count only
+                self.coordinator.async_update_keys({self._code_type: count})
         except Exception as e:
             _LOGGER.error("Error handling codes count notification: %s", e)
@@ -13,6 +13,7 @@ class BoksBatteryTypeSensor(BoksRetainingSensor):
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.ENUM
+    _coordinator_keys = frozenset({"device_info_service"})
     _attr_options = ["unknown", "lsh14", "8x_aaa", "other"]
     _attr_icon = "mdi:battery-unknown"
 
@@ -11,6 +11,8 @@ from ...entity import BoksEntity
 class BoksRetainingSensor(BoksEntity, SensorEntity):
     """Base class for sensors that retain their last valid value."""
 
+    _coordinator_keys = frozenset({"battery_stats"})
+
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, entry)
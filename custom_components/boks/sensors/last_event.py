@@ -1,4 +1,7 @@
 """Last event sensor for Boks."""
+from collections import deque
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorEntity,
 )
@@ -7,20 +10,35 @@ from homeassistant.const import CONF_ADDRESS
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
-from ..coordinator import BoksDataUpdateCoordinator
+from ..coordinator import LOG_DATA_KEYS, BoksDataUpdateCoordinator
 from ..entity import BoksEntity
 
+# Events kept in the last_10_events attribute
+LAST_EVENTS_COUNT = 10
+# Marker of attributes never rendered (last_log_fetch_ts can be None)
+_NOT_RENDERED = object()
+# Keys that are handled explicitly and should not be duplicated in extras
+_STANDARD_KEYS = frozenset({"timestamp", "event_type", "description", "opcode", "payload"})
+
 
 class BoksLastEventSensor(BoksEntity, SensorEntity, RestoreEntity):
     """Representation of a Boks Last Event Sensor."""
 
     _attr_translation_key = "last_event"
+    _coordinator_keys = frozenset(LOG_DATA_KEYS)
+    # The recent events are in the logbook and the event journal already
+    _unrecorded_attributes = frozenset({"last_10_events"})
 
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_last_event"
         self._restored_state = None
+        # Attributes of the last rendered log batch, keyed by its fetch timestamp and newest log
+        self._rendered_fetch_ts: str | None | object = _NOT_RENDERED
+        self._rendered_log: dict | None = None
+        self._attributes: dict[str, Any] = {}
+        self._last_events: deque[dict[str, Any]] = deque(maxlen=LAST_EVENTS_COUNT)
 
     @property
     def suggested_object_id(self) -> str | None:
@@ -35,11 +53,6 @@ class BoksLastEventSensor(BoksEntity, SensorEntity, RestoreEntity):
             self._attr_native_value = state.state
             self._restored_state = state.state
 
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        # Call async_write_ha_state to update the entity state
-        self.async_write_ha_state()
-
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
@@ -67,85 +80,67 @@ class BoksLastEventSensor(BoksEntity, SensorEntity, RestoreEntity):
         return event_type
 
     @property
-    def extra_state_attributes(self) -> dict[str, any]:
-        """Return the state attributes."""
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes (rendered once per published log batch)."""
+        # The end of a sync exposes all the streamed logs again under the last
+        # batch timestamp and ending with the same log. Batches published within
+        # the same clock tick share a timestamp but not their newest log.
+        fetch_ts = self.coordinator.data.get("last_log_fetch_ts")
         logs = self.coordinator.data.get("latest_logs", [])
-        if not logs:
-            return {}
-
-        # Get the most recent log
-        latest_log = logs[-1] if isinstance(logs, list) and len(logs) > 0 else None
-        if not latest_log:
+        newest = logs[-1] if logs and isinstance(logs, list) else None
+        if fetch_ts != self._rendered_fetch_ts or newest is not self._rendered_log:
+            self._rendered_fetch_ts = fetch_ts
+            self._rendered_log = newest
+            self._attributes = self._render_attributes(logs)
+        return self._attributes
+
+    def _render_attributes(self, logs: list[dict] | None) -> dict[str, Any]:
+        """Format the newest log and add the new entries to the recent events."""
+        if not logs or not isinstance(logs, list):
             return {}
 
-        # Process timestamp
-        timestamp_val = latest_log.get("timestamp")
-        formatted_timestamp = None
-        if timestamp_val:
-            try:
-                # Assuming timestamp is a unix timestamp (seconds)
-                dt_obj = dt_util.utc_from_timestamp(timestamp_val)
-                # Convert to local time and format as readable string
-                formatted_timestamp = dt_util.as_local(dt_obj).strftime("%Y-%m-%d %H:%M:%S")
-            except Exception:
-                formatted_timestamp = str(timestamp_val)
-
-        # Keys that are handled explicitly and should not be duplicated in extras
-        standard_keys = {"timestamp", "event_type", "description", "opcode", "payload"}
-
+        # Only the newest entries of the batch can reach the recent events
+        for log in logs[-LAST_EVENTS_COUNT:]:
+            formatted_event = {
+                "timestamp": _format_timestamp(log.get("timestamp")) or str(log.get("timestamp")),
+                "description": log.get("description"),
+                "event_type": log.get("event_type"),
+            }
+            _add_extras(log, formatted_event)
+            self._last_events.appendleft(formatted_event)
+
+        latest_log = logs[-1]
         # Return detailed information about the last event
         attributes = {
-            "timestamp": formatted_timestamp,
+            "timestamp": _format_timestamp(latest_log.get("timestamp")),
             "event_type": latest_log.get("event_type"),
             "description": latest_log.get("description"), # Description handled by coordinator
             "opcode": latest_log.get("opcode"),
         }
+        _add_extras(latest_log, attributes)
 
-        # Add all other keys from the log as extras (e.g., 'code', 'error_code', etc.)
-        for k, v in latest_log.items():
-            if k == "extra_data" and isinstance(v, dict):
-                for extra_k, extra_v in v.items():
-                    if extra_v is not None:
-                        attributes[extra_k] = extra_v
-            elif k not in standard_keys and v is not None:
-                attributes[k] = v
-
-        # Add last 10 events to attributes (Newest First)
-        if isinstance(logs, list):
-            # Get last 10 events
-            last_events_chunk = logs[-10:] if len(logs) >= 10 else logs
-            # Reverse them to have Newest -> Oldest
-            last_events_reversed = reversed(last_events_chunk)
-
-            # Format events for display
-            formatted_events = []
-            for log in last_events_reversed:
-                # Format timestamp for history
-                ts_val = log.get("timestamp")
-                ts_str = str(ts_val)
-                if ts_val:
-                    try:
-                        dt_obj = dt_util.utc_from_timestamp(ts_val)
-                        ts_str = dt_util.as_local(dt_obj).strftime("%Y-%m-%d %H:%M:%S")
-                    except Exception:
-                        pass
-
-                formatted_event = {
-                    "timestamp": ts_str,
-                    "description": log.get("description"),
-                    "event_type": log.get("event_type"),
-                }
-
-                # Add extras for this history item
-                for k, v in log.items():
-                    if k == "extra_data" and isinstance(v, dict):
-                        for extra_k, extra_v in v.items():
-                            if extra_v is not None:
-                                formatted_event[extra_k] = extra_v
-                    elif k not in standard_keys and v is not None:
-                        formatted_event[k] = v
-
-                formatted_events.append(formatted_event)
-            attributes["last_10_events"] = formatted_events
-
+        # Newest first, across the batches received since startup
+        attributes["last_10_events"] = list(self._last_events)
         return attributes
+
+
+def _format_timestamp(timestamp_val: Any) -> str | None:
+    """Format a unix timestamp (seconds) as a readable local time."""
+    if not timestamp_val:
+        return None
+    try:
+        dt_obj = dt_util.utc_from_timestamp(timestamp_val)
+        return dt_util.as_local(dt_obj).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return str(timestamp_val)
+
+
+def _add_extras(log: dict, target: dict[str, Any]) -> None:
+    """Add all other keys of a log entry (e.g. 'code', 'error_code', extra_data content)."""
+    for k, v in log.items():
+        if k == "extra_data" and isinstance(v, dict):
+            for extra_k, extra_v in v.items():
+                if extra_v is not None:
+                    target[extra_k] = extra_v
+        elif k not in _STANDARD_KEYS and v is not None:
+            target[k] = v
@@ -1,5 +1,6 @@
 """Log count sensor for Boks."""
 import logging
+from collections.abc import Callable
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -8,10 +9,8 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, EntityCategory
 
-from ..ble.const import BoksNotificationOpcode
 from ..coordinator import BoksDataUpdateCoordinator
 from ..entity import BoksEntity
-from ..packets.factory import PacketFactory
 from ..packets.rx.log_count import LogCountPacket
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,12 +22,13 @@ class BoksLogCountSensor(BoksEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_translation_key = "log_count"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _coordinator_keys = frozenset({"log_count"})
 
     def __init__(self, coordinator: BoksDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_log_count"
-        self._callback_registered = False
+        self._unsubscribe_notifications: Callable[[], None] | None = None
 
     @property
     def suggested_object_id(self) -> str | None:
@@ -41,44 +41,37 @@ class BoksLogCountSensor(BoksEntity, SensorEntity):
         return self.coordinator.data.get("log_count", 0)
 
     async def async_added_to_hass(self) -> None:
-        """Register opcode callback when entity is added to hass."""
+        """Subscribe to log count notifications when entity is added to hass."""
         await super().async_added_to_hass()
 
-        if not self._callback_registered:
-            self.coordinator.register_opcode_callback(
-                BoksNotificationOpcode.NOTIFY_LOGS_COUNT,
-                self._handle_logs_count_notification
+        if self._unsubscribe_notifications is None:
+            self._unsubscribe_notifications = self.coordinator.subscribe_notifications(
+                self._handle_logs_count_notification,
+                packet_type=LogCountPacket
             )
-            self._callback_registered = True
-            _LOGGER.debug("Registered opcode callback for log count sensor %s", self._attr_unique_id)
+            _LOGGER.debug("Subscribed to notifications for log count sensor %s", self._attr_unique_id)
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unregister opcode callback when entity is removed from hass."""
-        if self._callback_registered:
-            self.coordinator.unregister_opcode_callback(
-                BoksNotificationOpcode.NOTIFY_LOGS_COUNT,
-                self._handle_logs_count_notification
-            )
-            self._callback_registered = False
-            _LOGGER.debug("Unregistered opcode callback for log count sensor %s", self._attr_unique_id)
+        """Unsubscribe from notifications when entity is removed from hass."""
+        if self._unsubscribe_notifications is not None:
+            self._unsubscribe_notifications()
+            self._unsubscribe_notifications = None
+            _LOGGER.debug("Unsubscribed from notifications for log count sensor %s", self._attr_unique_id)
 
         await super().async_will_remove_from_hass()
 
-    def _handle_logs_count_notification(self, data: bytearray) -> None:
+    def _handle_logs_count_notification(self, packet: LogCountPacket) -> None:
         """Handle logs count notification."""
         try:
-            packet = PacketFactory.from_rx_data(data)
-
             if isinstance(packet, LogCountPacket):
                 log_count = packet.count
                 # Update coordinator data
                 if self.coordinator.data is None:
                     self.coordinator.data = {}
 
-                self.coordinator.data["log_count"] = log_count
                 _LOGGER.debug("Updated log count to %d", log_count)
 
-                # Notify listeners of the update
-                self.coordinator.async_set_updated_data(self.coordinator.data)
+                # Notify the listeners of the log count only
+                self.coordinator.async_update_keys({"log_count": log_count})
         except Exception as e:
             _LOGGER.error("Error handling logs count notification: %s", e)
@@ -5,7 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
 from homeassistant.helpers.entity import EntityCategory
 
-from ..coordinator import BoksDataUpdateCoordinator
+from ..coordinator import MAINTENANCE_STATUS_KEY, BoksDataUpdateCoordinator
 from ..entity import BoksEntity
 
 
@@ -14,6 +14,7 @@ class BoksMaintenanceSensor(BoksEntity, SensorEntity):
 
     _attr_has_entity_name = True
     _attr_translation_key = "maintenance_status"
+    _coordinator_keys = frozenset({MAINTENANCE_STATUS_KEY})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:broom"
 
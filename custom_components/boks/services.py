@@ -7,8 +7,9 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, MAX_MASTER_CODE_CLEAN_RANGE
+from .const import DOMAIN, JOURNAL_QUERY_DEFAULT_LIMIT, JOURNAL_QUERY_MAX_LIMIT, MAX_MASTER_CODE_CLEAN_RANGE
 from .coordinator import BoksDataUpdateCoordinator
 from .errors import BoksError
 
@@ -75,6 +76,17 @@ SERVICE_GENERATE_UPDATE_PACKAGE_SCHEMA = vol.Schema({
     vol.Required("version"): cv.string,
 }, extra=vol.ALLOW_EXTRA)
 
+SERVICE_QUERY_EVENTS_SCHEMA = vol.Schema({
+    vol.Optional("event_type"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("code"): cv.string,
+    vol.Optional("tag_uid"): cv.string,
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("limit", default=JOURNAL_QUERY_DEFAULT_LIMIT): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=JOURNAL_QUERY_MAX_LIMIT)
+    ),
+}, extra=vol.ALLOW_EXTRA)
+
 
 def get_coordinator_from_call(hass: HomeAssistant, call: ServiceCall) -> BoksDataUpdateCoordinator:
     """Retrieve the Boks coordinator from a service call target."""
@@ -492,3 +504,38 @@ async def async_setup_services(hass: HomeAssistant):
         schema=SERVICE_GENERATE_PIN_CODE_SCHEMA,
         supports_response=SupportsResponse.OPTIONAL
     )
+
+    # --- Service: Query Events ---
+    async def handle_query_events(call: ServiceCall) -> dict:
+        """Handle querying the local event journal."""
+        coordinator = get_coordinator_from_call(hass, call)
+
+        def to_timestamp(value):
+            if value is None:
+                return None
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=dt_util.get_default_time_zone())
+            return int(value.timestamp())
+
+        result = await coordinator.journal.async_query(
+            event_types=call.data.get("event_type"),
+            code=call.data.get("code"),
+            tag_uid=call.data.get("tag_uid"),
+            start=to_timestamp(call.data.get("start")),
+            end=to_timestamp(call.data.get("end")),
+            limit=call.data.get("limit", JOURNAL_QUERY_DEFAULT_LIMIT),
+        )
+        for key in ("first", "last"):
+            if result[key] is not None:
+                result[key] = dt_util.utc_from_timestamp(result[key]).isoformat()
+        for event in result["events"]:
+            event["timestamp"] = dt_util.utc_from_timestamp(event["timestamp"]).isoformat()
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        "query_events",
+        handle_query_events,
+        schema=SERVICE_QUERY_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
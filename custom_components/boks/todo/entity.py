@@ -11,6 +11,7 @@ from homeassistant.components.todo import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -58,6 +59,12 @@ class BoksParcelTodoList(CoordinatorEntity, TodoListEntity):
         self._has_config_key = has_config_key
         self._unsub_timer = None
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator (items come from the parcel store, key pushes are ignored)."""
+        if self.coordinator.keys_changed(()):
+            super()._handle_coordinator_update()
+
     @property
     def translation_placeholders(self) -> dict[str, str]:
         """Return the translation placeholders."""
@@ -9,7 +9,6 @@ from packaging import version
 
 from ..const import BOKS_HARDWARE_INFO, DOMAIN, UPDATE_NOTIFICATION_ID_PREFIX
 from ..errors import BoksError
-from .manager import BoksUpdateManager
 
 if TYPE_CHECKING:
     from ..coordinator import BoksDataUpdateCoordinator
@@ -116,7 +115,9 @@ class BoksUpdateController:
             except (version.InvalidVersion, ValueError) as e:
                 _LOGGER.warning("Error comparing versions: %s", e)
 
-        # Prepare Update Package via Manager
+        # Prepare Update Package via Manager (download stack loaded on demand)
+        from .manager import BoksUpdateManager
+
         manager = BoksUpdateManager(self.hass)
         try:
             full_url_relative = await manager.async_prepare_update(target_version, internal_revision)
@@ -143,6 +144,8 @@ class BoksUpdateController:
 
     async def async_delete_package(self, version: str) -> None:
         """Delete an update package."""
+        from .manager import BoksUpdateManager
+
         manager = BoksUpdateManager(self.hass)
         await manager.async_delete_package(version)
 
@@ -0,0 +1,87 @@
+"""
+Measure the cold import cost of the Boks integration.
+
+Each run imports custom_components.boks in a fresh interpreter with
+`python -X importtime` and reports the cumulative time of the integration
+import and of its heaviest modules. Home Assistant itself is imported first,
+so only what the integration adds is measured.
+
+Usage: python scripts/benchmark_import.py [--runs N] [--top N] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "custom_components.boks"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported before the measure, they are loaded by Home Assistant anyway
+PRELOAD = "import homeassistant.core, homeassistant.helpers.update_coordinator, homeassistant.components.bluetooth"
+
+
+def run_once() -> dict[str, int]:
+    """Import the integration in a fresh interpreter, return the cumulative time (us) per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{PRELOAD}\nimport {PACKAGE}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    marker = False
+    timings: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        # Everything imported after the preload belongs to the integration import
+        if not marker:
+            if name.startswith(PACKAGE):
+                marker = True
+            else:
+                continue
+        timings[name] = timings.get(name, 0) + int(parts[1])
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to run (median reported)")
+    parser.add_argument("--top", type=int, default=15, help="heaviest modules to list")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    total = statistics.median(run.get(PACKAGE, 0) for run in runs)
+    modules = {name for run in runs for name in run}
+    medians = {name: statistics.median(run.get(name, 0) for run in runs) for name in modules}
+    heaviest = sorted(medians.items(), key=lambda item: item[1], reverse=True)[: args.top]
+    boks_modules = sorted(name for name in modules if name.startswith(PACKAGE))
+
+    if args.json:
+        print(json.dumps({
+            "runs": args.runs,
+            "total_us": total,
+            "modules_loaded": len(modules),
+            "boks_modules_loaded": len(boks_modules),
+            "heaviest": dict(heaviest),
+        }, indent=2))
+        return
+
+    print(f"{PACKAGE}: {total / 1000:.1f} ms (median of {args.runs} runs)")
+    print(f"Modules loaded: {len(modules)} ({len(boks_modules)} from the integration)")
+    print("Heaviest modules (cumulative):")
+    for name, value in heaviest:
+        print(f"  {value / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
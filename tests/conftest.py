@@ -64,8 +64,16 @@ def mock_boks_ble_device():
             "software_revision": "4.5.1",
             "hardware_revision": "v2"
         })
+        mock_ble.get_software_revision = AsyncMock(return_value="4.5.1")
         mock_ble.get_logs_count = AsyncMock(return_value=0)
         mock_ble.get_logs = AsyncMock(return_value=[])
+
+        async def _iter_logs(count):
+            logs = await mock_ble.get_logs(count)
+            if logs:
+                yield logs
+
+        mock_ble.iter_logs = MagicMock(side_effect=_iter_logs)
         mock_ble.register_status_callback = MagicMock()
         mock_ble.anonymize_logs = False
         yield mock_ble
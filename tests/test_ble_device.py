@@ -1,12 +1,19 @@
 "Tests for the Boks BLE device."
+import asyncio
+import time
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from bleak.exc import BleakError
 from homeassistant.core import HomeAssistant
 from custom_components.boks.ble.device import BoksBluetoothDevice
+from custom_components.boks.const import DELAY_POST_DOOR_CLOSE_SYNC
+from custom_components.boks.ble.quiescence import BoksQuiescence
+from custom_components.boks.ble.read_batch import BoksReadBatcher
 from custom_components.boks.errors import BoksError, BoksAuthError
 from custom_components.boks.ble.const import BoksNotificationOpcode
 from custom_components.boks.packets.base import BoksTXPacket
+from custom_components.boks.packets.factory import PacketFactory
+from custom_components.boks.packets.rx.log_count import LogCountPacket
 
 class MockTXPacket(BoksTXPacket):
     """Mock TX Packet for testing."""
@@ -181,4 +188,616 @@ async def test_set_configuration_success(hass: HomeAssistant):
         from custom_components.boks.packets.tx.set_configuration import SetConfigurationPacket
         assert isinstance(packet_arg, SetConfigurationPacket)
         # Check content
-        # We can't easily check internal bytes without duplicating logic, but we can assume correct if class is correct
\ No newline at end of file
+        # We can't easily check internal bytes without duplicating logic, but we can assume correct if class is correct
+
+async def test_scheduler_batches_queued_commands_in_one_session(hass: HomeAssistant):
+    """Test that concurrent commands share a single BLE session."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    mock_client = MagicMock()
+    mock_client.is_connected = True
+    mock_client.disconnect = AsyncMock()
+
+    async def side_effect_connect(*args, **kwargs):
+        device._client = mock_client
+
+    sent = []
+
+    async def side_effect_send(packet, *args, **kwargs):
+        sent.append(packet.opcode)
+        await asyncio.sleep(0)
+        return None
+
+    with patch.object(device, "_connect", new_callable=AsyncMock, side_effect=side_effect_connect) as mock_connect, \
+         patch.object(device, "_disconnect", new_callable=AsyncMock) as mock_disconnect, \
+         patch.object(device, "_send_packet", new_callable=AsyncMock, side_effect=side_effect_send):
+        await asyncio.gather(*(device.send_packet(MockTXPacket(0x10 + i)) for i in range(3)))
+
+    assert sent == [0x10, 0x11, 0x12]
+    assert mock_connect.call_count == 1
+    assert mock_disconnect.call_count == 1
+    assert device._scheduler.sessions_opened == 1
+    assert device._scheduler.commands_executed == 3
+
+async def test_scheduler_connect_failure_fails_only_head(hass: HomeAssistant):
+    """Test that a connection failure is reported to the first queued caller only."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    mock_client = MagicMock()
+    mock_client.is_connected = True
+
+    async def side_effect_connect(*args, **kwargs):
+        if side_effect_connect.calls == 0:
+            side_effect_connect.calls += 1
+            raise BoksError("no_connectable_adapter")
+        device._client = mock_client
+    side_effect_connect.calls = 0
+
+    with patch.object(device, "_connect", new_callable=AsyncMock, side_effect=side_effect_connect), \
+         patch.object(device, "_disconnect", new_callable=AsyncMock), \
+         patch.object(device, "_get_battery_level", new_callable=AsyncMock, return_value=42):
+        results = await asyncio.gather(
+            device.get_battery_level(),
+            device.get_battery_level(),
+            return_exceptions=True
+        )
+
+    assert isinstance(results[0], BoksError)
+    assert results[1] == 42
+
+async def test_response_table_fifo_waiters_same_opcode(hass: HomeAssistant):
+    """Test that two waiters on the same opcode are both resolved, oldest first."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    opcode = BoksNotificationOpcode.CODE_OPERATION_SUCCESS
+
+    first = device._responses.register([opcode, BoksNotificationOpcode.CODE_OPERATION_ERROR])
+    second = device._responses.register([opcode])
+
+    assert device._responses.resolve(opcode, "first") is True
+    assert first.result() == "first"
+    assert not second.done()
+
+    assert device._responses.resolve(opcode, "second") is True
+    assert second.result() == "second"
+
+    # Nothing left waiting, also not on the other opcode of the first waiter
+    assert len(device._responses) == 0
+    assert device._responses.resolve(BoksNotificationOpcode.CODE_OPERATION_ERROR, "late") is False
+
+    histograms = device.get_diagnostics()["response_latencies"]
+    assert sum(histograms[f"0x{opcode:02X}"].values()) == 2
+
+async def test_response_table_skips_cancelled_waiter(hass: HomeAssistant):
+    """Test that a cancelled waiter does not swallow the next response."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    opcode = BoksNotificationOpcode.NOTIFY_CODES_COUNT
+
+    stale = device._responses.register([opcode])
+    fresh = device._responses.register([opcode])
+    stale.cancel()
+
+    assert device._responses.resolve(opcode, "data") is True
+    assert fresh.result() == "data"
+
+async def test_hold_connection_keeps_link_open_after_session(hass: HomeAssistant):
+    """Test that hold mode keeps the physical connection open when the last session ends."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    device.set_hold_connection(True, 120)
+
+    mock_client = MagicMock()
+    mock_client.is_connected = True
+    mock_client.disconnect = AsyncMock()
+    device._client = mock_client
+    device._connection_users = 1
+
+    await device._disconnect()
+
+    mock_client.disconnect.assert_not_called()
+    assert device._client is mock_client
+    assert device._autokill_task is not None
+    device._stop_autokill_timer()
+
+async def test_hold_connection_backs_off_on_low_battery(hass: HomeAssistant):
+    """Test that the hold window shrinks with the battery level and is disabled when low."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    assert device._get_hold_window() == 0
+
+    device.set_hold_connection(True, 100)
+    assert device._get_hold_window() == 100
+
+    device._battery_level = 35
+    assert device._get_hold_window() == pytest.approx(50)
+
+    device._battery_level = 10
+    assert device._get_hold_window() == 0
+
+    mock_client = MagicMock()
+    mock_client.is_connected = True
+    mock_client.disconnect = AsyncMock()
+    device._client = mock_client
+    device._connection_users = 1
+
+    await device._disconnect()
+
+    mock_client.disconnect.assert_called_once()
+    assert device._client is None
+
+async def test_adaptive_connect_delay_per_source(hass: HomeAssistant):
+    """Test that the pre-connect delay shrinks on success and grows on failure, per scanner source."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    delays = device._connect_delays
+    assert delays.get_delay("local") == 1.0
+
+    for _ in range(45):
+        delays.record_success("local", delays.get_delay("local"))
+    assert delays.get_delay("local") == pytest.approx(0.1)
+
+    delays.record_failure("proxy", 1.0)
+    assert delays.get_delay("proxy") == 2.0
+    # A failure on the proxy does not affect the local adapter
+    assert delays.get_delay("local") == pytest.approx(0.1)
+
+    # The failing delay is kept as a floor until it decays
+    for _ in range(3):
+        delays.record_success("proxy", 2.0)
+    assert delays.get_delay("proxy") == pytest.approx(1.6)
+
+    diag = device.get_diagnostics()["connect_delays"]
+    assert diag["proxy"]["failures"] == 1
+    assert diag["local"]["successes"] == 45
+
+async def test_connect_uses_learned_delay(hass: HomeAssistant):
+    """Test that _connect sleeps for the learned delay of the selected scanner source."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    device._connect_delays.record_failure("unknown", 1.0)
+
+    mock_client = MagicMock()
+    mock_client.is_connected = True
+
+    with patch("custom_components.boks.ble.device.establish_connection", return_value=mock_client), \
+         patch("custom_components.boks.ble.device.bluetooth.async_last_service_info", return_value=None), \
+         patch("custom_components.boks.ble.device.asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
+         patch.object(device, "_rank_devices", new_callable=AsyncMock, return_value=[None]), \
+         patch.object(device, "_ensure_notifications", new_callable=AsyncMock):
+        await device._connect()
+
+    mock_sleep.assert_any_call(2.0)
+    assert device._connect_delays.as_dict()["unknown"]["successes"] == 1
+    device._stop_autokill_timer()
+
+async def test_find_best_device_prefers_reliable_scanner(hass: HomeAssistant):
+    """Test that a loud but flaky proxy loses against a quieter reliable adapter."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    loud = MagicMock()
+    loud.rssi = -50
+    loud.scanner.source = "11:11:11:11:11:11"
+    quiet = MagicMock()
+    quiet.rssi = -80
+    quiet.scanner.source = "22:22:22:22:22:22"
+
+    with patch("custom_components.boks.ble.device.bluetooth.async_scanner_devices_by_address",
+               return_value=[loud, quiet]):
+        # Without history the loudest scanner wins
+        assert await device._find_best_device() is loud
+
+        ranking = device._scanner_ranking
+        for _ in range(3):
+            ranking.record_connect("11:11:11:11:11:11", False, 10.0)
+            ranking.record_connect("22:22:22:22:22:22", True, 2.0)
+        ranking.record_disconnect("11:11:11:11:11:11")
+
+        assert await device._find_best_device() is quiet
+
+    scanners = device.get_diagnostics()["scanners"]
+    assert scanners["11:11:11:11:11:11"]["connect_failures"] == 3
+    assert scanners["22:22:22:22:22:22"]["mean_rssi"] == -80
+
+async def test_rank_devices_breaks_default_score_ties_by_rssi(hass: HomeAssistant):
+    """Test that scanners sharing the default score are ordered by signal strength."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    devices = []
+    for source, rssi in (("11:11:11:11:11:11", None), ("22:22:22:22:22:22", -70), ("33:33:33:33:33:33", -55)):
+        dev = MagicMock(spec=["rssi", "scanner"])
+        dev.rssi = rssi
+        dev.scanner.source = source
+        devices.append(dev)
+
+    with patch("custom_components.boks.ble.device.bluetooth.async_scanner_devices_by_address",
+               return_value=devices):
+        ranked = await device._rank_devices()
+
+    assert [dev.rssi for dev in ranked] == [-55, -70, None]
+
+async def test_race_connect_keeps_fastest_scanner(hass: HomeAssistant):
+    """Test that the parallel connect keeps the first scanner to connect and cancels the others."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    device.set_parallel_connect(True)
+
+    slow = MagicMock()
+    slow.rssi = -40
+    slow.scanner.source = "11:11:11:11:11:11"
+    fast = MagicMock()
+    fast.rssi = -70
+    fast.scanner.source = "22:22:22:22:22:22"
+
+    fast_client = MagicMock()
+    fast_client.is_connected = True
+    slow_cancelled = asyncio.Event()
+
+    async def fake_establish(client_cls, ble_device, address, **kwargs):
+        if ble_device is slow.ble_device:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+        return fast_client
+
+    with patch("custom_components.boks.ble.device.bluetooth.async_scanner_devices_by_address",
+               return_value=[slow, fast]), \
+         patch("custom_components.boks.ble.device.bluetooth.async_last_service_info", return_value=None), \
+         patch("custom_components.boks.ble.device.establish_connection", side_effect=fake_establish), \
+         patch("custom_components.boks.ble.device.PARALLEL_CONNECT_STAGGER", 0), \
+         patch.object(device._connect_delays, "get_delay", return_value=0), \
+         patch.object(device, "_ensure_notifications", new_callable=AsyncMock):
+        await device._connect()
+
+    assert device._client is fast_client
+    assert device._connected_source == "22:22:22:22:22:22"
+    assert slow_cancelled.is_set()
+    # The cancelled attempt is not held against the slow scanner
+    assert device._scanner_ranking.as_dict()["11:11:11:11:11:11"]["connect_failures"] == 0
+    device._stop_autokill_timer()
+
+async def test_race_loser_disconnect_keeps_winner(hass: HomeAssistant):
+    """Test that closing a race loser does not clear the winning client."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    winner = MagicMock()
+    loser = MagicMock()
+    loser.disconnect = AsyncMock(side_effect=lambda: device._on_disconnected(loser))
+    device._client = winner
+    device._connected_source = "22:22:22:22:22:22"
+    device._connection_users = 1
+
+    await device._close_race_loser(loser)
+
+    assert device._client is winner
+    assert "22:22:22:22:22:22" not in device._scanner_ranking.as_dict()
+
+    # The active client dropping is still handled
+    device._on_disconnected(winner)
+    assert device._client is None
+    assert device._scanner_ranking.as_dict()["22:22:22:22:22:22"]["disconnects"] == 1
+
+async def test_notification_decoded_once_and_shared(hass: HomeAssistant):
+    """Test that waiters and opcode callbacks receive the same decoded packet."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    opcode = BoksNotificationOpcode.NOTIFY_LOGS_COUNT
+    data = bytearray([opcode, 0x02, 0x00, 0x05])
+    data.append(sum(data) & 0xFF)
+
+    received = []
+    device.subscribe_notifications(received.append, opcodes=[opcode])
+    future = device._responses.register([opcode])
+
+    with patch("custom_components.boks.ble.device.PacketFactory.from_rx_data",
+               wraps=PacketFactory.from_rx_data) as mock_decode:
+        device._notification_handler(0, data)
+
+    assert mock_decode.call_count == 1
+    assert received == [future.result()]
+    assert future.result().count == 5
+    device._stop_autokill_timer()
+
+async def test_notification_bus_filters_and_isolates_errors(hass: HomeAssistant):
+    """Test packet class/opcode filters and that a failing subscriber does not block others."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    count_data = bytearray([BoksNotificationOpcode.NOTIFY_LOGS_COUNT, 0x02, 0x00, 0x01])
+    count_data.append(sum(count_data) & 0xFF)
+    codes_data = bytearray([BoksNotificationOpcode.NOTIFY_CODES_COUNT, 0x04, 0x00, 0x01, 0x00, 0x02])
+    codes_data.append(sum(codes_data) & 0xFF)
+
+    def broken(packet):
+        raise ValueError("boom")
+
+    by_type = []
+    everything = []
+    device.subscribe_notifications(broken, packet_type=LogCountPacket)
+    unsubscribe = device.subscribe_notifications(by_type.append, packet_type=LogCountPacket)
+    device.subscribe_notifications(everything.append)
+
+    device._notifications.publish(PacketFactory.from_rx_data(count_data))
+    device._notifications.publish(PacketFactory.from_rx_data(codes_data))
+    unsubscribe()
+    device._notifications.publish(PacketFactory.from_rx_data(count_data))
+
+    assert len(by_type) == 1
+    assert [p.opcode for p in everything] == [
+        BoksNotificationOpcode.NOTIFY_LOGS_COUNT,
+        BoksNotificationOpcode.NOTIFY_CODES_COUNT,
+        BoksNotificationOpcode.NOTIFY_LOGS_COUNT,
+    ]
+    stats = device.get_diagnostics()["notifications"]
+    assert stats["published"] == 3
+    assert stats["errors"] == 2
+    assert stats["per_opcode"]["0x79"] == 2
+
+async def test_iter_logs_yields_before_end_of_history(hass: HomeAssistant):
+    """Test that history entries are streamed while the download is still running."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    release_end = asyncio.Event()
+
+    async def fake_get_logs(count, sink=None):
+        sink({"opcode": 1})
+        await release_end.wait()
+        sink({"opcode": 2})
+        sink({"opcode": 3})
+        return []
+
+    batches = []
+    with patch.object(device, "get_logs", side_effect=fake_get_logs):
+        async for batch in device.iter_logs(3):
+            batches.append([entry["opcode"] for entry in batch])
+            # The first batch arrives before the end of the history
+            release_end.set()
+
+    assert batches == [[1], [2, 3]]
+
+async def test_get_logs_watchdog_partial_and_resume(hass: HomeAssistant):
+    """Test that a stalled history download returns quickly and the retry skips delivered entries."""
+    from custom_components.boks.ble.const import BoksHistoryEvent
+
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    def history_packet(opcode, age):
+        data = bytearray([opcode, 3]) + age.to_bytes(3, "big")
+        data.append(sum(data) & 0xFF)
+        return PacketFactory.from_rx_data(data)
+
+    dumps = [
+        # First dump stalls after two entries
+        [(BoksHistoryEvent.DOOR_OPENED, 50), (BoksHistoryEvent.DOOR_CLOSED, 40)],
+        # Second dump starts over and completes
+        [(BoksHistoryEvent.DOOR_OPENED, 50), (BoksHistoryEvent.DOOR_CLOSED, 40),
+         (BoksHistoryEvent.DOOR_OPENED, 5), (BoksHistoryEvent.LOG_END_HISTORY, None)],
+        # Third dump stalls after one entry
+        [(BoksHistoryEvent.DOOR_OPENED, 30)],
+        # The device consumed that entry: a new opening with the same payload is not skipped
+        [(BoksHistoryEvent.DOOR_OPENED, 2), (BoksHistoryEvent.LOG_END_HISTORY, None)],
+    ]
+
+    async def send(packet):
+        for opcode, age in dumps.pop(0):
+            if age is None:
+                data = bytearray([opcode, 0x00])
+                data.append(sum(data) & 0xFF)
+                device._notifications.publish(PacketFactory.from_rx_data(data))
+            else:
+                device._notifications.publish(history_packet(opcode, age))
+
+    with patch.object(device, "_send_packet", side_effect=send), \
+         patch("custom_components.boks.ble.device.TIMEOUT_LOG_FIRST_PACKET", 0.05), \
+         patch("custom_components.boks.ble.device.TIMEOUT_LOG_PACKET_GAP", 0.05):
+        partial = await device._get_logs(3)
+        stats = device.get_diagnostics()["log_downloads"]
+        assert len(partial) == 2
+        assert stats["stalls"] == 1
+        assert stats["resume_marker"] == 2
+
+        remaining = await device._get_logs(1)
+
+    assert [log["opcode"] for log in remaining] == [BoksHistoryEvent.DOOR_OPENED]
+    stats = device.get_diagnostics()["log_downloads"]
+    assert stats["resume_marker"] == 0
+    assert stats["resumed_entries"] == 2
+    assert stats["last"]["complete"] is True
+
+    with patch.object(device, "_send_packet", side_effect=send), \
+         patch("custom_components.boks.ble.device.TIMEOUT_LOG_FIRST_PACKET", 0.05), \
+         patch("custom_components.boks.ble.device.TIMEOUT_LOG_PACKET_GAP", 0.05):
+        assert len(await device._get_logs(2)) == 1
+        fresh = await device._get_logs(1)
+
+    assert [log["opcode"] for log in fresh] == [BoksHistoryEvent.DOOR_OPENED]
+    stats = device.get_diagnostics()["log_downloads"]
+    assert stats["resumed_entries"] == 2
+    assert stats["resume_marker"] == 0
+    device._stop_autokill_timer()
+
+async def test_request_until_quiet_learns_single_answer_firmware(hass: HomeAssistant):
+    """Test that follow-up replies are collected and single-answer firmware stops waiting."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+
+    def count_packet(count):
+        data = bytearray([BoksNotificationOpcode.NOTIFY_LOGS_COUNT, 0x02]) + count.to_bytes(2, "big")
+        data.append(sum(data) & 0xFF)
+        return PacketFactory.from_rx_data(data)
+
+    async def send_zero_then_three(packet, wait_for_opcodes=None, timeout=None):
+        device._notifications.publish(count_packet(0))
+        hass.loop.call_later(0.05, device._notifications.publish, count_packet(3))
+        return count_packet(0)
+
+    device.set_firmware_version("4.0.0")
+    with patch.object(device, "_send_packet", side_effect=send_zero_then_three):
+        assert await device._get_logs_count() == 3
+
+    async def send_once(packet, wait_for_opcodes=None, timeout=None):
+        resp = count_packet(2)
+        device._notifications.publish(resp)
+        return resp
+
+    device.set_firmware_version("4.6.0")
+    device._quiescence = BoksQuiescence(0.01)
+    with patch.object(device, "_send_packet", side_effect=send_once):
+        for _ in range(5):
+            assert await device._get_logs_count() == 2
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await device._get_logs_count() == 2
+        assert loop.time() - start < 0.01
+
+    stats = device.get_diagnostics()["reply_quiescence"]
+    assert stats["4.6.0/0x79"]["samples"] == 5
+    assert stats["4.6.0/0x79"]["follow_ups"] == 0
+
+    # A 0 is still followed by a full window on that firmware, the correction can be intermittent
+    async def send_zero_then_two(packet, wait_for_opcodes=None, timeout=None):
+        device._notifications.publish(count_packet(0))
+        hass.loop.call_soon(device._notifications.publish, count_packet(2))
+        return count_packet(0)
+
+    with patch.object(device, "_send_packet", side_effect=send_zero_then_two):
+        assert await device._get_logs_count() == 2
+
+async def test_read_batcher_overlaps_reads_and_falls_back_to_serial(hass: HomeAssistant):
+    """Test that reads run concurrently and a backend failing them is kept sequential."""
+    batcher = BoksReadBatcher(max_concurrency=3)
+    in_flight = 0
+    peak = 0
+
+    async def read(value, fail_concurrent=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        overlapped = in_flight > 1
+        try:
+            await asyncio.sleep(0.01)
+            if fail_concurrent and overlapped:
+                raise BleakError("busy")
+            return value
+        finally:
+            in_flight -= 1
+
+    results = await batcher.run("hci0", {"a": lambda: read(1), "b": lambda: read(2), "c": lambda: read(3)})
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert peak == 3
+
+    peak = 0
+    results = await batcher.run("proxy", {"a": lambda: read(1), "b": lambda: read(2, fail_concurrent=True)})
+    assert results == {"a": 1, "b": 2}
+    assert batcher.concurrency("proxy") == 1
+    assert batcher.concurrency("hci0") == 3
+
+    stats = batcher.as_dict()
+    assert stats["serial_backends"] == ["proxy"]
+    assert stats["reads"]["b"]["count"] == 3
+    assert stats["reads"]["b"]["failures"] == 1
+
+async def test_final_refresh_overlaps_battery_reads_with_log_count(hass: HomeAssistant):
+    """Test that the final refresh reads the battery while the log count is requested."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    order = []
+
+    async def read_gatt_char(uuid):
+        order.append(f"read:{uuid}")
+        await asyncio.sleep(0.01)
+        order.append(f"done:{uuid}")
+        return bytearray([85])
+
+    async def logs_count():
+        order.append("count")
+        await asyncio.sleep(0.01)
+        order.append("count_done")
+        return 0
+
+    device._client = MagicMock()
+    device._client.read_gatt_char = AsyncMock(side_effect=read_gatt_char)
+    callback = MagicMock()
+    device.register_status_callback(callback)
+
+    with patch.object(device, "_read_logs_count", side_effect=logs_count), \
+         patch.object(device, "_get_code_counts", AsyncMock(return_value={"master": 1, "single_use": 2})):
+        assert await device._perform_final_refresh() is True
+
+    # Every read started before the first one finished
+    assert order.index("count") < min(i for i, step in enumerate(order) if step.startswith("done:"))
+    update = callback.call_args[0][0]
+    assert update["battery_level"] == 85
+    assert update["battery_stats"]["format"] == "measure-single"
+    assert update["master"] == 1
+    assert set(device.get_diagnostics()["read_batches"]["reads"]) == {"battery_level", "battery_stats", "logs_count"}
+
+async def test_post_door_sync_delay_learns_from_empty_and_stalled_syncs(hass: HomeAssistant):
+    """Test that an empty sync contradicted by older logs and a stalled download raise the delay."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    device._connected_source = "proxy"
+    device._client = MagicMock()
+    device._client.is_connected = True
+
+    async def empty_refresh():
+        device._final_log_count = 0
+        return True
+
+    # Door closed just before: the stabilization wait is applied (without sleeping)
+    device._last_door_close_time = time.time() - DELAY_POST_DOOR_CLOSE_SYNC + 1
+    with patch.object(device, "_perform_final_refresh", side_effect=empty_refresh), \
+         patch.object(device, "_release_connection", new_callable=AsyncMock), \
+         patch("custom_components.boks.ble.device.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await device._run_background_disconnect_logic()
+    sleep.assert_awaited_once()
+
+    # Not settled until a download tells whether the count was right
+    assert "proxy" not in device.get_diagnostics()["post_door_sync_delays"]
+    device._check_empty_sync([{"timestamp": int(time.time()) - 60}])
+    delays = device.get_diagnostics()["post_door_sync_delays"]["proxy"]
+    assert delays["failures"] == 1
+    assert delays["delay"] > DELAY_POST_DOOR_CLOSE_SYNC
+
+    # A stalled download during the final refresh is a failure as well
+    async def stalled_logs(count):
+        device._log_downloads.start()
+        device._log_downloads.finish([], count, False, 0)
+        return []
+
+    device._client.read_gatt_char = AsyncMock(return_value=bytearray([85]))
+    with patch.object(device, "_read_logs_count", AsyncMock(return_value=3)), \
+         patch.object(device, "_get_logs", side_effect=stalled_logs), \
+         patch.object(device, "_get_code_counts", AsyncMock(return_value={})):
+        assert await device._perform_final_refresh() is False
+
+async def test_final_refresh_retries_failed_overlapped_log_count(hass: HomeAssistant):
+    """Test that a log count failing while overlapped is read again alone and the logs are fetched."""
+    device = BoksBluetoothDevice(hass, "AA:BB:CC:DD:EE:FF", "12345678")
+    device._connected_source = "proxy"
+    device._client = MagicMock()
+    device._client.read_gatt_char = AsyncMock(return_value=bytearray([85]))
+    callback = MagicMock()
+    device.register_status_callback(callback)
+
+    data = bytearray([BoksNotificationOpcode.NOTIFY_LOGS_COUNT, 0x02]) + (4).to_bytes(2, "big")
+    data.append(sum(data) & 0xFF)
+    replies = [BoksError("timeout"), [PacketFactory.from_rx_data(data)]]
+
+    with patch.object(device, "_request_until_quiet", AsyncMock(side_effect=replies)), \
+         patch.object(device, "_get_logs", AsyncMock(return_value=[{"event_type": "door_opened"}])) as get_logs, \
+         patch.object(device, "_get_code_counts", AsyncMock(return_value={})):
+        assert await device._perform_final_refresh() is True
+
+    get_logs.assert_awaited_once_with(4)
+    assert callback.call_args[0][0]["latest_logs_raw"] == [{"event_type": "door_opened"}]
+    assert device.get_diagnostics()["read_batches"]["serial_backends"] == ["proxy"]
+
+def test_preload_imports_on_demand_modules():
+    """Test that the executor preload imports the on-demand TX and update modules with the RX classes."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import sys\n"
+        "from custom_components.boks.ble import device\n"
+        "assert not device._packets_loaded()\n"
+        "assert 'custom_components.boks.packets.tx.set_configuration' not in sys.modules\n"
+        "device._preload_packets()\n"
+        "assert device._packets_loaded()\n"
+        "assert 'custom_components.boks.packets.tx.register_nfc_tag' in sys.modules\n"
+        "assert 'custom_components.boks.updates.logic' in sys.modules\n"
+        "assert 'custom_components.boks.updates.manager' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).parents[1], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
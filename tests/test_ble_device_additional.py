@@ -151,11 +151,12 @@ async def test_get_logs_success(hass: HomeAssistant):
         # We can simulate the callback being called.
         
         async def side_effect_send_packet(*args, **kwargs):
-            # Simulate immediate log arrival
-            if device._notify_callback:
-                # Need to construct a mock packet bytearray for LOG_END_HISTORY
-                from custom_components.boks.ble.const import BoksHistoryEvent
-                device._notify_callback(BoksHistoryEvent.LOG_END_HISTORY, bytearray())
+            # Simulate immediate log arrival through the notification bus
+            from custom_components.boks.ble.const import BoksHistoryEvent
+            from custom_components.boks.packets.factory import PacketFactory
+            data = bytearray([BoksHistoryEvent.LOG_END_HISTORY, 0x00])
+            data.append(sum(data) & 0xFF)
+            device._notifications.publish(PacketFactory.from_rx_data(data))
         
         device._send_packet.side_effect = side_effect_send_packet
         
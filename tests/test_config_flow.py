@@ -1,11 +1,22 @@
 """Test the Boks config flow."""
 from unittest.mock import AsyncMock
 
+import pytest
+import voluptuous as vol
+
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.core import HomeAssistant
 
-from custom_components.boks.const import DOMAIN, CONF_MASTER_CODE, CONF_ANONYMIZE_LOGS
+from custom_components.boks.const import (
+    CONF_ANONYMIZE_LOGS,
+    CONF_HOLD_CONNECTION_IDLE,
+    CONF_MASTER_CODE,
+    CONF_PIN_INDEX_RANGE,
+    DOMAIN,
+    MAX_HOLD_CONNECTION_IDLE,
+    MAX_PIN_INDEX_RANGE,
+)
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
 
 async def test_user_flow_valid(hass: HomeAssistant, mock_setup_entry, mock_bluetooth) -> None:
@@ -131,4 +142,30 @@ async def test_options_flow_anonymize_logs(hass: HomeAssistant, mock_config_entr
     )
     
     assert result2["type"] == FlowResultType.CREATE_ENTRY
-    assert result2["data"][CONF_ANONYMIZE_LOGS] is True
\ No newline at end of file
+    assert result2["data"][CONF_ANONYMIZE_LOGS] is True
+
+
+async def test_options_flow_rejects_out_of_range_values(hass: HomeAssistant, mock_config_entry) -> None:
+    """Test that the hold connection idle window and the PIN index range are bounded."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={"scan_interval": 10, "full_refresh_interval": 12}
+    )
+
+    for option, value in (
+        (CONF_HOLD_CONNECTION_IDLE, -1),
+        (CONF_HOLD_CONNECTION_IDLE, MAX_HOLD_CONNECTION_IDLE + 1),
+        (CONF_PIN_INDEX_RANGE, -1),
+        (CONF_PIN_INDEX_RANGE, MAX_PIN_INDEX_RANGE + 1),
+    ):
+        result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+        with pytest.raises(vol.Invalid):
+            await hass.config_entries.options.async_configure(result["flow_id"], user_input={option: value})
+        hass.config_entries.options.async_abort(result["flow_id"])
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_HOLD_CONNECTION_IDLE: 0, CONF_PIN_INDEX_RANGE: MAX_PIN_INDEX_RANGE}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_PIN_INDEX_RANGE] == MAX_PIN_INDEX_RANGE
@@ -5,8 +5,12 @@ import pytest
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.boks.const import EVENT_LOGS_RETRIEVED, SNAPSHOT_SAVE_DELAY
 from custom_components.boks.coordinator import BoksDataUpdateCoordinator
+from custom_components.boks.entity import BoksEntity
+from custom_components.boks.logic.translation_cache import BoksLogTranslations
 from custom_components.boks.errors import BoksError
 
 
@@ -83,26 +87,201 @@ async def test_coordinator_device_info_throttling(
     mock_config_entry,
     freezer
 ) -> None:
-    """Test that device info is throttled."""
+    """Test that device info is read once and then only checked through the software revision."""
     coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
     mock_bluetooth["addr"].return_value = MagicMock()
 
-    # First update: should fetch device info
+    # First update: nothing cached, full read
     await coordinator.async_refresh()
     assert mock_boks_ble_device.get_device_information.call_count == 1
+    assert mock_boks_ble_device.get_software_revision.call_count == 0
     
-    # Reset mocks and advance time within the throttling period
+    # Within the check interval: cached values, no BLE read at all
     mock_boks_ble_device.get_device_information.reset_mock()
-    freezer.tick(timedelta(minutes=1)) # Advance by a short time, less than 12 hours
-    
-    # Second update: should fetch device info again because time has passed
+    freezer.tick(timedelta(seconds=1))
+    await coordinator.async_refresh()
+    assert mock_boks_ble_device.get_device_information.call_count == 0
+    assert mock_boks_ble_device.get_software_revision.call_count == 0
+
+    # Beyond the interval: only the fingerprint is read, it still matches
+    freezer.tick(timedelta(hours=mock_config_entry.options["full_refresh_interval"] * 2 + 1))
+    await coordinator.async_refresh()
+    assert mock_boks_ble_device.get_software_revision.call_count == 1
+    assert mock_boks_ble_device.get_device_information.call_count == 0
+
+    # Firmware updated: full read again
+    mock_boks_ble_device.get_software_revision.return_value = "4.6.0"
+    freezer.tick(timedelta(hours=mock_config_entry.options["full_refresh_interval"] * 2 + 1))
     await coordinator.async_refresh()
     assert mock_boks_ble_device.get_device_information.call_count == 1
 
-    # Advance time beyond the throttling period
-    mock_boks_ble_device.get_device_information.reset_mock()
-    freezer.tick(timedelta(hours=mock_config_entry.options["full_refresh_interval"] + 1)) # Advance beyond throttling
-    
-    # Third update: should fetch device info again
+async def test_coordinator_device_info_cache_persisted(
+    hass: HomeAssistant,
+    mock_boks_ble_device,
+    mock_bluetooth,
+    mock_config_entry,
+) -> None:
+    """Test that a new coordinator answers from the persisted cache and a reboot invalidates it."""
+    coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
     await coordinator.async_refresh()
     assert mock_boks_ble_device.get_device_information.call_count == 1
+
+    mock_boks_ble_device.get_device_information.reset_mock()
+    mock_boks_ble_device.get_device_information.return_value = {"firmware_revision": "10/125"}
+    restarted = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    await restarted.async_load_device_info()
+    assert restarted.data["device_info_service"]["software_revision"] == "4.5.1"
+    assert restarted.device_info["sw_version"] == "4.5.1"
+    assert mock_boks_ble_device.get_device_information.call_count == 0
+
+    # A reboot newer than the cached read forces a full read on the next update
+    await restarted._enrich_logs(
+        [{"opcode": 0x96, "event_type": "power_on", "timestamp": 4102444800, "extra_data": {}}],
+        BoksLogTranslations({}),
+    )
+    assert restarted.device_info_cache.is_valid is False
+    await restarted.async_refresh()
+    assert mock_boks_ble_device.get_device_information.call_count == 1
+
+async def test_coordinator_sync_logs_streams_batches(
+    hass: HomeAssistant,
+    mock_boks_ble_device,
+    mock_bluetooth,
+    mock_config_entry
+) -> None:
+    """Test that each downloaded batch is published as soon as it is enriched."""
+    coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    coordinator.data = {}
+    events = []
+    hass.bus.async_listen(EVENT_LOGS_RETRIEVED, events.append)
+
+    def make_log(event_type):
+        return {"opcode": 0x86, "payload": b"", "timestamp": 1234567890,
+                "event_type": event_type, "description": event_type, "extra_data": {}}
+
+    async def iter_logs(count):
+        yield [make_log("door_opened")]
+        # The first batch is already visible to entities before the second arrives
+        assert coordinator.data["latest_logs"][0]["event_type"] == "door_opened"
+        yield [make_log("door_closed"), make_log("parcel_delivered")]
+
+    mock_boks_ble_device.get_logs_count.return_value = 3
+    mock_boks_ble_device.iter_logs = MagicMock(side_effect=iter_logs)
+
+    result = await coordinator.async_sync_logs(update_state=True)
+    await hass.async_block_till_done()
+
+    assert [len(event.data["logs"]) for event in events] == [1, 2]
+    assert len(result["latest_logs"]) == 3
+    # The final update keeps the last batch timestamp so nothing is re-triggered
+    assert coordinator.data["last_log_fetch_ts"] == result["last_log_fetch_ts"]
+
+async def test_coordinator_snapshot_restored(
+    hass: HomeAssistant,
+    mock_boks_ble_device,
+    mock_bluetooth,
+    mock_config_entry,
+    freezer,
+) -> None:
+    """Test that the coordinator data is saved and restored without BLE at startup."""
+    coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    await coordinator.async_refresh()
+    coordinator.data["door_open"] = True
+    coordinator.data["latest_logs"] = [
+        {"event_type": "door_opened", "timestamp": 1700000000},
+        {"event_type": "door_closed", "timestamp": 1700000010},
+    ]
+    coordinator.async_update_listeners()
+
+    freezer.tick(timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    mock_boks_ble_device.connect.reset_mock()
+    mock_boks_ble_device.get_battery_level.reset_mock()
+    restarted = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    assert await restarted.async_restore_snapshot() is True
+    assert restarted.data["battery_level"] == 85
+    assert restarted.data["master"] == 1
+    assert restarted.data["device_info_service"]["software_revision"] == "4.5.1"
+    assert "door_open" not in restarted.data
+    # The door state is derived from the restored logs before any BLE refresh
+    assert restarted.door_state.is_open is False
+    assert restarted.door_state.changed_at == 1700000010
+    assert mock_boks_ble_device.connect.call_count == 0
+
+    # The restored battery level is read again by the first (background) refresh
+    await restarted.async_refresh()
+    assert mock_boks_ble_device.get_battery_level.call_count == 1
+
+
+async def test_coordinator_key_updates_wake_matching_listeners(
+    hass: HomeAssistant,
+    mock_boks_ble_device,
+    mock_bluetooth,
+    mock_config_entry,
+) -> None:
+    """Test that partial updates only write the entities using the changed keys."""
+    coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    await coordinator.async_refresh()
+
+    def make_entity(keys):
+        entity = type("KeyedEntity", (BoksEntity,), {"_coordinator_keys": keys})(coordinator, mock_config_entry)
+        entity.async_write_ha_state = MagicMock()
+        return entity
+
+    battery = make_entity(frozenset({"battery_level"}))
+    log_count = make_entity(frozenset({"log_count"}))
+    any_key = make_entity(None)
+    listener = MagicMock()
+    removers = [
+        coordinator.async_add_listener(entity._handle_coordinator_update) for entity in (battery, log_count, any_key)
+    ]
+    removers.append(coordinator.async_add_listener(listener))
+
+    coordinator.async_update_keys({"log_count": 42})
+    assert coordinator.data["log_count"] == 42
+    assert battery.async_write_ha_state.call_count == 0
+    assert log_count.async_write_ha_state.call_count == 1
+    assert any_key.async_write_ha_state.call_count == 1
+    # Pushes go through the base class listener update
+    assert listener.call_count == 1
+    assert coordinator.changed_keys is None
+
+    # An unchanged value wakes nobody
+    coordinator.async_update_keys({"log_count": 42, "battery_level": coordinator.data["battery_level"]})
+    assert log_count.async_write_ha_state.call_count == 1
+    assert listener.call_count == 1
+
+    # A full update still wakes everyone
+    coordinator.async_update_listeners()
+    assert battery.async_write_ha_state.call_count == 1
+    assert log_count.async_write_ha_state.call_count == 2
+    assert any_key.async_write_ha_state.call_count == 2
+
+    for remove in removers:
+        remove()
+
+
+async def test_coordinator_door_state_follows_notifications_and_logs(
+    hass: HomeAssistant,
+    mock_boks_ble_device,
+    mock_bluetooth,
+    mock_config_entry,
+) -> None:
+    """Test that the door state is updated from notifications and streamed log batches."""
+    coordinator = BoksDataUpdateCoordinator(hass, mock_config_entry)
+    await coordinator.async_refresh()
+
+    coordinator._handle_status_update({"door_open": True})
+    assert coordinator.door_state.is_open is True
+    assert coordinator.door_state.source == "notification"
+    assert coordinator.data["door_open"] is True
+
+    # A closure found in a later history batch closes the door
+    now = int(coordinator.door_state.observed_at) + 5
+    coordinator._publish_logs([{"event_type": "door_closed", "timestamp": now}], None)
+    await hass.async_block_till_done()
+    assert coordinator.door_state.is_open is False
+    assert coordinator.door_state.source == "history"
+    assert coordinator.data["door_open"] is False
@@ -0,0 +1,52 @@
+"""Tests for the Boks event journal."""
+import os
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.boks.ble.const import BoksHistoryEvent
+from custom_components.boks.logic.event_journal import BoksEventJournal
+
+
+def make_entry(opcode, timestamp, **extra):
+    """Build an enriched log entry."""
+    return {"opcode": opcode, "timestamp": timestamp, "extra_data": extra, "description": "ignored"}
+
+
+async def test_journal_append_query_and_reload(hass: HomeAssistant):
+    """Test indexed queries, aggregates and reloading from disk."""
+    journal = BoksEventJournal(hass, "test_entry")
+    entries = [
+        make_entry(BoksHistoryEvent.CODE_BLE_VALID, 1000, code="123456"),
+        make_entry(BoksHistoryEvent.DOOR_OPENED, 1001),
+        make_entry(BoksHistoryEvent.NFC_OPENING, 1100, tag_uid="AA:BB:CC:DD", tag_name="Badge"),
+        make_entry(BoksHistoryEvent.CODE_BLE_VALID, 1200, code="123456"),
+        make_entry(BoksHistoryEvent.CODE_KEY_VALID, 1300, code="654321"),
+        {"opcode": "open", "timestamp": 1400},
+    ]
+    assert await journal.async_append(entries) == 5
+
+    result = await journal.async_query(code="123456", limit=1)
+    assert result["total"] == 2
+    assert result["last"] == 1200
+    assert [event["timestamp"] for event in result["events"]] == [1200]
+    assert result["events"][0]["event_type"] == "code_ble_valid"
+
+    result = await journal.async_query(tag_uid="aabbccdd")
+    assert result["events"][0]["extra_data"] == {"tag_uid": "AA:BB:CC:DD"}
+
+    result = await journal.async_query(event_types=["code_ble_valid", "code_key_valid"], start=1100, end=1300)
+    assert result["total"] == 2
+    assert result["by_event_type"] == {"code_ble_valid": 1, "code_key_valid": 1}
+
+    # Simulate a crash in the middle of an append
+    with open(journal.path, "ab") as file:
+        file.write(b"\x01\x02")
+
+    reloaded = BoksEventJournal(hass, "test_entry")
+    result = await reloaded.async_query(limit=0)
+    assert result["total"] == 5
+    assert result["events"] == []
+    assert reloaded.as_dict()["size"] == os.path.getsize(journal.path)
+
+    await reloaded.async_remove()
+    assert not os.path.exists(journal.path)
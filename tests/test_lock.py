@@ -1,12 +1,18 @@
 """Test Boks lock functionality."""
 import asyncio
+import time
 from unittest.mock import patch, AsyncMock, MagicMock
 from homeassistant.core import HomeAssistant
 from homeassistant.const import CONF_ADDRESS
 from homeassistant.components.lock import LockEntityFeature
-from custom_components.boks.const import DOMAIN
+from custom_components.boks.const import DOMAIN, TIMEOUT_DOOR_CLOSE
 from custom_components.boks.lock import BoksLock
 from custom_components.boks.coordinator import BoksDataUpdateCoordinator
+from custom_components.boks.logic.door_state import (
+    DOOR_SOURCE_HISTORY,
+    DOOR_SOURCE_NOTIFICATION,
+    BoksDoorState,
+)
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 
@@ -43,7 +49,7 @@ async def test_lock_entity_setup(hass: HomeAssistant) -> None:
 
 
 async def test_lock_is_locked_based_on_logs() -> None:
-    """Test that the lock state is determined based on log entries."""
+    """Test that the lock state follows the door events of the logs."""
     # Create a minimal config entry
     entry = MockConfigEntry(
         domain=DOMAIN,
@@ -53,71 +59,48 @@ async def test_lock_is_locked_based_on_logs() -> None:
         entry_id="test_entry_id",
         unique_id="AA:BB:CC:DD:EE:FF"
     )
-    
+
     # Create a minimal coordinator
     coordinator = MagicMock()
-    
-    # Test when door is open (unlocked) based on logs
-    coordinator.data = {
-        "latest_logs": [
-            {"event_type": "door_opened", "timestamp": 1234567890}
-        ],
-        "door_open": False  # This should be ignored when logs are present
-    }
-    
+    coordinator.door_state = BoksDoorState()
+
     # Create the lock entity
     lock = BoksLock(coordinator, entry)
-    
-    # Verify lock state
+    # No observation yet: unknown, not locked
+    assert lock.is_locked is None
+
+    # Test when door is open (unlocked) based on logs
+    coordinator.door_state.apply_logs([{"event_type": "door_opened", "timestamp": 1234567890}])
     assert lock.is_locked is False
-    
+    assert lock.extra_state_attributes["source"] == DOOR_SOURCE_HISTORY
+
+    # A later batch without door events keeps the state
+    coordinator.door_state.apply_logs([{"event_type": "code_ble_valid", "timestamp": 1234567892}])
+    assert lock.is_locked is False
+
     # Test when door is closed (locked) based on logs
-    coordinator.data = {
-        "latest_logs": [
-            {"event_type": "door_closed", "timestamp": 1234567895}
-        ],
-        "door_open": True  # This should be ignored when logs are present
-    }
-    
-    # Verify lock state
+    coordinator.door_state.apply_logs([{"event_type": "door_closed", "timestamp": 1234567895}])
     assert lock.is_locked is True
 
 
-async def test_lock_is_locked_fallback() -> None:
-    """Test that the lock state falls back to real-time status when no logs."""
-    # Create a minimal config entry
-    entry = MockConfigEntry(
-        domain=DOMAIN,
-        title="Boks Test",
-        data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF"},
-        options={},
-        entry_id="test_entry_id",
-        unique_id="AA:BB:CC:DD:EE:FF"
-    )
-    
-    # Create a minimal coordinator
-    coordinator = MagicMock()
-    
-    # Test when door is open (unlocked) via real-time status
-    coordinator.data = {
-        "latest_logs": [],  # No logs
-        "door_open": True
-    }
-    
-    # Create the lock entity
-    lock = BoksLock(coordinator, entry)
-    
-    # Verify lock state
-    assert lock.is_locked is False
-    
-    # Test when door is closed (locked) via real-time status
-    coordinator.data = {
-        "latest_logs": [],  # No logs
-        "door_open": False
-    }
-    
-    # Verify lock state
-    assert lock.is_locked is True
+async def test_lock_is_locked_live_status_wins_over_older_logs() -> None:
+    """Test that history entries older than a live notification do not change the state."""
+    state = BoksDoorState()
+
+    assert state.update(True, DOOR_SOURCE_NOTIFICATION, timestamp=1000.0) is True
+    assert state.open_duration(now=1030.0) == 30.0
+    assert state.is_left_open(60, now=1030.0) is False
+    assert state.is_left_open(60, now=1060.0) is True
+
+    assert state.update(False, DOOR_SOURCE_NOTIFICATION, timestamp=1100.0) is True
+    assert state.open_duration(now=1200.0) is None
+
+    # Logs downloaded afterwards replay the opening, it is older than the closure
+    assert state.apply_logs([{"event_type": "door_opened", "timestamp": 1000}]) is False
+    assert state.is_open is False
+    assert state.source == DOOR_SOURCE_NOTIFICATION
+    assert state.changed_at == 1100.0
+    assert state.transitions == 2
 
 
 async def test_lock_unlock_calls_open() -> None:
@@ -268,3 +251,32 @@ async def test_lock_open_rate_limiting() -> None:
         
         # Verify open_door was called once
         coordinator.ble_device.open_door.assert_called_once_with("12345A")
+
+
+async def test_lock_open_warns_only_when_door_left_open(caplog) -> None:
+    """Test that the door still open warning follows the door state tracker."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Boks Test",
+        data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF"},
+        options={},
+        entry_id="test_entry_id",
+        unique_id="AA:BB:CC:DD:EE:FF"
+    )
+    coordinator = MagicMock()
+    coordinator.data = {"latest_logs": [], "door_open": False}
+    coordinator.ble_device.connect = AsyncMock()
+    coordinator.ble_device.disconnect = AsyncMock()
+    coordinator.ble_device.open_door = AsyncMock()
+    coordinator.ble_device.wait_for_door_closed = AsyncMock(return_value=False)
+    lock = BoksLock(coordinator, entry)
+    lock.hass = MagicMock()
+    lock.async_write_ha_state = MagicMock()
+
+    for is_open, warned in ((True, True), (False, False)):
+        coordinator.door_state = BoksDoorState()
+        coordinator.door_state.update(is_open, DOOR_SOURCE_NOTIFICATION, timestamp=time.time() - TIMEOUT_DOOR_CLOSE - 5)
+        caplog.clear()
+        with patch("custom_components.boks.lock.asyncio.sleep", new_callable=AsyncMock):
+            await lock.async_open(code="12345A")
+        assert ("Door still open after" in caplog.text) is warned
@@ -1,13 +1,15 @@
 """Tests for the Boks log processor."""
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
 from types import SimpleNamespace
 import pytest
 
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
 from homeassistant.util import dt as dt_util
 
 from custom_components.boks.const import DOMAIN
 from custom_components.boks.logic.log_processor import BoksLogProcessor
+from custom_components.boks.logic.translation_cache import BoksLogTranslations, BoksTranslationCache
 from custom_components.boks.ble.const import BoksHistoryEvent
 
 @pytest.fixture
@@ -29,6 +31,11 @@ def mock_translations():
         f"component.{DOMAIN}.entity.sensor.last_event.state.door_opened": "Door Opened",
     }
 
+@pytest.fixture
+def log_translations(mock_translations):
+    """Translation snapshot built from the mock translations."""
+    return BoksLogTranslations.from_translations(mock_translations)
+
 async def test_async_enrich_log_entry_full_flow(hass, log_processor, mock_translations):
     """Test the full enrichment flow of async_enrich_log_entry."""
     tag_id = "5A3EDAE0"
@@ -56,51 +63,61 @@ async def test_async_enrich_log_entry_full_flow(hass, log_processor, mock_transl
     assert enriched["description"] == "NFC Opening"
     assert mock_tags_helper.async_update_item.called
 
-def test_translate_base_description(log_processor, mock_translations):
+def test_translate_base_description(log_processor, log_translations):
     """Test _translate_base_description static method."""
-    desc = log_processor._translate_base_description("door_opened", mock_translations)
+    desc = log_processor._translate_base_description("door_opened", log_translations)
     assert desc == "Door Opened"
     
     # Fallback
-    desc = log_processor._translate_base_description("unknown_event", mock_translations)
+    desc = log_processor._translate_base_description("unknown_event", log_translations)
     assert desc == "unknown_event"
 
-def test_enrich_diagnostic_error(log_processor, mock_translations):
+def test_enrich_diagnostic_error(log_processor, log_translations):
     """Test _enrich_diagnostic_error static method."""
     extra_data = {"error_description": "diagnostic_error_integrity"}
     
     # Matching error
-    desc = log_processor._enrich_diagnostic_error("error", extra_data, mock_translations, "Base Error")
+    desc = log_processor._enrich_diagnostic_error("error", extra_data, log_translations, "Base Error")
     assert desc == "Base Error: Integrity Error"
     assert extra_data["error_description"] == "Integrity Error"
     
     # Not an error event
-    desc = log_processor._enrich_diagnostic_error("info", extra_data, mock_translations, "Base Info")
+    desc = log_processor._enrich_diagnostic_error("info", extra_data, log_translations, "Base Info")
     assert desc == "Base Info"
 
-def test_enrich_power_off_reason(log_processor, mock_translations):
+def test_enrich_power_off_reason(log_processor, log_translations):
     """Test _enrich_power_off_reason static method."""
     extra_data = {"reason_code": 2}
     
     # Matching reason
-    desc = log_processor._enrich_power_off_reason("power_off", extra_data, mock_translations, "Off")
+    desc = log_processor._enrich_power_off_reason("power_off", extra_data, log_translations, "Off")
     assert desc == "Off: Watchdog Reboot"
     assert extra_data["reason_text"] == "Watchdog Reboot"
+
+    # Reason code restored as a string (snapshot, journal)
+    extra_data = {"reason_code": "2"}
+    desc = log_processor._enrich_power_off_reason("power_off", extra_data, log_translations, "Off")
+    assert desc == "Off: Watchdog Reboot"
     
     # Unknown reason code
     extra_data = {"reason_code": 99}
-    desc = log_processor._enrich_power_off_reason("power_off", extra_data, mock_translations, "Off")
+    desc = log_processor._enrich_power_off_reason("power_off", extra_data, log_translations, "Off")
     assert desc == "Off"
 
-def test_enrich_tag_type(log_processor, mock_translations):
+def test_enrich_tag_type(log_processor, log_translations):
     """Test _enrich_tag_type static method."""
     extra_data = {"tag_type": 3}
-    log_processor._enrich_tag_type(extra_data, mock_translations)
+    log_processor._enrich_tag_type(extra_data, log_translations)
+    assert extra_data["tag_type_description"] == "User Badge"
+
+    # Tag type restored as a string
+    extra_data = {"tag_type": "3"}
+    log_processor._enrich_tag_type(extra_data, log_translations)
     assert extra_data["tag_type_description"] == "User Badge"
     
     # Unknown type
     extra_data = {"tag_type": 99}
-    log_processor._enrich_tag_type(extra_data, mock_translations)
+    log_processor._enrich_tag_type(extra_data, log_translations)
     assert extra_data["tag_type_description"] == "Type 99"
 
 async def test_resolve_tag_name(hass, log_processor):
@@ -156,4 +173,116 @@ async def test_update_tag_last_scanned(hass, log_processor):
     # Not an NFC opening -> No update
     mock_tags_helper.async_update_item.reset_mock()
     await log_processor._update_tag_last_scanned("door_opened", 1700000000, {"tag_uid": tag_id})
-    assert not mock_tags_helper.async_update_item.called
\ No newline at end of file
+    assert not mock_tags_helper.async_update_item.called
+
+
+async def test_pin_index_build_persist_and_enrich(hass, mock_translations):
+    """Test that the reverse PIN index attributes a used code to its generated slot."""
+    from custom_components.boks.logic.pin_generator import BoksPinGenerator
+    from custom_components.boks.logic.pin_index import BoksPinIndex
+
+    master_key = "000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f"
+    generator = BoksPinGenerator(master_key)
+    pin_index = BoksPinIndex(hass, "entry_id", generator, 50)
+
+    await pin_index.async_build()
+    assert pin_index.is_complete
+    single_pin = generator.generate_pin("single", 42)
+    assert pin_index.lookup(single_pin) is not None
+
+    processor = BoksLogProcessor(hass, "AA:BB:CC:DD:EE:FF", pin_index)
+    master_pin = generator.generate_pin("master", 3)
+    log = {"event_type": "code_ble_valid", "opcode": BoksHistoryEvent.CODE_BLE_VALID, "payload": b"",
+           "timestamp": 0, "extra_data": {"code": master_pin}}
+    result = await processor.async_enrich_log_entry(log, mock_translations)
+    assert result["extra_data"]["code_type"] == "master"
+    assert result["extra_data"]["code_index"] == 3
+
+    # Persisted index is reused for the same key and dropped for another one
+    await hass.async_block_till_done()
+    reloaded = BoksPinIndex(hass, "entry_id", BoksPinGenerator(master_key), 50)
+    await reloaded.async_load()
+    assert reloaded.size == pin_index.size
+    other = BoksPinIndex(hass, "entry_id", BoksPinGenerator("ff" * 32), 50)
+    await other.async_load()
+    assert other.size == 0
+
+
+async def test_translation_cache_per_language(hass, mock_translations):
+    """Test that snapshots are loaded once per language and dropped on language change."""
+    cache = BoksTranslationCache(hass)
+    cache.async_start()
+    with patch(
+        "custom_components.boks.logic.translation_cache.translation.async_get_translations",
+        new_callable=AsyncMock, return_value=mock_translations,
+    ) as mock_load:
+        first = await cache.async_get("en")
+        assert await cache.async_get("en") is first
+        assert mock_load.call_count == 1
+
+        assert first.describe("door_opened") == "Door Opened"
+        assert first.power_off_reasons[2] == "Watchdog Reboot"
+        assert first.tag_types[3] == "User Badge"
+
+        await cache.async_get("fr")
+        assert mock_load.call_count == 2
+
+        hass.bus.async_fire(EVENT_CORE_CONFIG_UPDATE, {"language": "fr"})
+        await hass.async_block_till_done()
+        assert await cache.async_get("en") is not first
+        assert mock_load.call_count == 3
+    cache.async_stop()
+
+
+async def test_tag_resolver_follows_entity_registry(hass):
+    """Test that the shared tag index is built once and updated from registry events."""
+    from homeassistant.helpers import entity_registry as er
+
+    from custom_components.boks.logic.tag_resolver import BoksTagResolver
+
+    ent_reg = er.async_get(hass)
+    entry = ent_reg.async_get_or_create("tag", "tag", "AABBCCDD")
+
+    resolver = BoksTagResolver.async_acquire(hass)
+    assert BoksTagResolver.async_acquire(hass) is resolver
+    assert resolver.lookup("aa:bb:cc:dd") is None
+
+    ent_reg.async_update_entity(entry.entity_id, name="Front Badge")
+    await hass.async_block_till_done()
+    assert resolver.lookup("aa:bb:cc:dd") == "Front Badge"
+
+    ent_reg.async_remove(entry.entity_id)
+    await hass.async_block_till_done()
+    assert resolver.lookup("AABBCCDD") is None
+    # Updates were applied incrementally
+    assert resolver.rebuilds == 1
+
+    resolver.async_release()
+    resolver.async_release()
+    assert BoksTagResolver.async_get(hass) is not resolver
+
+
+async def test_tag_scans_coalesced_per_batch(hass, log_processor, mock_translations):
+    """Test that a batch of NFC openings writes last_scanned once per tag, with the newest date."""
+    mock_tags_helper = MagicMock()
+    mock_tags_helper.data = {"AABBCCDD": {"last_scanned": None}, "11223344": {"last_scanned": None}}
+    mock_tags_helper.async_update_item = AsyncMock()
+    hass.data["tag"] = {"tags": mock_tags_helper}
+
+    pending_scans = {}
+    for timestamp, uid in ((1700000000, "AA:BB:CC:DD"), (1700000300, "AA:BB:CC:DD"),
+                           (1700000100, "AA:BB:CC:DD"), (1700000050, "11:22:33:44")):
+        log = {"event_type": "nfc_opening", "opcode": BoksHistoryEvent.NFC_OPENING, "payload": b"",
+               "timestamp": timestamp, "extra_data": {"tag_uid": uid}}
+        await log_processor.async_enrich_log_entry(log, mock_translations, pending_scans)
+
+    assert not mock_tags_helper.async_update_item.called
+    await log_processor.async_apply_tag_scans(pending_scans)
+
+    assert mock_tags_helper.async_update_item.call_count == 2
+    mock_tags_helper.async_update_item.assert_any_call(
+        "AABBCCDD", {"last_scanned": dt_util.utc_from_timestamp(1700000300)}
+    )
+    stats = log_processor.get_diagnostics()["tag_last_scanned"]
+    assert stats["batches"] == 1
+    assert stats["updates"] == 2
@@ -120,3 +120,100 @@ def test_factory_nfc_tag_registering_scan(mock_time):
     packet = PacketFactory.from_rx_data(data)
     
     assert isinstance(packet, NfcTagRegisteringScanPacket)
+
+def test_factory_payload_is_zero_copy_view():
+    """Test that payload fields are views on the notification buffer, not copies."""
+    data = build_rx_packet(0x86, bytes.fromhex("000064313233343536"))
+
+    packet = PacketFactory.from_rx_data(data)
+
+    assert isinstance(packet.payload, memoryview)
+    assert isinstance(packet.log_payload, memoryview)
+    assert packet.payload.obj is data
+    assert packet.log_payload.obj is data
+    assert bytes(packet.log_payload) == b"123456"
+    # __slots__ packets carry no per-instance dict
+    assert not hasattr(packet, "__dict__")
+
+def test_opcode_table_metadata():
+    """Test the precomputed opcode metadata used by names, event types and the factory."""
+    from custom_components.boks.packets.base import OPCODE_TABLE, get_opcode_info
+    from custom_components.boks.ble.const import BoksCommandOpcode, BoksNotificationOpcode
+
+    assert len(OPCODE_TABLE) == 256
+    PacketFactory.preload()
+
+    door = get_opcode_info(BoksHistoryEvent.DOOR_OPENED)
+    assert door.name == "DOOR_OPENED"
+    assert door.direction == "rx"
+    assert door.is_history is True
+    assert door.event_type == "door_opened"
+    assert door.packet_class is DoorOpenedPacket
+    assert door.takes_opcode is False
+
+    count = get_opcode_info(BoksNotificationOpcode.NOTIFY_LOGS_COUNT)
+    assert count.is_history is False
+    assert count.event_type == "unknown"
+
+    assert get_opcode_info(BoksCommandOpcode.OPEN_DOOR).direction == "tx"
+    assert get_opcode_info(0xFF).name == "UNKNOWN"
+    assert get_opcode_info(0xFF).packet_class is None
+
+def test_rx_registry_matches_packet_classes():
+    """Test that every RX module is registered under the opcodes its class declares."""
+    import importlib
+    from pathlib import Path
+    from custom_components.boks.packets.factory import RX_PACKET_REGISTRY
+
+    rx_dir = Path(__file__).parents[1] / "custom_components" / "boks" / "packets" / "rx"
+    modules = {path.stem for path in rx_dir.glob("*.py") if path.stem != "__init__"}
+    assert {module for module, _ in RX_PACKET_REGISTRY.values()} == modules
+
+    for opcode, (module_name, class_name) in RX_PACKET_REGISTRY.items():
+        packet_class = getattr(importlib.import_module(f"custom_components.boks.packets.rx.{module_name}"), class_name)
+        opcodes = packet_class.OPCODES if isinstance(packet_class.OPCODES, list) else [packet_class.OPCODES]
+        assert opcode in opcodes
+
+def test_rx_packet_class_imported_on_first_sight():
+    """Test that packet modules load on first decode and the update stack is not imported."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import sys\n"
+        "from custom_components.boks.packets.factory import PacketFactory\n"
+        "name = 'custom_components.boks.packets.rx.power_on'\n"
+        "assert name not in sys.modules\n"
+        "packet = PacketFactory.from_rx_data(bytearray([0x96, 0x03, 0, 0, 0, 0x99]))\n"
+        "assert name in sys.modules and type(packet).__name__ == 'PowerOnPacket'\n"
+        "assert 'custom_components.boks.packets.rx.block_reset' not in sys.modules\n"
+        "assert 'custom_components.boks.updates.manager' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).parents[1], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+def test_resolve_keeps_opcode_pending_until_class_is_set():
+    """Test that a concurrent preload cannot see an opcode loaded while its module is imported."""
+    import importlib
+    from custom_components.boks.packets.base import OPCODE_TABLE
+
+    opcode = BoksHistoryEvent.DOOR_OPENED
+    info = OPCODE_TABLE[opcode]
+    real_import = importlib.import_module
+    pending_during_import = []
+
+    def import_module(name, package=None):
+        pending_during_import.append(opcode in PacketFactory._pending)
+        return real_import(name, package)
+
+    with patch.object(PacketFactory, "_pending", {opcode}), \
+         patch.object(info, "packet_class", None), \
+         patch("custom_components.boks.packets.factory.importlib.import_module", side_effect=import_module):
+        PacketFactory._resolve(opcode)
+        assert info.packet_class is DoorOpenedPacket
+        assert PacketFactory.is_loaded()
+
+    assert pending_during_import == [True]
@@ -1,5 +1,6 @@
 """Tests for the Boks PIN Generator."""
 import pytest
+from unittest.mock import patch
 from custom_components.boks.logic.pin_generator import BoksPinGenerator
 from custom_components.boks.errors import BoksError
 
@@ -78,3 +79,28 @@ def test_generate_pin_invalid_key_content():
     with pytest.raises(BoksError) as excinfo:
         generator.generate_pin("master", 0)
     assert excinfo.value.translation_key == "master_key_invalid"
+
+def test_generate_pins_batch_matches_single():
+    """Test that the batch API returns the same PINs as generate_pin, in order."""
+    generator = BoksPinGenerator(VALID_MASTER_KEY)
+    # Crosses message lengths (1 to 4 digits) and runs the vectorized path
+    indices = [5, 0, 99, 10, 1234, *range(20, 60)]
+    for pin_type in ("master", "single", "multi"):
+        assert generator.generate_pins(pin_type, indices) == [generator.generate_pin(pin_type, i) for i in indices]
+
+def test_generate_pins_scalar_fallback():
+    """Test the batch API without NumPy."""
+    generator = BoksPinGenerator(VALID_MASTER_KEY)
+    expected = [generator.generate_pin("single", i) for i in range(40)]
+    with patch("custom_components.boks.logic.pin_generator.np", None):
+        assert generator.generate_pins("single", range(40)) == expected
+
+def test_key_state_cache_follows_master_key():
+    """Test that the cached key block state is recomputed when the master key changes."""
+    generator = BoksPinGenerator(VALID_MASTER_KEY)
+    pin = generator.generate_pin("master", 0)
+    generator.master_key = "ff" * 32
+    assert generator.generate_pin("master", 0) != pin
+    generator.master_key = None
+    with pytest.raises(BoksError):
+        generator.generate_pins("master", [0])
@@ -0,0 +1,107 @@
+"""Tests for the Boks reverse PIN index."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.boks import async_remove_entry
+from custom_components.boks.logic.pin_generator import BoksPinGenerator
+from custom_components.boks.logic.pin_index import STORAGE_KEY_TEMPLATE, BoksPinIndex
+
+# 32 bytes master key (64 hex chars)
+VALID_MASTER_KEY = "000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f"
+STORAGE_KEY = STORAGE_KEY_TEMPLATE.format("test_entry")
+
+
+def make_index(hass: HomeAssistant, index_range: int = 10) -> BoksPinIndex:
+    """Build an index over the test master key."""
+    return BoksPinIndex(hass, "test_entry", BoksPinGenerator(VALID_MASTER_KEY), index_range)
+
+
+def persist(hass_storage: dict, data: dict) -> None:
+    """Put index data in the mocked .storage."""
+    hass_storage[STORAGE_KEY] = {"version": 1, "minor_version": 1, "key": STORAGE_KEY, "data": data}
+
+
+async def test_pin_index_chunked_build_completes(hass: HomeAssistant, hass_storage):
+    """Test that the build generates every type chunk by chunk and saves the complete index."""
+    index = make_index(hass)
+    generator = index._pin_generator
+
+    with patch("custom_components.boks.logic.pin_index.PIN_INDEX_CHUNK_SIZE", 4), \
+         patch.object(generator, "generate_pins", wraps=generator.generate_pins) as generate:
+        await index.async_build()
+
+    assert index.is_complete
+    assert [(call.args[0], call.args[1]) for call in generate.call_args_list[:3]] == [
+        ("master", range(0, 4)), ("single", range(0, 4)), ("multi", range(0, 4)),
+    ]
+    assert generate.call_count == 9
+    assert index.lookup(generator.generate_pin("single", 7).lower()) == ("single", 7)
+    assert hass_storage[STORAGE_KEY]["data"]["next"] == {"master": 10, "single": 10, "multi": 10}
+
+
+async def test_pin_index_resumes_from_persisted_next(hass: HomeAssistant, hass_storage):
+    """Test that a restart only generates the slots not indexed yet."""
+    index = make_index(hass)
+    persist(hass_storage, {
+        "fingerprint": index._compute_fingerprint(),
+        "next": {"master": 10, "single": 4, "multi": 0},
+        "pins": {"999999": ["master", 3]},
+    })
+    generator = index._pin_generator
+
+    with patch.object(generator, "generate_pins", wraps=generator.generate_pins) as generate:
+        await index.async_build()
+
+    assert [(call.args[0], call.args[1]) for call in generate.call_args_list] == [
+        ("single", range(4, 10)), ("multi", range(0, 10)),
+    ]
+    assert index.is_complete
+    assert index.lookup("999999") == ("master", 3)
+
+
+async def test_pin_index_dropped_on_master_key_change(hass: HomeAssistant, hass_storage):
+    """Test that an index persisted for another master key is discarded."""
+    persist(hass_storage, {
+        "fingerprint": "0123456789abcdef",
+        "next": {"master": 10, "single": 10, "multi": 10},
+        "pins": {"999999": ["master", 3]},
+    })
+    index = make_index(hass)
+
+    await index.async_load()
+
+    assert index.size == 0
+    assert index.lookup("999999") is None
+    assert not index.is_complete
+
+
+async def test_pin_index_collision_priority(hass: HomeAssistant):
+    """Test that colliding PINs keep master before single before multi, then the lower index."""
+    index = make_index(hass)
+
+    index._add("multi", range(0, 2), ["AAAAAA", "BBBBBB"])
+    index._add("single", range(5, 7), ["BBBBBB", "CCCCCC"])
+    index._add("master", range(8, 9), ["CCCCCC"])
+    index._add("single", range(1, 2), ["CCCCCC"])
+    index._add("multi", range(3, 4), ["AAAAAA"])
+
+    assert index.lookup("aaaaaa") == ("multi", 0)
+    assert index.lookup("BBBBBB") == ("single", 5)
+    assert index.lookup("CCCCCC") == ("master", 8)
+
+    index._add("master", range(2, 3), ["CCCCCC"])
+    assert index.lookup("CCCCCC") == ("master", 2)
+
+
+async def test_pin_index_removed_with_entry(hass: HomeAssistant, hass_storage):
+    """Test that removing the config entry deletes the persisted PIN codes."""
+    index = make_index(hass, index_range=2)
+    await index.async_build()
+    assert STORAGE_KEY in hass_storage
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    await async_remove_entry(hass, entry)
+
+    assert STORAGE_KEY not in hass_storage
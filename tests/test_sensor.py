@@ -1,7 +1,12 @@
 """Test Boks sensors."""
-from unittest.mock import AsyncMock
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 from homeassistant.core import HomeAssistant
 
+from custom_components.boks.const import DOMAIN
+
 async def test_sensors(hass: HomeAssistant, mock_boks_ble_device, mock_bluetooth, mock_config_entry) -> None:
     """Test that sensors are created and updated."""
     
@@ -45,3 +50,76 @@ async def test_sensors(hass: HomeAssistant, mock_boks_ble_device, mock_bluetooth
     # Initially unknown or empty
     last_event_sensor = hass.states.get("sensor.boks_aa_bb_cc_dd_ee_ff_last_event")
     assert last_event_sensor is not None
+
+
+async def test_last_event_attributes_rendered_per_batch(
+    hass: HomeAssistant, mock_boks_ble_device, mock_bluetooth, mock_config_entry
+) -> None:
+    """Test that the last event attributes are rendered once per log batch and accumulate recent events."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    sensor = hass.data["entity_components"]["sensor"].get_entity("sensor.boks_aa_bb_cc_dd_ee_ff_last_event")
+    assert "last_10_events" in sensor._unrecorded_attributes
+
+    def publish(batch: list[dict], fetch_ts: str) -> None:
+        coordinator.data["latest_logs"] = batch
+        coordinator.data["last_log_fetch_ts"] = fetch_ts
+        coordinator.async_notify_keys(("latest_logs", "last_log_fetch_ts"))
+
+    publish([
+        {"timestamp": 1700000000 + i, "event_type": "door_opened", "opcode": 0x91, "extra_data": {"index": i}}
+        for i in range(8)
+    ], "2024-01-01T00:00:00")
+    publish([
+        {"timestamp": 1700000100 + i, "event_type": "door_closed", "opcode": 0x92, "extra_data": {"index": 8 + i}}
+        for i in range(4)
+    ], "2024-01-01T00:00:01")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.boks_aa_bb_cc_dd_ee_ff_last_event")
+    assert state.state == "door_closed"
+    assert state.attributes["index"] == 11
+    events = state.attributes["last_10_events"]
+    assert [event["index"] for event in events] == [11, 10, 9, 8, 7, 6, 5, 4, 3, 2]
+
+    # Writing the state again with the same batch does not render the attributes again
+    with patch.object(sensor, "_render_attributes", wraps=sensor._render_attributes) as render:
+        coordinator.async_update_listeners()
+        await hass.async_block_till_done()
+    assert render.call_count == 0
+
+
+@pytest.mark.parametrize("same_clock_tick", [False, True])
+async def test_last_event_attributes_after_full_sync(
+    hass: HomeAssistant, mock_boks_ble_device, mock_bluetooth, mock_config_entry, same_clock_tick
+) -> None:
+    """Test that a streamed sync adds each event once, even when batches share a fetch timestamp."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+    def make_log(index: int) -> dict:
+        return {"opcode": 0x86, "payload": b"", "timestamp": 1700000000 + index,
+                "event_type": "door_opened", "description": "door_opened", "extra_data": {"index": index}}
+
+    async def iter_logs(count):
+        yield [make_log(0), make_log(1)]
+        yield [make_log(2)]
+
+    mock_boks_ble_device.get_logs_count.return_value = 3
+    mock_boks_ble_device.iter_logs = MagicMock(side_effect=iter_logs)
+
+    with patch("custom_components.boks.coordinator.datetime") as mock_datetime:
+        if same_clock_tick:
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 12, 0, 0)
+        else:
+            mock_datetime.now.side_effect = datetime.now
+        await coordinator.async_sync_logs(update_state=True)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.boks_aa_bb_cc_dd_ee_ff_last_event")
+    assert [event["index"] for event in state.attributes["last_10_events"]] == [2, 1, 0]